@@ -0,0 +1,133 @@
+"""Batched evaluation of many positions in a single call.
+
+Positions are given either as an ``N x 8 x 8`` array or as a sequence of
+``(bits2, bits4)`` bitboard pairs. The results match ``evaluate_features``
+and ``CPUPlayer.evaluate`` position by position.
+"""
+
+import numpy as np
+
+from bitboard import count_moves
+from cpu import weighted_score
+from features_np import NEIGHBOUR_OFFSETS
+
+ROWS = np.repeat(np.arange(8), 8).reshape(8, 8)
+COLS = np.tile(np.arange(8), 8).reshape(8, 8)
+SQUARES = np.arange(64).reshape(8, 8)
+BIT_WEIGHTS = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64)).reshape(8, 8)
+
+
+def as_grids(positions):
+    """Returns ``positions`` as an ``N x 8 x 8`` int8 array."""
+    if isinstance(positions, np.ndarray):
+        return positions.reshape(-1, 8, 8)
+    positions = list(positions)
+    if positions and isinstance(positions[0], tuple) and len(positions[0]) == 2:
+        bits = np.array(positions, dtype=np.uint64)
+        has2 = (bits[:, 0, None, None] & BIT_WEIGHTS) != 0
+        has4 = (bits[:, 1, None, None] & BIT_WEIGHTS) != 0
+        return (has2 * 2 + has4 * 4).astype(np.int8)
+    return np.array(positions, dtype=np.int8).reshape(-1, 8, 8)
+
+
+def as_bits(mask):
+    """Packs an ``N x 8 x 8`` boolean mask into a list of bitboard ints."""
+    packed = (mask * BIT_WEIGHTS).sum(axis=(1, 2), dtype=np.uint64)
+    return [int(b) for b in packed]
+
+
+def shifted(padded, dy, dx):
+    return padded[:, 1 + dy : 9 + dy, 1 + dx : 9 + dx]
+
+
+def batch_grouping(mask):
+    n = mask.sum(axis=(1, 2)).astype(np.int64)
+    sumR = (mask * ROWS).sum(axis=(1, 2))
+    sumC = (mask * COLS).sum(axis=(1, 2))
+    sumSq = (mask * (ROWS * ROWS + COLS * COLS)).sum(axis=(1, 2))
+
+    pairSq = n * sumSq - sumR * sumR - sumC * sumC
+    pairs = n * (n - 1) // 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = pairSq / pairs
+        score = np.trunc(100 - avg * 1.5)
+    score = np.clip(score, 0, 100)
+    return np.where(n <= 1, 100, score).astype(np.int64)
+
+
+def batch_enemy_separation(oppMask):
+    padded = np.pad(oppMask, ((0, 0), (1, 1), (1, 1)))
+    near = np.zeros(oppMask.shape, dtype=bool)
+    for dy, dx in NEIGHBOUR_OFFSETS:
+        near |= shifted(padded, dy, dx)
+    isolated = (oppMask & ~near).sum(axis=(1, 2))
+    return np.minimum(100, isolated * 10).astype(np.int64)
+
+
+def batch_connection(mask):
+    count = len(mask)
+    n = mask.sum(axis=(1, 2))
+
+    # Label every group with its first row-major square (64 = empty).
+    labels = np.where(mask, SQUARES, 64)
+    while True:
+        padded = np.pad(labels, ((0, 0), (1, 1), (1, 1)), constant_values=64)
+        smallest = labels
+        for dy, dx in NEIGHBOUR_OFFSETS:
+            smallest = np.minimum(smallest, shifted(padded, dy, dx))
+        updated = np.where(mask, smallest, 64)
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    flat = labels.reshape(count, 64)
+    sizes = np.zeros((count, 65), dtype=np.int64)
+    np.add.at(sizes, (np.repeat(np.arange(count), 64), flat.ravel()), 1)
+    sizes = sizes[:, :64]
+    groups = (sizes > 0).sum(axis=1)
+    # argmax picks the earliest discovered group among equal sizes.
+    mainLabel = sizes.argmax(axis=1)
+    main = labels == mainLabel[:, None, None]
+
+    # Chebyshev distance to the main group by repeated 3x3 dilation.
+    dist = np.where(main, 0, 8)
+    reached = main
+    for k in range(1, 8):
+        padded = np.pad(reached, ((0, 0), (1, 1), (1, 1)))
+        grown = reached.copy()
+        for dy, dx in NEIGHBOUR_OFFSETS:
+            grown |= shifted(padded, dy, dx)
+        dist = np.where(grown & ~reached, k, dist)
+        reached = grown
+
+    totalDist = np.where(mask & ~main, dist, 0).sum(axis=(1, 2))
+    score = np.clip(100 - totalDist * 8, 0, 100)
+    return np.where((n <= 1) | (groups == 1), 100, score).astype(np.int64)
+
+
+def batch_mobility(ownBits, oppBits):
+    diff = np.array(
+        [count_moves(o, p) - count_moves(p, o) for o, p in zip(ownBits, oppBits)],
+        dtype=np.int64,
+    )
+    return np.clip(diff * 10 + 50, 0, 100)
+
+
+def batch_features(positions, player):
+    """Returns the four feature vectors for every position, as arrays of length N."""
+    grids = as_grids(positions)
+    opponent = 4 if player == 2 else 2
+    mask = grids == player
+    oppMask = grids == opponent
+    return {
+        "grouping": batch_grouping(mask),
+        "enemy_sep": batch_enemy_separation(oppMask),
+        "connection": batch_connection(mask),
+        "mobility": batch_mobility(as_bits(mask), as_bits(oppMask)),
+    }
+
+
+def evaluate_batch(positions, player, weights):
+    """Returns ``(features, scores)`` for every position in one call."""
+    features = batch_features(positions, player)
+    return features, weighted_score(features, weights)
@@ -0,0 +1,351 @@
+"""Micro-benchmarks for the board engines and the evaluation.
+
+Run ``python src/benchmarks.py <name>``; ``--help`` lists the benchmarks.
+"""
+
+import argparse
+from collections import Counter
+import math
+import random
+import time
+import tracemalloc
+
+from bitboard import BitBoard
+from board import Board
+from cpu import weighted_score
+from eval_cache import shared_cache
+from moves import decode_move
+from optimization import Adjudication, fitness_games, random_weights, run_match
+
+ENGINES = {"list": Board, "bitboard": BitBoard}
+WEIGHTS = {"grouping": 1, "connection": 1, "enemy_sep": 1, "mobility": 1}
+
+
+def sample_positions(count=50, plies=20, seed=1):
+    """Returns ``count`` grids reached by random play after up to ``plies`` moves."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        player = 2
+        for _ in range(rng.randint(1, plies)):
+            moves = board.get_all_possible_moves(player)
+            if not moves or board.is_game_over():
+                break
+            board.make_move(rng.choice(moves))
+            player = 4 if player == 2 else 2
+        positions.append([row[:] for row in board.board])
+    return positions
+
+
+def per_second(fn, items, min_time=0.5):
+    """Calls ``fn`` on every item until ``min_time`` elapsed; returns calls/s."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            fn(item)
+        calls += len(items)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def legacy_mobility(board, player):
+    """Mobility the way it was computed before countMoves: two move generations."""
+    opponent = 4 if player == 2 else 2
+    diff = len(board.get_all_possible_moves(player)) - len(
+        board.get_all_possible_moves(opponent)
+    )
+    return max(0, min(100, diff * 10 + 50))
+
+
+def legacy_evaluate(board, player=2):
+    f = {
+        "grouping": board.evaluateGrouping(player),
+        "enemy_sep": board.evaluateEnemySeparation(player),
+        "connection": board.evaluateConnectionPotential(player),
+        "mobility": legacy_mobility(board, player),
+    }
+    return weighted_score(f, WEIGHTS)
+
+
+def current_evaluate(board, player=2):
+    return weighted_score(board.evaluate_features(player), WEIGHTS)
+
+
+def bench_evaluate(positions, min_time=0.5):
+    """Evaluations per second with move-list mobility (before) and countMoves (after)."""
+    rows = []
+    for name, cls in ENGINES.items():
+        boards = [cls(p) for p in positions]
+        before = per_second(legacy_evaluate, boards, min_time)
+        after = per_second(current_evaluate, boards, min_time)
+        rows.append((name, before, after))
+    return rows
+
+
+def uncached_game_over_and_winner(board):
+    """What is_game_over followed by get_winner cost before the cache: four flood fills."""
+    board.computeWinningState(2) or board.computeWinningState(4)
+    return board.computeWinningState(2), board.computeWinningState(4)
+
+
+def cached_game_over_and_winner(board):
+    board.is_game_over()
+    return board.get_winner()
+
+
+def bench_connectivity(positions, min_time=0.5, passes=3):
+    """Game-over checks per second over every child of each position.
+
+    Each child is visited ``passes`` times, like successive iterations of
+    iterative deepening; the cache starts empty for every run.
+    """
+
+    def workload(check):
+        def run(board):
+            board.connectivityCache.clear()
+            player = 2 if board.countMoves(2) else 4
+            moves = board.get_all_possible_moves(player)
+            for _ in range(passes):
+                for mv in moves:
+                    board.make_move(mv)
+                    check(board)
+                    board.undo_move()
+            return len(moves) * passes
+
+        return run
+
+    rows = []
+    for name, cls in ENGINES.items():
+        boards = [cls(p) for p in positions]
+        children = sum(len(b.get_all_possible_moves(2 if b.countMoves(2) else 4)) for b in boards)
+        factor = children * passes / len(boards)
+        before = per_second(workload(uncached_game_over_and_winner), boards, min_time) * factor
+        after = per_second(workload(cached_game_over_and_winner), boards, min_time) * factor
+        rows.append((name, before, after))
+    return rows
+
+
+class LegacyMove:
+    """Move as it was before __slots__, kept to compare memory use."""
+
+    def __init__(self, fr, fc, tr, tc):
+        self.fr = fr
+        self.fc = fc
+        self.tr = tr
+        self.tc = tc
+
+
+def allocated_bytes(build):
+    """Peak bytes allocated while ``build()`` runs and its result is alive."""
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def bench_moves(positions, min_time=0.5):
+    """Memory and throughput of Move objects against packed move codes."""
+    rows = []
+    for name, cls in ENGINES.items():
+        boards = [cls(p) for p in positions]
+        codes = [b.get_move_codes(2) for b in boards]
+
+        legacyBytes = allocated_bytes(
+            lambda: [[LegacyMove(*decode_move(c)) for c in cs] for cs in codes]
+        )
+        objectBytes = allocated_bytes(lambda: [b.get_all_possible_moves(2) for b in boards])
+        codeBytes = allocated_bytes(lambda: [b.get_move_codes(2) for b in boards])
+
+        def make_undo_objects(board):
+            for mv in board.get_all_possible_moves(2):
+                board.make_move(mv)
+                board.undo_move()
+
+        def make_undo_codes(board):
+            for code in board.get_move_codes(2):
+                board.make_move(code)
+                board.undo_move()
+
+        rows.append(
+            (
+                name,
+                legacyBytes,
+                objectBytes,
+                codeBytes,
+                per_second(make_undo_objects, boards, min_time),
+                per_second(make_undo_codes, boards, min_time),
+            )
+        )
+    return rows
+
+
+def late_positions(count=50, seed=2, min_plies=40, max_plies=100):
+    """Dense late-game positions: long random games that are not over yet."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        player = 2
+        target = rng.randint(min_plies, max_plies)
+        plies = 0
+        while plies < target:
+            moves = board.get_all_possible_moves(player)
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            if board.is_game_over():
+                board.undo_move()
+                break
+            player = 4 if player == 2 else 2
+            plies += 1
+        if plies >= min_plies:
+            positions.append([row[:] for row in board.board])
+    return positions
+
+
+def timed_match(wA, wB, adjudication):
+    shared_cache().clear()  # both modes start from the same cold cache
+    start = time.perf_counter()
+    match = run_match(wA, wB, adjudication=adjudication)
+    return match, time.perf_counter() - start
+
+
+def ranks(values):
+    order = sorted(range(len(values)), key=values.__getitem__)
+    result = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            result[order[k]] = (i + j) / 2
+        i = j + 1
+    return result
+
+
+def spearman(a, b):
+    ra, rb = ranks(a), ranks(b)
+    ma, mb = sum(ra) / len(ra), sum(rb) / len(rb)
+    cov = sum((x - ma) * (y - mb) for x, y in zip(ra, rb))
+    var = math.sqrt(sum((x - ma) ** 2 for x in ra) * sum((y - mb) ** 2 for y in rb))
+    return cov / var if var else 1.0
+
+
+def bench_adjudication(candidates, adjudication):
+    """Plays every fitness game with and without adjudication.
+
+    Games are deterministic, so each rule's saving is measured exactly
+    as the plies the full game needed beyond the adjudicated one.
+    """
+    full_fitness, adj_fitness = [], []
+    plies = [0, 0]
+    seconds = [0.0, 0.0]
+    agree = 0
+    games = 0
+    saved = Counter()
+    fired = Counter()
+    for weights in candidates:
+        scores = [0, 0]
+        for wA, wB, sign in fitness_games(weights):
+            full, fullTime = timed_match(wA, wB, None)
+            adj, adjTime = timed_match(wA, wB, adjudication)
+            games += 1
+            plies[0] += full.plies
+            plies[1] += adj.plies
+            seconds[0] += fullTime
+            seconds[1] += adjTime
+            agree += full.result == adj.result
+            fired[adj.reason] += 1
+            saved[adj.reason] += full.plies - adj.plies
+            scores[0] += sign * full.result
+            scores[1] += sign * adj.result
+        full_fitness.append(scores[0])
+        adj_fitness.append(scores[1])
+
+    diffs = [b - a for a, b in zip(full_fitness, adj_fitness)]
+    mean = sum(diffs) / len(diffs)
+    var = sum((d - mean) ** 2 for d in diffs) / (len(diffs) - 1) if len(diffs) > 1 else 0.0
+    return {
+        "games": games,
+        "plies": plies,
+        "seconds": seconds,
+        "agreement": agree / games,
+        "rules": {reason: (fired[reason], saved[reason]) for reason in fired},
+        "fitness_diff": mean,
+        "fitness_diff_ci95": 1.96 * math.sqrt(var / len(diffs)),
+        "same_sign": sum(
+            (a > 0) == (b > 0) for a, b in zip(full_fitness, adj_fitness)
+        ) / len(diffs),
+        "spearman": spearman(full_fitness, adj_fitness),
+    }
+
+
+def print_adjudication(summary):
+    (fullPlies, adjPlies), (fullTime, adjTime) = summary["plies"], summary["seconds"]
+    print(f"games: {summary['games']}")
+    print(f"plies: {fullPlies} -> {adjPlies} ({1 - adjPlies / fullPlies:.1%} saved)")
+    print(f"time:  {fullTime:.1f}s -> {adjTime:.1f}s")
+    print(f"{'rule':<14}{'games':>8}{'plies saved':>14}")
+    for reason, (count, saved) in sorted(summary["rules"].items()):
+        print(f"{reason:<14}{count:>8}{saved:>14}")
+    print(f"same game result:        {summary['agreement']:.1%}")
+    print(
+        f"fitness change:          {summary['fitness_diff']:+.2f} "
+        f"+/- {summary['fitness_diff_ci95']:.2f} (95% CI)"
+    )
+    print(f"same side of baseline:   {summary['same_sign']:.1%}")
+    print(f"rank correlation:        {summary['spearman']:.3f}")
+
+
+def print_rows(rows, unit):
+    print(f"{'engine':<10}{'before ' + unit:>18}{'after ' + unit:>18}{'ratio':>8}")
+    for name, before, after in rows:
+        print(f"{name:<10}{before:>18.0f}{after:>18.0f}{after / before:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "benchmark", choices=["evaluate", "connectivity", "moves", "adjudication"]
+    )
+    parser.add_argument("--positions", type=int, default=50)
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--resign-margin", type=float, default=Adjudication.resign_margin)
+    parser.add_argument("--resign-plies", type=int, default=Adjudication.resign_plies)
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "evaluate":
+        positions = sample_positions(args.positions)
+        print_rows(bench_evaluate(positions, args.min_time), "evals/s")
+    elif args.benchmark == "connectivity":
+        positions = late_positions(args.positions)
+        print_rows(bench_connectivity(positions, args.min_time), "checks/s")
+    elif args.benchmark == "moves":
+        positions = sample_positions(args.positions)
+        print(
+            f"{'engine':<10}{'dict B':>10}{'slots B':>10}{'codes B':>10}"
+            f"{'objects pos/s':>16}{'codes pos/s':>14}"
+        )
+        for name, legacy, objects, codes, objRate, codeRate in bench_moves(
+            positions, args.min_time
+        ):
+            print(
+                f"{name:<10}{legacy:>10}{objects:>10}{codes:>10}"
+                f"{objRate:>16.0f}{codeRate:>14.0f}"
+            )
+    elif args.benchmark == "adjudication":
+        rng = random.Random(7)
+        candidates = [random_weights(rng) for _ in range(args.candidates)]
+        rules = Adjudication(resign_margin=args.resign_margin, resign_plies=args.resign_plies)
+        print_adjudication(bench_adjudication(candidates, rules))
+
+
+if __name__ == "__main__":
+    main()
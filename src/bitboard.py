@@ -0,0 +1,477 @@
+"""Bitboard implementation of the game board.
+
+Each side is stored as a 64-bit integer where square ``(row, col)`` maps to
+bit ``row * 8 + col``. The class exposes the same public API as
+:class:`board.Board` so it can be swapped in anywhere a board is expected.
+"""
+
+from board import DEFAULT_START, Board
+from moves import CAPTURE_FLAG, CAPTURED_SHIFT, MOVED_SHIFT, TO_SHIFT, Move
+
+FULL = (1 << 64) - 1
+NOT_COL0 = FULL ^ sum(1 << (r * 8) for r in range(8))
+NOT_COL7 = FULL ^ sum(1 << (r * 8 + 7) for r in range(8))
+
+# Same direction order as Board.get_all_possible_moves so both engines
+# generate moves in the same order.
+DX = [-1, -1, -1, 0, 0, 1, 1, 1]
+DY = [-1, 0, 1, -1, 1, -1, 0, 1]
+
+# Line axis used by each direction: 0 = row, 1 = column, 2 = diagonal, 3 = anti-diagonal
+AXIS = [2, 0, 3, 1, 1, 3, 0, 2]
+
+
+def _popcount_fallback(x):
+    return bin(x).count("1")
+
+
+popcount = getattr(int, "bit_count", _popcount_fallback)
+
+
+def _build_tables():
+    lines = []
+    targets = []
+    between = []
+    rings = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        row = col = diag = anti = 0
+        for s in range(64):
+            sr, sc = divmod(s, 8)
+            if sr == r:
+                row |= 1 << s
+            if sc == c:
+                col |= 1 << s
+            if sr - sc == r - c:
+                diag |= 1 << s
+            if sr + sc == r + c:
+                anti |= 1 << s
+        lines.append((row, col, diag, anti))
+
+        sqTargets = []
+        sqBetween = []
+        for d in range(8):
+            dirTargets = [-1] * 9
+            dirBetween = [0] * 9
+            path = 0
+            for k in range(1, 9):
+                nx = c + DX[d] * k
+                ny = r + DY[d] * k
+                if not (0 <= nx < 8 and 0 <= ny < 8):
+                    break
+                dirTargets[k] = ny * 8 + nx
+                dirBetween[k] = path
+                path |= 1 << (ny * 8 + nx)
+            sqTargets.append(dirTargets)
+            sqBetween.append(dirBetween)
+        targets.append(sqTargets)
+        between.append(sqBetween)
+
+        sqRings = [0] * 8
+        for s in range(64):
+            sr, sc = divmod(s, 8)
+            sqRings[max(abs(sr - r), abs(sc - c))] |= 1 << s
+        rings.append(sqRings)
+    return lines, targets, between, rings
+
+
+LINE_MASKS, TARGETS, BETWEEN, RINGS = _build_tables()
+
+
+def dilate(bits):
+    """Returns the set bits plus every square adjacent to one of them."""
+    row = bits | ((bits >> 1) & NOT_COL7) | ((bits << 1) & NOT_COL0)
+    return (row | (row << 8) | (row >> 8)) & FULL
+
+
+def iter_squares(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def flood(seed, mask):
+    """Grows ``seed`` through ``mask`` using 8-connectivity."""
+    region = seed
+    while True:
+        grown = dilate(region) & mask
+        if grown == region:
+            return region
+        region = grown
+
+
+def count_moves(own, opp):
+    """Counts the legal moves of the side owning ``own`` against ``opp``."""
+    occ = own | opp
+    total = 0
+    for sq in iter_squares(own):
+        lines = LINE_MASKS[sq]
+        counts = (
+            popcount(occ & lines[0]),
+            popcount(occ & lines[1]),
+            popcount(occ & lines[2]),
+            popcount(occ & lines[3]),
+        )
+        targets = TARGETS[sq]
+        between = BETWEEN[sq]
+        for d in range(8):
+            count = counts[AXIS[d]]
+            t = targets[d][count]
+            if t < 0 or (own >> t) & 1:
+                continue
+            if opp & between[d][count]:
+                continue
+            total += 1
+    return total
+
+
+class BitBoard:
+    """Board stored as two 64-bit integers, one per player."""
+
+    def __init__(self, initialBoard=None):
+        if initialBoard is None:
+            initialBoard = DEFAULT_START
+
+        self.bits2 = 0
+        self.bits4 = 0
+        for y in range(8):
+            for x in range(8):
+                v = initialBoard[y][x]
+                if v == 2:
+                    self.bits2 |= 1 << (y * 8 + x)
+                elif v == 4:
+                    self.bits4 |= 1 << (y * 8 + x)
+        # Packed history entries (see moves.py); slots past historyIndex are stale.
+        self.history = [0] * Board.HISTORY_CAPACITY
+        self.historyIndex = -1
+        self.countPlayer2 = 0
+        self.countPlayer4 = 0
+        self.zobrist = 0
+        self.connectivityCache = {}
+        self.recalcPieceCounts()
+
+    @property
+    def board(self):
+        """Read-only copy of the position, indexed like ``Board.board``.
+
+        The rows are tuples built from the bitboards on every access, so
+        writes such as ``board.board[r][c] = 2`` raise TypeError instead of
+        changing a copy; use ``make_move`` or build a new ``BitBoard``.
+        """
+        grid = [[0] * 8 for _ in range(8)]
+        for sq in iter_squares(self.bits2):
+            grid[sq >> 3][sq & 7] = 2
+        for sq in iter_squares(self.bits4):
+            grid[sq >> 3][sq & 7] = 4
+        return tuple(map(tuple, grid))
+
+    def pieceAt(self, x, y):
+        bit = 1 << (y * 8 + x)
+        if self.bits2 & bit:
+            return 2
+        if self.bits4 & bit:
+            return 4
+        return 0
+
+    def bitsFor(self, player):
+        return self.bits2 if player == 2 else self.bits4
+
+    def recalcPieceCounts(self):
+        self.countPlayer2 = popcount(self.bits2)
+        self.countPlayer4 = popcount(self.bits4)
+        self.zobrist = self.computeZobristHash()
+        if self.historyIndex % 2 == 0:
+            self.zobrist ^= Board.ZOBRIST_SIDE
+        self.connectivityCache = {}
+
+    def getPieceCount(self, player):
+        return self.countPlayer2 if player == 2 else self.countPlayer4
+
+    def get_all_possible_moves(self, playerPiece):
+        return [Move.from_code(code) for code in self.get_move_codes(playerPiece)]
+
+    def get_move_codes(self, playerPiece):
+        """Same moves as get_all_possible_moves, as packed ints with a capture flag."""
+        moves = []
+        if playerPiece == 2:
+            own, opp = self.bits2, self.bits4
+        else:
+            own, opp = self.bits4, self.bits2
+        occ = own | opp
+
+        for sq in iter_squares(own):
+            lines = LINE_MASKS[sq]
+            counts = (
+                popcount(occ & lines[0]),
+                popcount(occ & lines[1]),
+                popcount(occ & lines[2]),
+                popcount(occ & lines[3]),
+            )
+            targets = TARGETS[sq]
+            between = BETWEEN[sq]
+            for d in range(8):
+                count = counts[AXIS[d]]
+                t = targets[d][count]
+                if t < 0 or (own >> t) & 1:
+                    continue
+                if opp & between[d][count]:
+                    continue
+                code = sq | (t << TO_SHIFT)
+                if (opp >> t) & 1:
+                    code |= CAPTURE_FLAG
+                moves.append(code)
+        return moves
+
+    def countMoves(self, playerPiece):
+        """Counts legal moves for ``playerPiece`` without building Move objects."""
+        if playerPiece == 2:
+            return count_moves(self.bits2, self.bits4)
+        return count_moves(self.bits4, self.bits2)
+
+    def countPiecesInLine(self, x, y, dx, dy):
+        sq = y * 8 + x
+        if dx == 0:
+            mask = LINE_MASKS[sq][1]
+        elif dy == 0:
+            mask = LINE_MASKS[sq][0]
+        elif dx == dy:
+            mask = LINE_MASKS[sq][2]
+        else:
+            mask = LINE_MASKS[sq][3]
+        return popcount((self.bits2 | self.bits4) & mask)
+
+    def isBlocked(self, x, y, nx, ny, dx, dy, opponentPiece):
+        d = 0
+        for i in range(8):
+            if DX[i] == dx and DY[i] == dy:
+                d = i
+                break
+        k = max(abs(nx - x), abs(ny - y))
+        return bool(self.bitsFor(opponentPiece) & BETWEEN[y * 8 + x][d][k])
+
+    def isInsideBoard(self, x, y):
+        return 0 <= x < 8 and 0 <= y < 8
+
+    def is_game_over(self):
+        if self.countPlayer2 == 0 or self.countPlayer4 == 0:
+            return True
+        player2_win, player4_win = self.connectivity()
+        return player2_win or player4_win
+
+    def get_winner(self):
+        player2_win, player4_win = self.connectivity()
+
+        if player2_win and not player4_win:
+            return 2
+        if player4_win and not player2_win:
+            return 4
+        if self.countPlayer2 == 0:
+            return 4
+        if self.countPlayer4 == 0:
+            return 2
+        return None
+
+    def make_move(self, move):
+        """Plays a ``Move`` or a packed move code."""
+        if type(move) is int:
+            fromSq = move & 63
+            toSq = (move >> TO_SHIFT) & 63
+        else:
+            if not self.isInsideBoard(move.fc, move.fr) or not self.isInsideBoard(
+                move.tc, move.tr
+            ):
+                raise ValueError("Move hors plateau")
+            fromSq = move.fr * 8 + move.fc
+            toSq = move.tr * 8 + move.tc
+
+        piece = self.pieceAt(fromSq & 7, fromSq >> 3)
+        if piece == 0:
+            raise ValueError("Aucune pièce à déplacer")
+
+        captured = self.pieceAt(toSq & 7, toSq >> 3)
+
+        self.historyIndex += 1
+        if self.historyIndex == len(self.history):
+            self.history.extend([0] * len(self.history))
+        self.history[self.historyIndex] = (
+            fromSq
+            | (toSq << TO_SHIFT)
+            | (piece << MOVED_SHIFT)
+            | (captured << CAPTURED_SHIFT)
+        )
+
+        self._apply(fromSq, toSq, piece, captured)
+
+        if captured == 2:
+            self.countPlayer2 -= 1
+        elif captured == 4:
+            self.countPlayer4 -= 1
+
+    def undo_move(self):
+        if self.historyIndex < 0:
+            return
+        entry = self.history[self.historyIndex]
+        self.historyIndex -= 1
+
+        captured = (entry >> CAPTURED_SHIFT) & 7
+        # Moving the piece back is the same XOR as moving it forward.
+        self._apply(
+            entry & 63,
+            (entry >> TO_SHIFT) & 63,
+            (entry >> MOVED_SHIFT) & 7,
+            captured,
+        )
+
+        if captured == 2:
+            self.countPlayer2 += 1
+        elif captured == 4:
+            self.countPlayer4 += 1
+
+    def _apply(self, fromSq, toSq, piece, captured):
+        # Toggles the mover on both squares and the captured piece on the
+        # target square; applying it twice restores the position.
+        moveBits = (1 << fromSq) | (1 << toSq)
+        if piece == 2:
+            self.bits2 ^= moveBits
+        else:
+            self.bits4 ^= moveBits
+        if captured == 2:
+            self.bits2 ^= 1 << toSq
+        elif captured == 4:
+            self.bits4 ^= 1 << toSq
+
+        fromKeys = Board.ZOBRIST_TABLE[fromSq >> 3][fromSq & 7]
+        toKeys = Board.ZOBRIST_TABLE[toSq >> 3][toSq & 7]
+        self.zobrist ^= (
+            fromKeys[piece >> 1]
+            ^ fromKeys[0]
+            ^ toKeys[captured >> 1]
+            ^ toKeys[piece >> 1]
+            ^ Board.ZOBRIST_SIDE
+        )
+
+    def get_zobrist_hash(self):
+        """Returns the running hash, which also encodes the side to move."""
+        return self.zobrist
+
+    def get_position_hash(self):
+        """Returns the hash of the piece placement only, without the side to move."""
+        if self.historyIndex % 2 == 0:
+            return self.zobrist ^ Board.ZOBRIST_SIDE
+        return self.zobrist
+
+    def computeZobristHash(self):
+        """Recomputes the piece-placement hash from scratch."""
+        h = 0
+        table = Board.ZOBRIST_TABLE
+        for sq in range(64):
+            bit = 1 << sq
+            idx = 0
+            if self.bits2 & bit:
+                idx = 1
+            elif self.bits4 & bit:
+                idx = 2
+            h ^= table[sq >> 3][sq & 7][idx]
+        return h
+
+    def connectivity(self):
+        """Returns whether each player's pieces are connected, memoized per position."""
+        key = self.get_position_hash()
+        cache = self.connectivityCache
+        result = cache.get(key)
+        if result is None:
+            result = (self.computeWinningState(2), self.computeWinningState(4))
+            if len(cache) >= Board.CONNECTIVITY_CACHE_SIZE:
+                cache.clear()
+            cache[key] = result
+        return result
+
+    def isWinningState(self, player):
+        player2_win, player4_win = self.connectivity()
+        return player2_win if player == 2 else player4_win
+
+    def computeWinningState(self, player):
+        own = self.bitsFor(player)
+        if own == 0:
+            return False
+        return flood(own & -own, own) == own
+
+    def evaluate_features(self, player):
+        return {
+            "grouping": self.evaluateGrouping(player),
+            "enemy_sep": self.evaluateEnemySeparation(player),
+            "connection": self.evaluateConnectionPotential(player),
+            "mobility": self.evaluateMobility(player),
+        }
+
+    def evaluateEnemySeparation(self, player):
+        opp = self.bits4 if player == 2 else self.bits2
+        west = (opp >> 1) & NOT_COL7
+        east = (opp << 1) & NOT_COL0
+        row = west | east
+        around = row | (((row | opp) << 8) & FULL) | ((row | opp) >> 8)
+        isolated = popcount(opp & ~around)
+        return min(100, isolated * 10)
+
+    def evaluateGrouping(self, player):
+        own = self.bitsFor(player)
+        n = popcount(own)
+        if n <= 1:
+            return 100
+
+        sumR = sumC = sumSq = 0
+        for sq in iter_squares(own):
+            r = sq >> 3
+            c = sq & 7
+            sumR += r
+            sumC += c
+            sumSq += r * r + c * c
+
+        # Sum of pairwise squared distances without the O(n^2) loop.
+        pairSq = n * sumSq - sumR * sumR - sumC * sumC
+        pairs = n * (n - 1) // 2
+
+        avg = pairSq / pairs
+        score = int(100 - avg * 1.5)
+        return max(0, min(100, score))
+
+    def evaluateConnectionPotential(self, player):
+        own = self.bitsFor(player)
+        if popcount(own) <= 1:
+            return 100
+
+        groups = []
+        remaining = own
+        while remaining:
+            g = flood(remaining & -remaining, own)
+            groups.append(g)
+            remaining &= ~g
+
+        if len(groups) == 1:
+            return 100
+
+        mainGroup = max(groups, key=popcount)
+
+        totalDist = 0
+        for g in groups:
+            if g == mainGroup:
+                continue
+            for sq in iter_squares(g):
+                rings = RINGS[sq]
+                for dist in range(1, 8):
+                    if rings[dist] & mainGroup:
+                        totalDist += dist
+                        break
+
+        score = 100 - totalDist * 8
+        return max(0, min(100, score))
+
+    def evaluateMobility(self, player):
+        playerMoves = self.countMoves(player)
+        opponent = 4 if player == 2 else 2
+        opponentMoves = self.countMoves(opponent)
+
+        diff = playerMoves - opponentMoves
+        score = diff * 10 + 50
+        return max(0, min(100, score))
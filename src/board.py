@@ -2,7 +2,7 @@
 
 import random
 
-from moves import Move, MoveState
+from moves import CAPTURE_FLAG, CAPTURED_SHIFT, MOVED_SHIFT, TO_SHIFT, Move
 
 DEFAULT_START = [
     [0, 2, 2, 2, 2, 2, 2, 0],
@@ -25,33 +25,74 @@ class Board:
             for p in range(3):
                 ZOBRIST_TABLE[y][x][p] = RANDOM.getrandbits(64)
 
+    # XORed into the running hash on every move so the side to move is encoded.
+    ZOBRIST_SIDE = RANDOM.getrandbits(64)
+
+    # Positions whose connectivity is remembered before the cache is reset.
+    CONNECTIVITY_CACHE_SIZE = 1 << 15
+
+    # Initial number of undo slots; the history doubles when it runs out.
+    HISTORY_CAPACITY = 256
+
     def __init__(self, initialBoard=None):
         if initialBoard is None:
             initialBoard = DEFAULT_START
 
-        self.board = [row[:] for row in initialBoard]
-        self.history = []
+        self.board = [list(row) for row in initialBoard]
+        # Packed history entries (see moves.py); slots past historyIndex are stale.
+        self.history = [0] * Board.HISTORY_CAPACITY
         self.historyIndex = -1
         self.countPlayer2 = 0
         self.countPlayer4 = 0
+        # Pieces per row, column, diagonal (y - x + 7) and anti-diagonal (y + x)
+        self.rowCounts = [0] * 8
+        self.colCounts = [0] * 8
+        self.diagCounts = [0] * 15
+        self.antiCounts = [0] * 15
+        self.zobrist = 0
+        # Position hash -> (player 2 connected, player 4 connected)
+        self.connectivityCache = {}
         self.recalcPieceCounts()
 
     def recalcPieceCounts(self):
+        """Rebuilds counters and the Zobrist hash; call after editing ``board`` directly."""
         self.countPlayer2 = 0
         self.countPlayer4 = 0
+        self.rowCounts = [0] * 8
+        self.colCounts = [0] * 8
+        self.diagCounts = [0] * 15
+        self.antiCounts = [0] * 15
         for y in range(8):
             for x in range(8):
                 v = self.board[y][x]
+                if v == 0:
+                    continue
                 if v == 2:
                     self.countPlayer2 += 1
                 elif v == 4:
                     self.countPlayer4 += 1
+                self.rowCounts[y] += 1
+                self.colCounts[x] += 1
+                self.diagCounts[y - x + 7] += 1
+                self.antiCounts[y + x] += 1
+        self.zobrist = self.computeZobristHash()
+        if self.historyIndex % 2 == 0:
+            self.zobrist ^= Board.ZOBRIST_SIDE
+        self.connectivityCache = {}
+
+    def pieceAt(self, x, y):
+        return self.board[y][x]
 
     def getPieceCount(self, player):
         return self.countPlayer2 if player == 2 else self.countPlayer4
 
     def get_all_possible_moves(self, playerPiece):
+        return [Move.from_code(code) for code in self.get_move_codes(playerPiece)]
+
+    def get_move_codes(self, playerPiece):
+        """Same moves as get_all_possible_moves, as packed ints with a capture flag."""
         moves = []
+        grid = self.board
         opponentPiece = 4 if playerPiece == 2 else 2
 
         dx = [-1, -1, -1, 0, 0, 1, 1, 1]
@@ -59,36 +100,77 @@ class Board:
 
         for y in range(8):
             for x in range(8):
-                if self.board[y][x] != playerPiece:
+                if grid[y][x] != playerPiece:
                     continue
+                row = self.rowCounts[y]
+                col = self.colCounts[x]
+                diag = self.diagCounts[y - x + 7]
+                anti = self.antiCounts[y + x]
+                # Same order as dx/dy: diagonal, row, anti, column, column, anti, row, diagonal
+                counts = (diag, row, anti, col, col, anti, row, diag)
+                fromSq = y * 8 + x
                 for d in range(8):
-                    count = self.countPiecesInLine(x, y, dx[d], dy[d])
+                    count = counts[d]
                     nx = x + dx[d] * count
                     ny = y + dy[d] * count
                     if not self.isInsideBoard(nx, ny):
                         continue
-                    if self.board[ny][nx] == playerPiece:
+                    target = grid[ny][nx]
+                    if target == playerPiece:
                         continue
                     if self.isBlocked(x, y, nx, ny, dx[d], dy[d], opponentPiece):
                         continue
-                    moves.append(Move(y, x, ny, nx))
+                    code = fromSq | ((ny * 8 + nx) << TO_SHIFT)
+                    if target == opponentPiece:
+                        code |= CAPTURE_FLAG
+                    moves.append(code)
         return moves
 
+    def countMoves(self, playerPiece):
+        """Counts legal moves like get_all_possible_moves, without building them."""
+        total = 0
+        grid = self.board
+        opponentPiece = 4 if playerPiece == 2 else 2
+
+        dx = [-1, -1, -1, 0, 0, 1, 1, 1]
+        dy = [-1, 0, 1, -1, 1, -1, 0, 1]
+
+        for y in range(8):
+            cells = grid[y]
+            for x in range(8):
+                if cells[x] != playerPiece:
+                    continue
+                row = self.rowCounts[y]
+                col = self.colCounts[x]
+                diag = self.diagCounts[y - x + 7]
+                anti = self.antiCounts[y + x]
+                counts = (diag, row, anti, col, col, anti, row, diag)
+                for d in range(8):
+                    count = counts[d]
+                    nx = x + dx[d] * count
+                    ny = y + dy[d] * count
+                    if not (0 <= nx < 8 and 0 <= ny < 8):
+                        continue
+                    if grid[ny][nx] == playerPiece:
+                        continue
+                    # Inline isBlocked: any opponent strictly between the squares.
+                    blocked = False
+                    for k in range(1, count):
+                        if grid[y + dy[d] * k][x + dx[d] * k] == opponentPiece:
+                            blocked = True
+                            break
+                    if not blocked:
+                        total += 1
+        return total
+
     def countPiecesInLine(self, x, y, dx, dy):
-        count = 0
-        nx, ny = x, y
-        while self.isInsideBoard(nx, ny):
-            if self.board[ny][nx] != 0:
-                count += 1
-            nx += dx
-            ny += dy
-        nx, ny = x - dx, y - dy
-        while self.isInsideBoard(nx, ny):
-            if self.board[ny][nx] != 0:
-                count += 1
-            nx -= dx
-            ny -= dy
-        return count
+        if dx == 0:
+            return self.colCounts[x]
+        if dy == 0:
+            return self.rowCounts[y]
+        if dx == dy:
+            return self.diagCounts[y - x + 7]
+        return self.antiCounts[y + x]
 
     def isBlocked(self, x, y, nx, ny, dx, dy, opponentPiece):
         cx = x + dx
@@ -106,16 +188,13 @@ class Board:
         return 0 <= x < 8 and 0 <= y < 8
 
     def is_game_over(self):
-        return (
-            self.countPlayer2 == 0
-            or self.countPlayer4 == 0
-            or self.isWinningState(2)
-            or self.isWinningState(4)
-        )
+        if self.countPlayer2 == 0 or self.countPlayer4 == 0:
+            return True
+        player2_win, player4_win = self.connectivity()
+        return player2_win or player4_win
 
     def get_winner(self):
-        player2_win = self.isWinningState(2)
-        player4_win = self.isWinningState(4)
+        player2_win, player4_win = self.connectivity()
 
         if player2_win and not player4_win:
             return 2
@@ -128,13 +207,19 @@ class Board:
         return None
 
     def make_move(self, move):
-        fr = move.fr
-        fc = move.fc
-        tr = move.tr
-        tc = move.tc
-
-        if not self.isInsideBoard(fc, fr) or not self.isInsideBoard(tc, tr):
-            raise ValueError("Move hors plateau")
+        """Plays a ``Move`` or a packed move code."""
+        if type(move) is int:
+            fromSq = move & 63
+            toSq = (move >> TO_SHIFT) & 63
+            fr, fc, tr, tc = fromSq >> 3, fromSq & 7, toSq >> 3, toSq & 7
+        else:
+            fr = move.fr
+            fc = move.fc
+            tr = move.tr
+            tc = move.tc
+
+            if not self.isInsideBoard(fc, fr) or not self.isInsideBoard(tc, tr):
+                raise ValueError("Move hors plateau")
 
         piece = self.board[fr][fc]
         if piece == 0:
@@ -142,16 +227,38 @@ class Board:
 
         captured = self.board[tr][tc]
 
-        if self.historyIndex + 1 < len(self.history):
-            self.history = self.history[: self.historyIndex + 1]
-
-        st = MoveState(fr, fc, tr, tc, piece, captured)
-        self.history.append(st)
         self.historyIndex += 1
+        if self.historyIndex == len(self.history):
+            self.history.extend([0] * len(self.history))
+        self.history[self.historyIndex] = (
+            (fr * 8 + fc)
+            | ((tr * 8 + tc) << TO_SHIFT)
+            | (piece << MOVED_SHIFT)
+            | (captured << CAPTURED_SHIFT)
+        )
 
         self.board[tr][tc] = piece
         self.board[fr][fc] = 0
 
+        z = Board.ZOBRIST_TABLE
+        self.zobrist ^= (
+            z[fr][fc][piece >> 1]
+            ^ z[fr][fc][0]
+            ^ z[tr][tc][captured >> 1]
+            ^ z[tr][tc][piece >> 1]
+            ^ Board.ZOBRIST_SIDE
+        )
+
+        self.rowCounts[fr] -= 1
+        self.colCounts[fc] -= 1
+        self.diagCounts[fr - fc + 7] -= 1
+        self.antiCounts[fr + fc] -= 1
+        if captured == 0:
+            self.rowCounts[tr] += 1
+            self.colCounts[tc] += 1
+            self.diagCounts[tr - tc + 7] += 1
+            self.antiCounts[tr + tc] += 1
+
         if captured == 2:
             self.countPlayer2 -= 1
         elif captured == 4:
@@ -160,18 +267,54 @@ class Board:
     def undo_move(self):
         if self.historyIndex < 0:
             return
-        st = self.history[self.historyIndex]
+        entry = self.history[self.historyIndex]
         self.historyIndex -= 1
 
-        self.board[st.fromRow][st.fromCol] = st.movedPiece
-        self.board[st.toRow][st.toCol] = st.capturedPiece
+        fromSq = entry & 63
+        toSq = (entry >> TO_SHIFT) & 63
+        fr, fc, tr, tc = fromSq >> 3, fromSq & 7, toSq >> 3, toSq & 7
+        piece = (entry >> MOVED_SHIFT) & 7
+        captured = (entry >> CAPTURED_SHIFT) & 7
+
+        self.board[fr][fc] = piece
+        self.board[tr][tc] = captured
+
+        z = Board.ZOBRIST_TABLE
+        self.zobrist ^= (
+            z[fr][fc][piece >> 1]
+            ^ z[fr][fc][0]
+            ^ z[tr][tc][captured >> 1]
+            ^ z[tr][tc][piece >> 1]
+            ^ Board.ZOBRIST_SIDE
+        )
+
+        self.rowCounts[fr] += 1
+        self.colCounts[fc] += 1
+        self.diagCounts[fr - fc + 7] += 1
+        self.antiCounts[fr + fc] += 1
+        if captured == 0:
+            self.rowCounts[tr] -= 1
+            self.colCounts[tc] -= 1
+            self.diagCounts[tr - tc + 7] -= 1
+            self.antiCounts[tr + tc] -= 1
 
-        if st.capturedPiece == 2:
+        if captured == 2:
             self.countPlayer2 += 1
-        elif st.capturedPiece == 4:
+        elif captured == 4:
             self.countPlayer4 += 1
 
     def get_zobrist_hash(self):
+        """Returns the running hash, which also encodes the side to move."""
+        return self.zobrist
+
+    def get_position_hash(self):
+        """Returns the hash of the piece placement only, without the side to move."""
+        if self.historyIndex % 2 == 0:
+            return self.zobrist ^ Board.ZOBRIST_SIDE
+        return self.zobrist
+
+    def computeZobristHash(self):
+        """Recomputes the piece-placement hash from scratch."""
         h = 0
         for y in range(8):
             for x in range(8):
@@ -184,7 +327,28 @@ class Board:
                 h ^= Board.ZOBRIST_TABLE[y][x][idx]
         return h
 
+    def connectivity(self):
+        """Returns whether each player's pieces are connected, memoized per position.
+
+        Entries are keyed by the position hash, which make_move and undo_move
+        keep up to date, so a cached answer always belongs to the current
+        position.
+        """
+        key = self.get_position_hash()
+        cache = self.connectivityCache
+        result = cache.get(key)
+        if result is None:
+            result = (self.computeWinningState(2), self.computeWinningState(4))
+            if len(cache) >= Board.CONNECTIVITY_CACHE_SIZE:
+                cache.clear()
+            cache[key] = result
+        return result
+
     def isWinningState(self, player):
+        player2_win, player4_win = self.connectivity()
+        return player2_win if player == 2 else player4_win
+
+    def computeWinningState(self, player):
         target = player
         visited = [[False] * 8 for _ in range(8)]
         grid = self.board
@@ -338,9 +502,9 @@ class Board:
         return max(0, min(100, score))
 
     def evaluateMobility(self, player):
-        playerMoves = len(self.get_all_possible_moves(player))
+        playerMoves = self.countMoves(player)
         opponent = 4 if player == 2 else 2
-        opponentMoves = len(self.get_all_possible_moves(opponent))
+        opponentMoves = self.countMoves(opponent)
 
         diff = playerMoves - opponentMoves
         score = diff * 10 + 50
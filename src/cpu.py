@@ -1,90 +1,434 @@
 """CPU player implementation using minimax with alpha-beta pruning."""
 
+import copy
+from dataclasses import dataclass
+import random
+import time
+from typing import Optional
+
 from board import Board
+from endgame import DRAW, LOSS, WIN
+from eval_cache import shared_cache
+from moves import Move
+from ordering import MoveOrderer
+from transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+# Distinguishes maximizing and minimizing nodes of the same position in the table.
+MAXIMIZING_KEY = random.Random(4242).getrandbits(64)
+
+# The clock is only read every CLOCK_CHECK_INTERVAL + 1 nodes.
+CLOCK_CHECK_INTERVAL = 63
+
+
+@dataclass
+class SearchInfo:
+    """Summary of the last call to ``CPUPlayer.play``."""
+
+    depth: int
+    nodes: int
+    elapsed_ms: float
+    timed_out: bool
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    from_book: bool = False
+    solved: bool = False
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Share of beta cutoffs produced by the first move tried."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is exhausted."""
+
+
+def weighted_score(f, weights):
+    """Combines a feature dict into a score.
+
+    Only uses arithmetic, so ``f`` may hold NumPy arrays to score a batch.
+    """
+    mobility_weight = 0.4 * (0.1 + f["connection"] / 100.0)
+
+    base_score = (
+        0.5 * f["grouping"]
+        + 0.5 * f["connection"]
+        + 0.2 * f["enemy_sep"]
+        + mobility_weight * f["mobility"]
+    )
+
+    tuned_score = base_score * weights.get("global", 1.0)
+    tuned_score += (
+        f["grouping"] * weights.get("grouping", 0)
+        + f["connection"] * weights.get("connection", 0)
+        + f["enemy_sep"] * weights.get("enemy_sep", 0)
+        + f["mobility"] * weights.get("mobility", 0)
+    )
+
+    return tuned_score
 
 
 class CPUPlayer:
-    def __init__(self, player, weights):
+    """Alpha-beta player.
+
+    Only the public board API is used, so any engine (``Board`` or
+    ``BitBoard``) can be searched.
+    """
+
+    def __init__(
+        self,
+        player,
+        weights,
+        tt_size=1 << 16,
+        orderer=MoveOrderer,
+        batch_leaves=False,
+        stats=None,
+        eval_cache=shared_cache,
+        book=None,
+        solver=None,
+    ):
         self.player = player
         self.weights = weights
         self.last_best_move = None
         self.last_best_score = None
+        self.last_search_info: Optional[SearchInfo] = None
+        self.nodes = 0
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+        self._deadline = None
+        self._cancelled = False
+        self._rootDepth = 0
+        # Pass tt_size=0 to search without a transposition table.
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        # A MoveOrderer class or instance; None keeps the generation order.
+        self.orderer = orderer() if isinstance(orderer, type) else orderer
+        # Score all children of depth-1 nodes with one batched evaluation.
+        self.batch_leaves = batch_leaves
+        # An optional search_stats.SearchStats filled in by every search.
+        self.stats = stats
+        # Features are weight-independent, so by default every player in the
+        # process shares one cache. Pass None to disable, or a factory/instance.
+        self.eval_cache = eval_cache() if callable(eval_cache) else eval_cache
+        # An optional opening_book.OpeningBook consulted before searching.
+        self.book = book
+        # An optional endgame.ProofNumberSolver tried once few pieces are left.
+        self.solver = solver
+        if batch_leaves:
+            from batch_eval import evaluate_batch
+
+            self._evaluate_batch = evaluate_batch
 
     def evaluate(self, board: Board):
-        f = board.evaluate_features(self.player)
-        mobility_weight = 0.4 * (0.1 + f["connection"] / 100.0)
-
-        base_score = (
-            0.5 * f["grouping"]
-            + 0.5 * f["connection"]
-            + 0.2 * f["enemy_sep"]
-            + mobility_weight * f["mobility"]
-        )
+        if self.stats is not None:
+            self.stats.leaves += 1
+        cache = self.eval_cache
+        if cache is None:
+            return weighted_score(board.evaluate_features(self.player), self.weights)
+        return weighted_score(cache.features(board, self.player), self.weights)
 
-        tuned_score = base_score * self.weights.get("global", 1.0)
-        tuned_score += (
-            f["grouping"] * self.weights.get("grouping", 0)
-            + f["connection"] * self.weights.get("connection", 0)
-            + f["enemy_sep"] * self.weights.get("enemy_sep", 0)
-            + f["mobility"] * self.weights.get("mobility", 0)
-        )
+    def score_children(self, board: Board, moves, maximizing):
+        """Evaluates every child of a frontier node in bulk.
+
+        Returns ``(score, move)`` for the best child from the point of view
+        of the side to move; the score is exact, not an alpha-beta bound.
+        """
+        useBits = hasattr(board, "bits2")
+        positions = []
+        for mv in moves:
+            board.make_move(mv)
+            if useBits:
+                positions.append((board.bits2, board.bits4))
+            else:
+                positions.append([row[:] for row in board.board])
+            board.undo_move()
+        self.nodes += len(moves)
 
-        return tuned_score
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+        _, scores = self._evaluate_batch(positions, self.player, self.weights)
+        if stats is not None:
+            stats.evaluation_time += time.perf_counter() - start
+            stats.leaves += len(moves)
+        idx = int(scores.argmax() if maximizing else scores.argmin())
+        return float(scores[idx]), moves[idx]
 
     def opponent(self):
         return 4 if self.player == 2 else 2
 
     def alphabeta(self, board: Board, depth, alpha, beta, maximizing):
+        self.nodes += 1
+        if not self.nodes & CLOCK_CHECK_INTERVAL and (
+            self._cancelled
+            or self._deadline is not None
+            and time.perf_counter() >= self._deadline
+        ):
+            # Moves still on the board: one per frame between the root and here.
+            raise SearchTimeout(self._rootDepth - depth)
+
         if depth == 0 or board.is_game_over():
             return self.evaluate(board)
 
+        tt = self.tt
+        ttMove = None
+        if tt is not None:
+            key = board.get_zobrist_hash()
+            if maximizing:
+                key ^= MAXIMIZING_KEY
+            entry = tt.probe(key)
+            if entry is not None:
+                ttMove = entry[4]
+            if entry is not None and entry[1] >= depth:
+                flag, score = entry[2], entry[3]
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+
         current = self.player if maximizing else self.opponent()
-        moves = board.get_all_possible_moves(current)
+        moves = board.get_move_codes(current)
 
         if not moves:
             return self.evaluate(board)
 
-        if maximizing:
+        ply = self._rootDepth - depth
+        orderer = self.orderer
+        if orderer is not None:
+            moves = orderer.order(board, moves, ply, current, ttMove)
+
+        windowAlpha, windowBeta = alpha, beta
+        bestMove = None
+        cutoffIndex = -1
+        if depth == 1 and self.batch_leaves:
+            best, bestMove = self.score_children(board, moves, maximizing)
+            # Exact whatever the window, so always stored as such.
+            windowAlpha, windowBeta = -1e9, 1e9
+        elif maximizing:
             best = -1e9
-            for mv in moves:
+            for i, mv in enumerate(moves):
                 board.make_move(mv)
                 val = self.alphabeta(board, depth - 1, alpha, beta, False)
                 board.undo_move()
                 if val > best:
                     best = val
+                    bestMove = mv
                 alpha = max(alpha, val)
                 if beta <= alpha:
+                    cutoffIndex = i
                     break
-            return best
         else:
             best = 1e9
-            for mv in moves:
+            for i, mv in enumerate(moves):
                 board.make_move(mv)
                 val = self.alphabeta(board, depth - 1, alpha, beta, True)
                 board.undo_move()
                 if val < best:
                     best = val
+                    bestMove = mv
                 beta = min(beta, val)
                 if beta <= alpha:
+                    cutoffIndex = i
                     break
-            return best
 
-    def play(self, board: Board, depth=2):
-        moves = board.get_all_possible_moves(self.player)
-        if not moves:
-            return None
+        if cutoffIndex >= 0:
+            self.cutoffs += 1
+            if cutoffIndex == 0:
+                self.firstMoveCutoffs += 1
+            if orderer is not None:
+                orderer.record_cutoff(board, moves[cutoffIndex], ply, depth, current)
+            if self.stats is not None:
+                self.stats.record_cutoff(ply)
+
+        if tt is not None:
+            if best <= windowAlpha:
+                flag = UPPER
+            elif best >= windowBeta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, best, bestMove)
+        return best
+
+    def search_root(self, board: Board, moves, depth):
+        """Searches the root move codes in order and returns the best one.
 
+        Later moves only need to beat the best score so far, so they are
+        searched with it as alpha; the chosen move and score are unchanged.
+        """
+        self._rootDepth = depth
         bestMove = None
         bestScore = -1e9
 
         for mv in moves:
             board.make_move(mv)
-            score = self.alphabeta(board, depth - 1, -1e9, 1e9, False)
+            score = self.alphabeta(board, depth - 1, bestScore, 1e9, False)
             board.undo_move()
             if score > bestScore:
                 bestScore = score
                 bestMove = mv
 
+        return bestMove, bestScore
+
+    def cancel(self):
+        """Asks a ``play`` running on another thread to stop.
+
+        That ``play`` returns the last completed iteration of a timed
+        search, or None if there is none.
+        """
+        self._cancelled = True
+
+    def reset_cancel(self):
+        """Clears a pending ``cancel`` before the next search starts."""
+        self._cancelled = False
+
+    def playBookMove(self, code, score):
+        bestMove = Move.from_code(code)
+        self.last_best_move = bestMove
+        self.last_best_score = score
+        self.last_search_info = SearchInfo(
+            depth=0, nodes=0, elapsed_ms=0.0, timed_out=False, from_book=True
+        )
+        return bestMove
+
+    def playSolvedMove(self, solution):
+        bestMove = Move.from_code(solution.move)
+        self.last_best_move = bestMove
+        self.last_best_score = 1e9 if solution.result == WIN else 0.0
+        self.last_search_info = SearchInfo(
+            depth=0, nodes=solution.nodes, elapsed_ms=0.0, timed_out=False, solved=True
+        )
+        return bestMove
+
+    def settings(self):
+        """Keyword arguments for a ``CPUPlayer`` that searches like this one.
+
+        Used to rebuild the player in another process: the table starts
+        empty, the orderer is copied, and the book, solver and stats stay
+        with this player.
+        """
+        cache = self.eval_cache
+        if cache is shared_cache():
+            # Each process has its own shared cache.
+            cache = shared_cache
+        elif cache is not None:
+            cache = type(cache)(cache.size)
+        return {
+            "tt_size": self.tt.size if self.tt is not None else 0,
+            "orderer": copy.deepcopy(self.orderer),
+            "batch_leaves": self.batch_leaves,
+            "eval_cache": cache,
+        }
+
+    def knownMove(self, board, moves):
+        """Checks the book and the solver before a search.
+
+        Returns ``(move, lost)``: the move to play without searching, or
+        None, and whether the solver proved the position lost.
+        """
+        if self.book is not None:
+            entry = self.book.lookup(board, self.player, self.weights)
+            if entry is not None and entry[0] in moves:
+                return self.playBookMove(*entry), False
+
+        solver = self.solver
+        if solver is not None and solver.applies(board):
+            solution = solver.solve(board, self.player)
+            # A proven win or draw is played directly.
+            if solution.result == WIN or (
+                solution.result == DRAW and solution.move is not None
+            ):
+                return self.playSolvedMove(solution), False
+            return None, solution.result == LOSS
+        return None, False
+
+    def play(self, board: Board, depth=2, time_ms=None, max_depth=32):
+        """Returns the best move for ``self.player``.
+
+        With ``time_ms`` the search deepens one ply at a time (up to
+        ``max_depth``) and returns the last fully searched result once the
+        budget is spent; ``depth`` is then ignored.
+        """
+        moves = board.get_move_codes(self.player)
+        if not moves:
+            return None
+
+        known, lost = self.knownMove(board, moves)
+        if known is not None:
+            return known
+        if lost:
+            # Every move loses to best play, so a one-ply search picks one.
+            depth = max_depth = 1
+
+        if self.tt is not None:
+            self.tt.new_search()
+        if self.orderer is not None:
+            self.orderer.new_search()
+
+        stats = self.stats
+        if stats is not None:
+            board = stats.instrument(board)
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+        timedOut = False
+
+        if time_ms is None:
+            try:
+                bestMove, bestScore = self.search_root(board, moves, depth)
+                reached = depth
+            except SearchTimeout as timeout:
+                # Only cancel() stops a fixed-depth search.
+                for _ in range(timeout.args[0]):
+                    board.undo_move()
+                bestMove, bestScore, reached, timedOut = None, -1e9, 0, True
+        else:
+            deadline = start + time_ms / 1000.0
+            bestMove, bestScore = None, -1e9
+            reached = 0
+            for d in range(1, max_depth + 1):
+                # Depth 1 always completes, unless cancelled, so there is a
+                # move to return.
+                self._deadline = deadline if d > 1 else None
+                try:
+                    bestMove, bestScore = self.search_root(board, moves, d)
+                except SearchTimeout as timeout:
+                    for _ in range(timeout.args[0]):
+                        board.undo_move()
+                    timedOut = True
+                    break
+                finally:
+                    self._deadline = None
+                reached = d
+                # Previous best move first: it is the most likely to stay best.
+                moves.remove(bestMove)
+                moves.insert(0, bestMove)
+                if time.perf_counter() >= deadline:
+                    break
+
+        elapsed = time.perf_counter() - start
+        if stats is not None:
+            stats.searches += 1
+            stats.nodes += self.nodes
+            stats.search_time += elapsed
+
+        if bestMove is None:
+            # Cancelled before any depth completed.
+            return None
+        bestMove = Move.from_code(bestMove)
         self.last_best_move = bestMove
         self.last_best_score = bestScore
+        self.last_search_info = SearchInfo(
+            depth=reached,
+            nodes=self.nodes,
+            elapsed_ms=elapsed * 1000.0,
+            timed_out=timedOut,
+            cutoffs=self.cutoffs,
+            first_move_cutoffs=self.firstMoveCutoffs,
+        )
         return bestMove
@@ -0,0 +1,193 @@
+"""Proof-number search for solving positions with few pieces left.
+
+Only the board API shared by both engines is used (``get_move_codes``,
+``make_move``, ``undo_move``, ``is_game_over``, ``get_winner`` and
+``countMoves`` to seed the proof numbers), so any engine can be solved.
+A position is a draw when the side to move has no moves, when both sides
+connect at once, or when it repeats along the line being searched.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+INFINITY = 1 << 30
+
+
+class Node:
+    """Tree node; ``isOr`` nodes are those where the attacker is to move."""
+
+    __slots__ = ("move", "pn", "dn", "isOr", "parent", "children")
+
+    def __init__(self, move, isOr, parent):
+        self.move = move
+        self.isOr = isOr
+        self.parent = parent
+        self.children = None
+        self.pn = 1
+        self.dn = 1
+
+
+@dataclass
+class Solution:
+    """Result of a solve from the point of view of the side to move.
+
+    ``move`` is a winning move for a WIN, a non-losing move for a DRAW,
+    and None for a LOSS. ``result`` is None if the budget ran out.
+    """
+
+    result: Optional[int]
+    move: Optional[int]
+    nodes: int
+
+
+class ProofNumberSolver:
+    """Solves positions whose total piece count is at most ``max_pieces``.
+
+    ``max_nodes`` bounds the tree of each proof attempt. Results, including
+    failures to solve within the budget, are remembered in a table of at
+    most ``cache_size`` entries that is cleared when full.
+    """
+
+    def __init__(self, max_pieces=8, max_nodes=5000, cache_size=1 << 14):
+        self.max_pieces = max_pieces
+        self.max_nodes = max_nodes
+        self.cache_size = cache_size
+        self.solutions = {}
+        self.hits = 0
+        self.solved = 0
+        self.unsolved = 0
+
+    def applies(self, board):
+        return board.getPieceCount(2) + board.getPieceCount(4) <= self.max_pieces
+
+    def solve(self, board, player):
+        """Returns the :class:`Solution` for ``player`` to move on ``board``."""
+        if board.is_game_over():
+            winner = board.get_winner()
+            result = DRAW if winner is None else WIN if winner == player else LOSS
+            return Solution(result, None, 0)
+
+        key = (board.get_position_hash(), player)
+        cached = self.solutions.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        opponent = 4 if player == 2 else 2
+        proved, move, nodes = self.prove(board, player, player)
+        if proved:
+            solution = Solution(WIN, move, nodes)
+        elif proved is None:
+            # Disproving is the harder half; not worth trying if proving failed.
+            solution = Solution(None, None, nodes)
+        else:
+            lost, move, more = self.prove(board, player, opponent)
+            nodes += more
+            if lost:
+                solution = Solution(LOSS, None, nodes)
+            elif lost is False:
+                solution = Solution(DRAW, move, nodes)
+            else:
+                solution = Solution(None, None, nodes)
+
+        if solution.result is None:
+            self.unsolved += 1
+        else:
+            self.solved += 1
+        if len(self.solutions) >= self.cache_size:
+            self.solutions.clear()
+        self.solutions[key] = solution
+        return solution
+
+    def prove(self, board, toMove, attacker):
+        """Tries to prove that ``attacker`` wins with ``toMove`` to move.
+
+        Returns ``(outcome, move, nodes)``: outcome is True (proved), False
+        (disproved) or None (budget exhausted). ``move`` is the root move
+        that proves the win, or disproves it when the defender is to move.
+        """
+        root = Node(None, toMove == attacker, None)
+        nodes = 1
+        path = {board.get_zobrist_hash()}
+        while root.pn and root.dn and nodes < self.max_nodes:
+            # Walk down to the most-proving node.
+            node = root
+            player = toMove
+            line = []
+            while node.children is not None:
+                if node.isOr:
+                    node = min(node.children, key=lambda c: c.pn)
+                else:
+                    node = min(node.children, key=lambda c: c.dn)
+                board.make_move(node.move)
+                line.append(board.get_zobrist_hash())
+                player = 4 if player == 2 else 2
+            path.update(line)
+
+            nodes += self.expand(board, node, player, attacker, path)
+
+            for _ in line:
+                board.undo_move()
+            path.difference_update(line)
+            self.update(node)
+
+        if root.pn == 0:
+            outcome = True
+        elif root.dn == 0:
+            outcome = False
+        else:
+            return None, None, nodes
+
+        move = None
+        if root.children:
+            if root.isOr and outcome:
+                move = next(c.move for c in root.children if c.pn == 0)
+            elif not root.isOr and not outcome:
+                move = next(c.move for c in root.children if c.dn == 0)
+        return outcome, move, nodes
+
+    def expand(self, board, node, player, attacker, path):
+        """Creates and scores the children of ``node``; returns how many."""
+        opponent = 4 if player == 2 else 2
+        children = []
+        for code in board.get_move_codes(player):
+            child = Node(code, opponent == attacker, node)
+            board.make_move(code)
+            if board.is_game_over():
+                if board.get_winner() == attacker:
+                    child.pn, child.dn = 0, INFINITY
+                else:
+                    child.pn, child.dn = INFINITY, 0
+            elif board.get_zobrist_hash() in path:
+                # A repetition can only help the defender hold the draw.
+                child.pn, child.dn = INFINITY, 0
+            elif child.isOr:
+                child.dn = max(1, board.countMoves(opponent))
+            else:
+                child.pn = max(1, board.countMoves(opponent))
+            board.undo_move()
+            children.append(child)
+            if node.isOr and child.pn == 0 or not node.isOr and child.dn == 0:
+                break
+        if not children:
+            # No legal move: a draw, so never a win for the attacker.
+            node.pn, node.dn = INFINITY, 0
+        node.children = children
+        return len(children)
+
+    @staticmethod
+    def update(node):
+        while node is not None:
+            children = node.children
+            if children:
+                if node.isOr:
+                    node.pn = min(c.pn for c in children)
+                    node.dn = min(INFINITY, sum(c.dn for c in children))
+                else:
+                    node.pn = min(INFINITY, sum(c.pn for c in children))
+                    node.dn = min(c.dn for c in children)
+            node = node.parent
@@ -0,0 +1,65 @@
+"""Bounded cache of evaluation features keyed by position hash and player.
+
+Features depend only on the piece placement and the evaluating player,
+never on the weights, so one cache can serve every ``CPUPlayer`` in a
+process, whatever its weights and across games.
+"""
+
+from collections import OrderedDict
+
+_shared = None
+
+
+class EvaluationCache:
+    """Least-recently-used map from ``(position hash, player)`` to features.
+
+    Cached feature dicts are shared between callers and must not be
+    modified.
+    """
+
+    def __init__(self, size=1 << 16):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def features(self, board, player):
+        """Returns ``board.evaluate_features(player)``, computing it on a miss."""
+        key = (board.get_position_hash() << 3) | player
+        entries = self.entries
+        f = entries.get(key)
+        if f is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return f
+        self.misses += 1
+        f = board.evaluate_features(player)
+        entries[key] = f
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return f
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size": self.size,
+            "used": len(self.entries),
+            "fill": len(self.entries) / self.size if self.size else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
+
+
+def shared_cache():
+    """Returns the process-wide cache, creating it on first use."""
+    global _shared
+    if _shared is None:
+        _shared = EvaluationCache()
+    return _shared
@@ -0,0 +1,233 @@
+"""CMA-ES optimizer for the evaluation weights.
+
+A drop-in alternative to ``optimization.OptimizationRunner``: ``step``
+runs one generation and returns the same ``OptimizationStats``.
+"""
+
+import json
+import math
+import os
+import random
+
+import numpy as np
+
+from board import Board
+from optimization import (
+    OptimizationStats,
+    SequentialTest,
+    log_candidates,
+    make_executor,
+    random_weights,
+    sequential_fitness_many,
+    write_checkpoint,
+)
+
+FEATURES = ("grouping", "connection", "enemy_sep", "mobility")
+
+
+def to_weights(x):
+    # Negative weights are clipped, as in ``perturb``.
+    return {k: max(0.0, float(v)) for k, v in zip(FEATURES, x)}
+
+
+class CMAESRunner:
+    """Covariance matrix adaptation evolution strategy over the weights.
+
+    Each generation samples ``population`` candidates (by default
+    ``4 + 3 ln n``) and scores all of them in one batch of games, spread
+    over ``workers`` processes. Every candidate plays ``pairs``
+    color-alternated pairs against the baseline, each pair from its own
+    opening. ``best``/``best_score`` track the best candidate seen.
+
+    ``checkpoint``, ``log_path`` and ``solver`` work as for
+    ``OptimizationRunner``: the runner resumes from the checkpoint when it
+    exists, every scored candidate is appended to the log, and the solver
+    settles endgames in every game.
+    """
+
+    def __init__(
+        self,
+        sigma: float = 0.4,
+        board_cls=Board,
+        workers: int = 1,
+        population=None,
+        seed=None,
+        adjudication=None,
+        pairs: int = 2,
+        checkpoint=None,
+        log_path=None,
+        solver=None,
+    ):
+        n = len(FEATURES)
+        self.board_cls = board_cls
+        self.adjudication = adjudication
+        self.solver = solver
+        self.checkpoint = checkpoint
+        self.log_path = log_path
+        self.test = SequentialTest(min_pairs=pairs, max_pairs=pairs)
+        self.population = population or 4 + int(3 * math.log(n))
+        if self.population < 2:
+            raise ValueError("CMA-ES a besoin d'une population d'au moins 2 candidats")
+        self.executor = make_executor(workers)
+        self.rng = np.random.default_rng(seed)
+        self.games = 0
+
+        # Recombination weights and learning rates from Hansen's tutorial.
+        mu = self.population // 2
+        w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        self.recombination = w / w.sum()
+        self.mueff = 1.0 / np.sum(self.recombination**2)
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(
+            1 - self.c1,
+            2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff),
+        )
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chiN = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+            return
+
+        start = random_weights(random.Random(seed) if seed is not None else random)
+        self.mean = np.array([start[k] for k in FEATURES], dtype=float)
+        self.sigma = sigma
+        self.C = np.eye(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+
+        self.best = to_weights(self.mean)
+        self.iteration = 0
+        (result,) = self.evaluate([self.best])
+        self.best_score = result.score
+        self.last_candidate = self.best
+        self.last_score = self.best_score
+        self.log([self.best], [result], improved=False)
+
+    def state(self):
+        """Everything needed to continue the run, as JSON-friendly values."""
+        return {
+            "mean": self.mean.tolist(),
+            "sigma": self.sigma,
+            "C": self.C.tolist(),
+            "B": self.B.tolist(),
+            "D": self.D.tolist(),
+            "pc": self.pc.tolist(),
+            "ps": self.ps.tolist(),
+            "best": self.best,
+            "best_score": self.best_score,
+            "iteration": self.iteration,
+            "games": self.games,
+            "last_candidate": self.last_candidate,
+            "last_score": self.last_score,
+            "rng_state": self.rng.bit_generator.state,
+        }
+
+    def save_checkpoint(self, path=None, state=None):
+        write_checkpoint(path or self.checkpoint, state or self.state())
+
+    def load_checkpoint(self, path):
+        with open(path) as f:
+            state = json.load(f)
+        for name in ("mean", "C", "B", "D", "pc", "ps"):
+            setattr(self, name, np.array(state[name], dtype=float))
+        self.sigma = state["sigma"]
+        self.best = state["best"]
+        self.best_score = state["best_score"]
+        self.iteration = state["iteration"]
+        self.games = state["games"]
+        self.last_candidate = state["last_candidate"]
+        self.last_score = state["last_score"]
+        self.rng.bit_generator.state = state["rng_state"]
+
+    def evaluate(self, candidates):
+        results = sequential_fitness_many(
+            candidates,
+            0.0,
+            self.test,
+            self.board_cls,
+            self.executor,
+            self.adjudication,
+            solver=self.solver,
+        )
+        self.games += sum(r.games for r in results)
+        return results
+
+    def log(self, candidates, results, improved):
+        if self.log_path is not None:
+            entries = [(w, r.score, r.games, None) for w, r in zip(candidates, results)]
+            log_candidates(self.log_path, self.iteration, entries, self.best, improved)
+
+    def step(self) -> OptimizationStats:
+        """Samples, scores and learns from one generation."""
+        n = len(FEATURES)
+        gamesBefore = self.games
+
+        z = self.rng.standard_normal((self.population, n))
+        y = (z * self.D) @ self.B.T
+        x = self.mean + self.sigma * y
+        candidates = [to_weights(row) for row in x]
+        results = self.evaluate(candidates)
+        scores = [r.score for r in results]
+
+        # Higher fitness first; ties keep the sampling order.
+        order = sorted(range(self.population), key=lambda i: -scores[i])
+        mu = len(self.recombination)
+        ySel = y[order[:mu]]
+        yw = self.recombination @ ySel
+        self.mean = self.mean + self.sigma * yw
+
+        invSqrtC = self.B @ np.diag(1 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(
+            self.cs * (2 - self.cs) * self.mueff
+        ) * (invSqrtC @ yw)
+        psNorm = np.linalg.norm(self.ps)
+        generation = self.iteration + 1
+        hsig = psNorm / math.sqrt(1 - (1 - self.cs) ** (2 * generation)) < (
+            1.4 + 2 / (n + 1)
+        ) * self.chiN
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(
+            self.cc * (2 - self.cc) * self.mueff
+        ) * yw
+
+        rankMu = (ySel.T * self.recombination) @ ySel
+        self.C = (
+            (1 - self.c1 - self.cmu) * self.C
+            + self.c1
+            * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C)
+            + self.cmu * rankMu
+        )
+        self.sigma *= math.exp((self.cs / self.damps) * (psNorm / self.chiN - 1))
+
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+        best_index = order[0]
+        self.iteration = generation
+        self.last_candidate = candidates[best_index]
+        self.last_score = scores[best_index]
+        improved = self.last_score > self.best_score
+        if improved:
+            self.best, self.best_score = self.last_candidate, self.last_score
+        self.log(candidates, results, improved)
+
+        return OptimizationStats(
+            best_weights=self.best,
+            best_score=self.best_score,
+            iteration=self.iteration,
+            sigma=self.sigma,
+            last_candidate=self.last_candidate,
+            last_score=self.last_score,
+            improved=improved,
+            games=self.games - gamesBefore,
+        )
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
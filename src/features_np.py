@@ -0,0 +1,115 @@
+"""Vectorized NumPy versions of the board evaluation features.
+
+Every function takes an 8x8 integer array (see :func:`board_array`) and
+returns exactly the same number as the matching ``Board.evaluate*`` method.
+"""
+
+import numpy as np
+
+from bitboard import count_moves
+
+# Offsets of the 8 neighbours of a square.
+NEIGHBOUR_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def board_array(board):
+    """Returns the position of ``Board`` or ``BitBoard`` as an 8x8 int8 array."""
+    return np.array(board.board, dtype=np.int8)
+
+
+def neighbour_counts(mask):
+    """Counts, for every square, how many of its 8 neighbours are set in ``mask``."""
+    padded = np.pad(mask.astype(np.int8), 1)
+    total = np.zeros(mask.shape, dtype=np.int8)
+    for dy, dx in NEIGHBOUR_OFFSETS:
+        total += padded[1 + dy : 9 + dy, 1 + dx : 9 + dx]
+    return total
+
+
+def component_labels(mask):
+    """Labels 8-connected groups with the row-major index of their first square.
+
+    Empty squares get label 64, so sorting labels gives groups in the order
+    a row-major scan discovers them.
+    """
+    empty = 64
+    labels = np.where(mask, np.arange(64).reshape(8, 8), empty)
+    while True:
+        padded = np.pad(labels, 1, constant_values=empty)
+        smallest = labels
+        for dy, dx in NEIGHBOUR_OFFSETS:
+            smallest = np.minimum(smallest, padded[1 + dy : 9 + dy, 1 + dx : 9 + dx])
+        updated = np.where(mask, smallest, empty)
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def to_bits(mask):
+    """Packs a boolean 8x8 mask into a bitboard integer."""
+    return int.from_bytes(np.packbits(mask.ravel(), bitorder="little").tobytes(), "little")
+
+
+def evaluate_enemy_separation(grid, player):
+    opponent = 4 if player == 2 else 2
+    mask = grid == opponent
+    isolated = int(np.count_nonzero(mask & (neighbour_counts(mask) == 0)))
+    return min(100, isolated * 10)
+
+
+def evaluate_grouping(grid, player):
+    pieces = np.argwhere(grid == player)
+    n = len(pieces)
+    if n <= 1:
+        return 100
+
+    diff = pieces[:, None, :] - pieces[None, :, :]
+    # Every unordered pair appears twice in the full distance matrix.
+    sumSq = int((diff * diff).sum()) // 2
+    pairs = n * (n - 1) // 2
+
+    avg = sumSq / pairs
+    score = int(100 - avg * 1.5)
+    return max(0, min(100, score))
+
+
+def evaluate_connection_potential(grid, player):
+    mask = grid == player
+    if np.count_nonzero(mask) <= 1:
+        return 100
+
+    labels = component_labels(mask)
+    groupLabels, sizes = np.unique(labels[mask], return_counts=True)
+    if len(groupLabels) == 1:
+        return 100
+
+    # argmax keeps the first (earliest discovered) group among equal sizes.
+    mainLabel = groupLabels[np.argmax(sizes)]
+    mainPieces = np.argwhere(labels == mainLabel)
+    others = np.argwhere(mask & (labels != mainLabel))
+
+    dist = np.abs(others[:, None, :] - mainPieces[None, :, :]).max(axis=2)
+    totalDist = int(dist.min(axis=1).sum())
+
+    score = 100 - totalDist * 8
+    return max(0, min(100, score))
+
+
+def evaluate_mobility(grid, player):
+    opponent = 4 if player == 2 else 2
+    own = to_bits(grid == player)
+    opp = to_bits(grid == opponent)
+
+    diff = count_moves(own, opp) - count_moves(opp, own)
+    score = diff * 10 + 50
+    return max(0, min(100, score))
+
+
+def evaluate_features(grid, player):
+    """NumPy counterpart of ``Board.evaluate_features``."""
+    return {
+        "grouping": evaluate_grouping(grid, player),
+        "enemy_sep": evaluate_enemy_separation(grid, player),
+        "connection": evaluate_connection_potential(grid, player),
+        "mobility": evaluate_mobility(grid, player),
+    }
@@ -1,15 +1,16 @@
 """Compatibility wrapper re-exporting the main game components."""
 
+from .bitboard import BitBoard
 from .board import Board
 from .cpu import CPUPlayer
-from .moves import Move, MoveState
+from .moves import Move
 from .optimization import fitness, optimize, perturb, play_match, random_weights
 
 __all__ = [
+    "BitBoard",
     "Board",
     "CPUPlayer",
     "Move",
-    "MoveState",
     "fitness",
     "optimize",
     "perturb",
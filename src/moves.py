@@ -1,22 +1,67 @@
-"""Core move-related data structures for the game logic."""
+"""Core move-related data structures for the game logic.
+
+Inside the search, moves travel as packed ints (see :func:`encode_move`);
+:class:`Move` remains the public, readable form returned to callers.
+"""
+
+# Move code layout: from square (6 bits) | to square (6 bits) | capture flag
+# Squares are numbered row * 8 + col.
+TO_SHIFT = 6
+CAPTURE_FLAG = 1 << 12
+SQUARES_MASK = (1 << 12) - 1
+
+# History entry layout: move squares (12 bits) | moved piece (3 bits) | captured piece (3 bits)
+MOVED_SHIFT = 12
+CAPTURED_SHIFT = 15
+
+
+def encode_move(fr, fc, tr, tc, capture=False):
+    code = (fr * 8 + fc) | ((tr * 8 + tc) << TO_SHIFT)
+    if capture:
+        code |= CAPTURE_FLAG
+    return code
+
+
+def decode_move(code):
+    """Returns ``(fr, fc, tr, tc)`` for a move code."""
+    fromSq = code & 63
+    toSq = (code >> TO_SHIFT) & 63
+    return fromSq >> 3, fromSq & 7, toSq >> 3, toSq & 7
+
 
 class Move:
     """Represents a move from one coordinate to another."""
 
+    __slots__ = ("fr", "fc", "tr", "tc")
+
     def __init__(self, fr, fc, tr, tc):
         self.fr = fr
         self.fc = fc
         self.tr = tr
         self.tc = tc
 
+    @classmethod
+    def from_code(cls, code):
+        return cls(*decode_move(code))
+
+    @property
+    def code(self):
+        return encode_move(self.fr, self.fc, self.tr, self.tc)
+
+    def __eq__(self, other):
+        try:
+            return (self.fr, self.fc, self.tr, self.tc) == (
+                other.fr,
+                other.fc,
+                other.tr,
+                other.tc,
+            )
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return self.code
 
-class MoveState:
-    """Snapshot of a move to support undo/redo operations."""
+    def __repr__(self):
+        return f"Move({self.fr}, {self.fc}, {self.tr}, {self.tc})"
 
-    def __init__(self, fr, fc, tr, tc, moved, captured):
-        self.fromRow = fr
-        self.fromCol = fc
-        self.toRow = tr
-        self.toCol = tc
-        self.movedPiece = moved
-        self.capturedPiece = captured
@@ -0,0 +1,241 @@
+"""Opening book: precomputed best replies for the first plies of a game.
+
+The book file is a short header followed by fixed-size records sorted by
+key, so it can be memory-mapped and searched by bisection without being
+parsed::
+
+    header: magic b"OBK2", uint32 record count, uint64 weights key
+    record: uint64 key, uint16 move code, 2 pad bytes, float32 score
+
+Keys combine the piece-placement hash with the side to move (see
+:func:`book_key`). The weights key identifies the weight set the book
+was built for (see :func:`weights_key`, 0 for none); players with other
+weights search instead of using it. Run ``python src/opening_book.py --help`` to build or
+extend a book.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+
+from board import Board
+from cpu import CPUPlayer, weighted_score
+from moves import SQUARES_MASK
+
+MAGIC = b"OBK2"
+HEADER = struct.Struct("<4sIQ")
+RECORD = struct.Struct("<QH2xf")
+KEY = struct.Struct("<Q")
+
+_sideRng = random.Random(1616)
+SIDE_KEYS = {2: _sideRng.getrandbits(64), 4: _sideRng.getrandbits(64)}
+
+
+def book_key(board, player):
+    return board.get_position_hash() ^ SIDE_KEYS[player]
+
+
+def weights_key(weights):
+    """Stable nonzero 64-bit hash of a weight set; 1 and 1.0 hash the same."""
+    text = json.dumps({k: float(v) for k, v in weights.items()}, sort_keys=True)
+    digest = hashlib.sha256(text.encode()).digest()
+    return int.from_bytes(digest[:8], "little") or 1
+
+
+class OpeningBook:
+    """Sorted, memory-mapped book plus the entries added since it was loaded.
+
+    ``lookup`` returns ``(move code, score)`` or None; entries added with ``add``
+    are only written out by ``save``. With ``weights`` the book is bound to
+    that weight set, and an existing file built for another one is
+    rejected; otherwise it takes the binding of the file, if any.
+    """
+
+    def __init__(self, path=None, weights=None):
+        self.path = path
+        self.weights_key = weights_key(weights) if weights is not None else 0
+        self.pending = {}
+        self.count = 0
+        self.mm = None
+        self._file = None
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self._open(path)
+
+    def _open(self, path):
+        self._file = open(path, "rb")
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self.mm)
+        if size >= HEADER.size:
+            magic, count, key = HEADER.unpack_from(self.mm, 0)
+        else:
+            magic, count, key = b"", 0, 0
+        if magic != MAGIC or size != HEADER.size + count * RECORD.size:
+            self.close()
+            raise ValueError(f"Fichier de livre d'ouvertures invalide: {path}")
+        if self.weights_key and key and key != self.weights_key:
+            self.close()
+            raise ValueError(f"Livre d'ouvertures construit pour d'autres poids: {path}")
+        self.weights_key = self.weights_key or key
+        self.count = count
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self._file.close()
+        self.mm = None
+        self._file = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count + sum(1 for k in self.pending if self._find(k) is None)
+
+    def _find(self, key):
+        """Returns ``(move, score)`` for ``key`` from the file, or None."""
+        mm = self.mm
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            k = KEY.unpack_from(mm, HEADER.size + mid * RECORD.size)[0]
+            if k < key:
+                lo = mid + 1
+            elif k > key:
+                hi = mid
+            else:
+                _, move, score = RECORD.unpack_from(mm, HEADER.size + mid * RECORD.size)
+                return move, score
+        return None
+
+    def get(self, key):
+        entry = self.pending.get(key)
+        if entry is None and self.count:
+            entry = self._find(key)
+        return entry
+
+    def matches(self, weights):
+        """True if a player with ``weights`` may use this book."""
+        return not self.weights_key or weights_key(weights) == self.weights_key
+
+    def lookup(self, board, player, weights=None):
+        """Returns the book entry, or None; always None for foreign ``weights``."""
+        if weights is not None and not self.matches(weights):
+            return None
+        entry = self.get(book_key(board, player))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def add(self, board, player, move, score):
+        self.pending[book_key(board, player)] = (move, score)
+
+    def records(self):
+        """Yields every ``(key, move, score)`` in the file, in key order."""
+        for i in range(self.count):
+            yield RECORD.unpack_from(self.mm, HEADER.size + i * RECORD.size)
+
+    def save(self, path=None):
+        """Writes the merged book atomically and reopens it from disk."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("Aucun chemin pour enregistrer le livre d'ouvertures")
+        merged = {key: (move, score) for key, move, score in self.records()}
+        merged.update(self.pending)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(merged), self.weights_key))
+            for key in sorted(merged):
+                move, score = merged[key]
+                f.write(RECORD.pack(key, move, score))
+        self.close()
+        os.replace(tmp, path)
+        self.path = path
+        self.pending = {}
+        self._open(path)
+
+
+def extend_book(book, weights, plies=6, depth=3, width=3, board_cls=Board):
+    """Adds best replies for every position within ``plies`` of the start.
+
+    From each position the searched best move and the ``width - 1`` next
+    moves by static evaluation are followed, so common deviations are
+    covered too. Positions already in the book are not searched again.
+    Returns the number of positions searched. The book is bound to
+    ``weights``; extending a book built for other weights raises ValueError.
+    """
+    if not book.matches(weights):
+        raise ValueError("Livre d'ouvertures construit pour d'autres poids")
+    book.weights_key = weights_key(weights)
+    board = board_cls()
+    cpus = {2: CPUPlayer(2, weights), 4: CPUPlayer(4, weights)}
+    searched = 0
+
+    def visit(player, ply):
+        nonlocal searched
+        if ply >= plies or board.is_game_over():
+            return
+        moves = board.get_move_codes(player)
+        if not moves:
+            return
+        entry = book.get(book_key(board, player))
+        if entry is None:
+            cpu = cpus[player]
+            best = cpu.play(board, depth=depth).code
+            # Move.code drops the capture flag; keep the generated code.
+            best = next(code for code in moves if code & SQUARES_MASK == best)
+            book.add(board, player, best, cpu.last_best_score)
+            searched += 1
+        else:
+            best = entry[0]
+
+        def static(code):
+            board.make_move(code)
+            score = weighted_score(board.evaluate_features(player), weights)
+            board.undo_move()
+            return score
+
+        others = sorted((c for c in moves if c != best), key=static, reverse=True)
+        opponent = 4 if player == 2 else 2
+        for code in [best] + others[: width - 1]:
+            board.make_move(code)
+            visit(opponent, ply + 1)
+            board.undo_move()
+
+    visit(2, 0)
+    return searched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("book", help="book file, created or extended in place")
+    parser.add_argument("--weights", help="JSON file of weights (default: baseline)")
+    parser.add_argument("--plies", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.weights:
+        with open(args.weights) as f:
+            weights = json.load(f)
+    else:
+        from optimization import BASELINE_WEIGHTS
+
+        weights = BASELINE_WEIGHTS
+
+    book = OpeningBook(args.book, weights)
+    before = len(book)
+    searched = extend_book(book, weights, args.plies, args.depth, args.width)
+    book.save(args.book)
+    print(f"{searched} positions searched, {len(book) - before} added, {len(book)} total")
+    book.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
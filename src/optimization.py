@@ -1,11 +1,21 @@
 """Weight optimization loop for the AI player."""
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import repeat
+import json
+import math
+import os
 import random
-from typing import Dict
+import time
+from typing import Dict, List, Optional
 
 from board import Board
-from cpu import CPUPlayer
+from cpu import CPUPlayer, weighted_score
+from progress import MetricsWriter
+
+MAX_PLIES = 200
 
 
 @dataclass
@@ -19,94 +29,598 @@ class OptimizationStats:
     last_candidate: Dict[str, float]
     last_score: float
     improved: bool
+    games: int = 0
+
+
+def stats_record(stats):
+    """Flattens OptimizationStats into one row for ``progress.MetricsWriter``."""
+    record = {
+        "time": time.time(),
+        "iteration": stats.iteration,
+        "best_score": stats.best_score,
+        "last_score": stats.last_score,
+        "sigma": stats.sigma,
+        "games": stats.games,
+        "improved": stats.improved,
+    }
+    for k, v in stats.best_weights.items():
+        record[f"best_{k}"] = v
+    return record
 
 
-def random_weights():
+def random_weights(rng=random):
     return {
-        "grouping": random.uniform(0, 2),
-        "connection": random.uniform(0, 2),
-        "enemy_sep": random.uniform(0, 2),
-        "mobility": random.uniform(0, 2),
+        "grouping": rng.uniform(0, 2),
+        "connection": rng.uniform(0, 2),
+        "enemy_sep": rng.uniform(0, 2),
+        "mobility": rng.uniform(0, 2),
     }
 
 
-def perturb(weights, sigma=0.2):
+def perturb(weights, sigma=0.2, rng=random):
     return {
-        k: max(0, weights[k] + random.gauss(0, sigma))
+        k: max(0, weights[k] + rng.gauss(0, sigma))
         for k in weights
     }
 
 
-def play_match(wA, wB):
-    board = Board()
+@dataclass
+class Adjudication:
+    """Rules for ending a self-play game early; a rule set to 0 is off.
+
+    - ``repetitions``: draw when a position occurs that many times.
+    - ``resign_margin``/``resign_plies``: the side behind resigns once
+      :func:`referee_score` has stayed past the margin for that many plies.
+    - ``no_progress_plies``: draw after that many plies without a capture.
+    """
 
-    pA = CPUPlayer(2, wA)
-    pB = CPUPlayer(4, wB)
+    repetitions: int = 3
+    resign_margin: float = 150.0
+    resign_plies: int = 6
+    no_progress_plies: int = 40
+
+
+@dataclass
+class MatchResult:
+    """Outcome of one game; ``reason`` names the rule that ended it.
+
+    ``plies_saved`` is the number of plies left before ``MAX_PLIES`` when
+    a rule stopped the game, so an upper bound on the real saving.
+    ``moves`` holds the codes played after the opening, for replays.
+    """
+
+    result: int
+    plies: int
+    reason: str
+    plies_saved: int = 0
+    moves: List[int] = field(default_factory=list)
+
+
+def referee_score(board):
+    """Baseline-weighted evaluation of player 2 minus that of player 4.
+
+    Players score positions with their own weights and not as a zero-sum
+    difference, so resignation is judged by this neutral score instead.
+    """
+    score2 = weighted_score(board.evaluate_features(2), BASELINE_WEIGHTS)
+    score4 = weighted_score(board.evaluate_features(4), BASELINE_WEIGHTS)
+    return score2 - score4
+
+
+def opening_moves(index, plies=4):
+    """Move codes of a short random opening, the same for every engine.
+
+    Index 0 is the empty opening; other indices give a fixed sequence of
+    ``plies`` random moves (an even number, so player 2 moves next).
+    """
+    if index == 0:
+        return []
+    rng = random.Random(index)
+    while True:
+        board = Board()
+        codes = []
+        player = 2
+        for _ in range(plies):
+            code = rng.choice(board.get_move_codes(player))
+            board.make_move(code)
+            codes.append(code)
+            player = 4 if player == 2 else 2
+        if not board.is_game_over():
+            return codes
+
+
+def run_match(
+    wA, wB, board_cls=Board, book=None, solver=None, adjudication=None, opening=()
+):
+    """Plays ``wA`` (player 2) against ``wB`` and returns a MatchResult.
+
+    ``opening`` is a list of move codes played first, player 2 moving
+    first; it must have an even length.
+    """
+    board = board_cls()
+    for code in opening:
+        board.make_move(code)
+
+    pA = CPUPlayer(2, wA, book=book, solver=solver)
+    pB = CPUPlayer(4, wB, book=book, solver=solver)
+
+    rules = adjudication
+    seen = {}
+    resignStreak = 0
+    resignLeader = 0
+    quietPlies = 0
+    moves = []
+
+    def adjudicated(result, reason, plies):
+        return MatchResult(result, plies, reason, MAX_PLIES - plies, moves)
 
     current = 2
 
-    for _ in range(200):
+    for ply in range(MAX_PLIES):
         if board.is_game_over():
             w = board.get_winner()
-            if w == 2:
-                return +1
-            if w == 4:
-                return -1
-            return 0
+            result = 1 if w == 2 else -1 if w == 4 else 0
+            return MatchResult(result, ply, "game_over", moves=moves)
 
         player = pA if current == 2 else pB
         mv = player.play(board, depth=2)
         if mv is None:
-            return 0
+            return MatchResult(0, ply, "no_moves", moves=moves)
 
+        capture = board.pieceAt(mv.tc, mv.tr) != 0
         board.make_move(mv)
+        moves.append(mv.code)
         current = 4 if current == 2 else 2
 
-    return 0
-
-
-def fitness(weights):
-    baseline = {
-        "grouping": 1,
-        "connection": 1,
-        "enemy_sep": 1,
-        "mobility": 1,
-    }
-    score = 0
+        # A finished game is scored normally at the top of the loop.
+        if rules is None or board.is_game_over():
+            continue
+        played = ply + 1
+        if rules.repetitions:
+            key = board.get_zobrist_hash()
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] >= rules.repetitions:
+                return adjudicated(0, "repetition", played)
+        if rules.resign_plies:
+            score = referee_score(board)
+            if abs(score) < rules.resign_margin:
+                leader = 0
+            else:
+                leader = 1 if score > 0 else -1
+            if leader and leader == resignLeader:
+                resignStreak += 1
+            else:
+                resignStreak = abs(leader)
+            resignLeader = leader
+            if resignStreak >= rules.resign_plies:
+                return adjudicated(leader, "resign", played)
+        if rules.no_progress_plies:
+            quietPlies = 0 if capture else quietPlies + 1
+            if quietPlies >= rules.no_progress_plies:
+                return adjudicated(0, "no_progress", played)
+
+    return MatchResult(0, MAX_PLIES, "max_plies", moves=moves)
+
+
+def play_match(
+    wA, wB, board_cls=Board, book=None, solver=None, adjudication=None, opening=()
+):
+    return run_match(wA, wB, board_cls, book, solver, adjudication, opening).result
+
+
+BASELINE_WEIGHTS = {
+    "grouping": 1,
+    "connection": 1,
+    "enemy_sep": 1,
+    "mobility": 1,
+}
+
+
+def fitness_games(weights):
+    """Returns the ``(wA, wB, sign)`` games that make up one fitness score."""
+    baseline = BASELINE_WEIGHTS
+    games = []
     for _ in range(2):
         # Alterne les couleurs entre chaque partie contre le même adversaire
-        score += play_match(weights, baseline)
-        score -= play_match(baseline, weights)
-    return score
+        games.append((weights, baseline, 1))
+        games.append((baseline, weights, -1))
+    return games
+
+
+def make_executor(workers):
+    """Returns a process pool for ``workers`` > 1, or None to stay serial."""
+    if workers is None or workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def fitness_many(
+    candidates, board_cls=Board, executor=None, adjudication=None, solver=None
+):
+    """Scores several candidates, spreading all of their games over ``executor``.
+
+    Games are deterministic, so the result is the same with or without an
+    executor. A ``solver`` (``endgame.ProofNumberSolver``) settles endgames
+    with few pieces left instead of searching them.
+    """
+    games = [g for w in candidates for g in fitness_games(w)]
+    wAs = [g[0] for g in games]
+    wBs = [g[1] for g in games]
+    play = partial(
+        play_match, board_cls=board_cls, solver=solver, adjudication=adjudication
+    )
+    if executor is None:
+        results = list(map(play, wAs, wBs))
+    else:
+        results = list(executor.map(play, wAs, wBs))
+
+    perCandidate = len(games) // len(candidates) if candidates else 0
+    scores = []
+    for i in range(len(candidates)):
+        chunk = range(i * perCandidate, (i + 1) * perCandidate)
+        scores.append(sum(games[j][2] * results[j] for j in chunk))
+    return scores
+
+
+def fitness(weights, board_cls=Board, executor=None, adjudication=None, solver=None):
+    return fitness_many([weights], board_cls, executor, adjudication, solver)[0]
 
 
-class OptimizationRunner:
-    """Utility to step through the stochastic search in a controlled way."""
+@dataclass
+class SequentialTest:
+    """Settings of the sequential probability ratio test used by the runner.
+
+    Candidates play color-alternated pairs from different openings. After
+    each pair, the test weighs "no better than the threshold" against "at
+    least ``delta`` better per pair". It stops when either is likely
+    enough, within the ``alpha``/``beta`` error rates, or after
+    ``max_pairs`` pairs.
+    """
+
+    delta: float = 1.0
+    alpha: float = 0.1
+    beta: float = 0.2
+    min_pairs: int = 1
+    max_pairs: int = 4
+    # Floor on the per-pair variance, so one lucky pair of results in
+    # -2..2 cannot accept a candidate on its own. Differences with a
+    # reference range over -4..4, where one pair could decide either way,
+    # so they are tested from the second pair on.
+    min_variance: float = 1.0
 
-    def __init__(self, sigma: float = 0.4):
-        self.best = random_weights()
-        self.best_score = fitness(self.best)
+
+ACCEPT = "accept"
+REJECT = "reject"
+UNDECIDED = "undecided"
+
+
+@dataclass
+class SequentialResult:
+    """Outcome of a sequential fitness test.
+
+    ``score`` is the mean pair result times two, on the same -4..4 scale
+    as :func:`fitness`.
+    """
+
+    score: float
+    games: int
+    decision: str
+    pairs: List[int]
+
+
+def sprt_decision(pairs, threshold, test, min_pairs=None):
+    """Returns ACCEPT, REJECT or UNDECIDED for the pair results so far.
+
+    ``threshold`` is on the fitness scale; pair results are half of it.
+    ``min_pairs`` overrides ``test.min_pairs``.
+    """
+    n = len(pairs)
+    if n < (test.min_pairs if min_pairs is None else min_pairs):
+        return UNDECIDED
+    mean = sum(pairs) / n
+    var = sum((p - mean) ** 2 for p in pairs) / (n - 1) if n > 1 else 0.0
+    var = max(var, test.min_variance)
+    mu0 = threshold / 2
+    mu1 = mu0 + test.delta
+    # Log-likelihood ratio of the two means under a normal approximation.
+    llr = n * (mu1 - mu0) * (2 * mean - mu0 - mu1) / (2 * var)
+    if llr >= math.log((1 - test.beta) / test.alpha):
+        return ACCEPT
+    if llr <= math.log(test.beta / (1 - test.alpha)):
+        return REJECT
+    return UNDECIDED
+
+
+def pair_games(weights, index):
+    """Returns the two ``(wA, wB, sign, opening)`` games of pair ``index``."""
+    opening = opening_moves(index)
+    return [
+        (weights, BASELINE_WEIGHTS, 1, opening),
+        (BASELINE_WEIGHTS, weights, -1, opening),
+    ]
+
+
+def play_pairs(items, board_cls=Board, executor=None, adjudication=None, solver=None):
+    """Plays pair ``index`` of ``weights`` for every ``(weights, index)`` item.
+
+    Returns the pair results (-2..2) in order; all games are spread over
+    ``executor``.
+    """
+    mapper = map if executor is None else executor.map
+    games = [g for weights, index in items for g in pair_games(weights, index)]
+    results = list(
+        mapper(
+            play_match,
+            [g[0] for g in games],
+            [g[1] for g in games],
+            repeat(board_cls),
+            repeat(None),
+            repeat(solver),
+            repeat(adjudication),
+            [g[3] for g in games],
+        )
+    )
+    return [
+        games[2 * k][2] * results[2 * k] + games[2 * k + 1][2] * results[2 * k + 1]
+        for k in range(len(items))
+    ]
+
+
+def sequential_fitness_many(
+    candidates,
+    threshold,
+    test=None,
+    board_cls=Board,
+    executor=None,
+    adjudication=None,
+    reference=None,
+    solver=None,
+):
+    """Scores candidates against the baseline, one pair at a time.
+
+    Each round plays the next pair of every undecided candidate, spread
+    over ``executor``, so clearly weak or clearly strong candidates stop
+    early. Returns one :class:`SequentialResult` per candidate.
+
+    ``reference`` holds the pair results of an incumbent on the same
+    openings; the test then applies to the per-pair difference with it.
+    """
+    test = test or SequentialTest()
+    pairs = [[] for _ in candidates]
+    decisions = [UNDECIDED] * len(candidates)
+
+    for index in range(test.max_pairs):
+        live = [i for i, d in enumerate(decisions) if d == UNDECIDED]
+        if not live:
+            break
+        results = play_pairs(
+            [(candidates[i], index) for i in live],
+            board_cls,
+            executor,
+            adjudication,
+            solver,
+        )
+        for i, result in zip(live, results):
+            pairs[i].append(result)
+            if reference is None:
+                decisions[i] = sprt_decision(pairs[i], threshold, test)
+            else:
+                tested = [p - r for p, r in zip(pairs[i], reference)]
+                decisions[i] = sprt_decision(
+                    tested, threshold, test, min_pairs=max(test.min_pairs, 2)
+                )
+
+    return [
+        SequentialResult(2 * sum(p) / len(p), 2 * len(p), d, p)
+        for p, d in zip(pairs, decisions)
+    ]
+
+
+def write_checkpoint(path, state):
+    """Writes ``state`` as JSON to ``path`` atomically.
+
+    The file is written beside the target and renamed over it, so a
+    crash leaves either the old checkpoint or the new one.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def log_candidates(path, iteration, entries, best, improved):
+    """Appends ``(weights, score, games, decision)`` entries to a JSON-lines log."""
+    with open(path, "a") as f:
+        for weights, score, games, decision in entries:
+            record = {
+                "time": time.time(),
+                "iteration": iteration,
+                "weights": weights,
+                "score": score,
+                "games": games,
+                "decision": decision,
+                "improved": improved and weights is best,
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+class OptimizationRunner:
+    """Utility to step through the stochastic search in a controlled way.
+
+    Each step perturbs the current best ``population`` times and keeps the
+    best candidate if it beats the current best. With ``workers`` > 1 the
+    games of every candidate in a step run in a process pool. An
+    ``Adjudication`` ends decided or stalled games early, and a ``solver``
+    settles endgames with few pieces left.
+
+    By default candidates are scored with ``sequential_fitness_many``,
+    pair by pair against the best's own results on the same openings, and
+    only replace the best when the test accepts the difference; pass
+    ``fixed=True`` for the fixed four-game ``fitness`` instead.
+
+    With ``checkpoint`` the runner resumes from that file when it exists
+    instead of drawing and scoring new starting weights, and
+    ``save_checkpoint`` writes it. With ``log_path`` every evaluated
+    candidate is appended to that JSON-lines file.
+    """
+
+    def __init__(
+        self,
+        sigma: float = 0.4,
+        board_cls=Board,
+        workers: int = 1,
+        population: int = 1,
+        seed=None,
+        adjudication=None,
+        sequential: Optional[SequentialTest] = None,
+        fixed: bool = False,
+        checkpoint: Optional[str] = None,
+        log_path: Optional[str] = None,
+        solver=None,
+    ):
+        self.board_cls = board_cls
+        self.adjudication = adjudication
+        self.solver = solver
+        # None when candidates are scored with the fixed fitness.
+        self.sequential = None if fixed else sequential or SequentialTest()
+        self.best_pairs = None
+        self.checkpoint = checkpoint
+        self.log_path = log_path
+        self.games = 0
+        self.population = population
+        self.rng = random.Random(seed)
+        self.executor = make_executor(workers)
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+            return
+        self.best = random_weights(self.rng)
+        self.best_score = self.score_best()
         self.sigma = sigma
         self.iteration = 0
         self.last_candidate = self.best
         self.last_score = self.best_score
+        self.log([(self.best, self.best_score, self.games, None)], improved=False)
+
+    def state(self):
+        """Everything needed to continue the run, as JSON-friendly values."""
+        version, internal, gauss = self.rng.getstate()
+        return {
+            "best": self.best,
+            "best_score": self.best_score,
+            "sigma": self.sigma,
+            "iteration": self.iteration,
+            "games": self.games,
+            "last_candidate": self.last_candidate,
+            "last_score": self.last_score,
+            "best_pairs": self.best_pairs,
+            "rng_state": [version, list(internal), gauss],
+        }
+
+    def save_checkpoint(self, path=None, state=None):
+        """Writes ``state`` (by default the current one) with :func:`write_checkpoint`."""
+        write_checkpoint(path or self.checkpoint, state or self.state())
+
+    def load_checkpoint(self, path):
+        with open(path) as f:
+            state = json.load(f)
+        self.best = state["best"]
+        self.best_score = state["best_score"]
+        self.sigma = state["sigma"]
+        self.iteration = state["iteration"]
+        self.games = state["games"]
+        self.last_candidate = state["last_candidate"]
+        self.last_score = state["last_score"]
+        self.best_pairs = state["best_pairs"]
+        version, internal, gauss = state["rng_state"]
+        self.rng.setstate((version, tuple(internal), gauss))
+
+    def log(self, entries, improved):
+        """Appends ``(weights, score, games, decision)`` entries to the log."""
+        if self.log_path is not None:
+            log_candidates(self.log_path, self.iteration, entries, self.best, improved)
+
+    def score_best(self):
+        """Scores the starting weights; with the sequential test, on every pair."""
+        if self.sequential is None:
+            self.games += 4
+            return fitness(
+                self.best, self.board_cls, self.executor, self.adjudication, self.solver
+            )
+        return self.complete_pairs(self.best, [])
+
+    def complete_pairs(self, weights, pairs):
+        """Makes ``weights`` the reference, playing the pairs missing from ``pairs``.
+
+        Returns its score over all ``max_pairs`` openings.
+        """
+        missing = range(len(pairs), self.sequential.max_pairs)
+        pairs = pairs + play_pairs(
+            [(weights, index) for index in missing],
+            self.board_cls,
+            self.executor,
+            self.adjudication,
+            self.solver,
+        )
+        self.games += 2 * len(missing)
+        self.best_pairs = pairs
+        return 2 * sum(pairs) / len(pairs)
 
     def step(self) -> OptimizationStats:
         """Performs a single optimization step and returns the updated stats."""
 
-        candidate = perturb(self.best, self.sigma)
-        score = fitness(candidate)
+        candidates = [
+            perturb(self.best, self.sigma, self.rng) for _ in range(self.population)
+        ]
+        if self.sequential is None:
+            scores = fitness_many(
+                candidates, self.board_cls, self.executor, self.adjudication, self.solver
+            )
+            games = 4 * len(candidates)
+            best_index = max(range(len(scores)), key=scores.__getitem__)
+            score = scores[best_index]
+            better = score > self.best_score
+            entries = [(w, sc, 4, None) for w, sc in zip(candidates, scores)]
+        else:
+            # Compared with the best's results on the same openings rather
+            # than with its score, which would make a lucky score a fixed bar.
+            results = sequential_fitness_many(
+                candidates,
+                0.0,
+                self.sequential,
+                self.board_cls,
+                self.executor,
+                self.adjudication,
+                reference=self.best_pairs,
+                solver=self.solver,
+            )
+            games = sum(r.games for r in results)
+            accepted = [i for i, r in enumerate(results) if r.decision == ACCEPT]
+            best_index = max(accepted or range(len(results)), key=lambda i: results[i].score)
+            score = results[best_index].score
+            better = results[best_index].decision == ACCEPT
+            entries = [(w, r.score, r.games, r.decision) for w, r in zip(candidates, results)]
+        candidate = candidates[best_index]
 
         self.iteration += 1
+        self.games += games
         self.last_candidate = candidate
         self.last_score = score
 
         improved = False
-        if score > self.best_score:
-            self.best, self.best_score = candidate, score
+        if better:
+            if self.sequential is None:
+                self.best_score = score
+            else:
+                gamesBefore = self.games
+                self.best_score = self.complete_pairs(candidate, results[best_index].pairs)
+                games += self.games - gamesBefore
+            self.best = candidate
             improved = True
 
         self.sigma = max(0.05, self.sigma * 0.999)
+        self.log(entries, improved)
 
         return OptimizationStats(
             best_weights=self.best,
@@ -116,27 +630,133 @@ class OptimizationRunner:
             last_candidate=self.last_candidate,
             last_score=self.last_score,
             improved=improved,
+            games=games,
         )
 
-
-def optimize():
-    runner = OptimizationRunner()
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def optimize(
+    workers=1,
+    population=None,
+    seed=None,
+    adjudication=None,
+    method="hill",
+    checkpoint=None,
+    log_path=None,
+    checkpoint_every=10,
+    metrics_path=None,
+    solver=None,
+):
+    """Runs until interrupted; ``method`` is "hill" (OptimizationRunner) or "cmaes".
+
+    ``population`` defaults to 1 candidate per step for the hill climber
+    and to ``4 + 3 ln n`` per generation for CMA-ES.
+
+    Both methods resume from ``checkpoint`` if it exists and save it every
+    ``checkpoint_every`` steps and on exit. Each step's stats are
+    appended to ``metrics_path`` (CSV, or JSON lines for ``.jsonl``).
+    ``solver`` is passed to every game.
+    """
+    if method == "cmaes":
+        from evolution import CMAESRunner
+
+        runner = CMAESRunner(
+            workers=workers,
+            population=population,
+            seed=seed,
+            adjudication=adjudication,
+            checkpoint=checkpoint,
+            log_path=log_path,
+            solver=solver,
+        )
+    else:
+        runner = OptimizationRunner(
+            workers=workers,
+            population=population or 1,
+            seed=seed,
+            adjudication=adjudication,
+            checkpoint=checkpoint,
+            log_path=log_path,
+            solver=solver,
+        )
 
     print("Début de la recherche ML")
+    if runner.iteration:
+        print("Reprise à l'itération", runner.iteration)
     print(runner.best, "=>", runner.best_score)
 
+    # State after the last completed step: an interrupted step has already
+    # drawn from the RNG, so saving the live state would not resume exactly.
+    completed = runner.state() if checkpoint is not None else None
+    metrics = MetricsWriter(metrics_path) if metrics_path is not None else None
+
     try:
         while True:
             stats = runner.step()
+            if metrics is not None:
+                metrics.write(stats_record(stats))
+            if checkpoint is not None:
+                completed = runner.state()
             if stats.improved:
                 print("\nNOUVEAU MEILLEUR :", stats.best_weights, "score =", stats.best_score)
+                print("Parties jouées :", runner.games)
+            if checkpoint is not None and stats.iteration % checkpoint_every == 0:
+                runner.save_checkpoint()
 
     except KeyboardInterrupt:
+        if checkpoint is not None:
+            runner.save_checkpoint(state=completed)
         print("\n=== ARRET ===")
         print("Meilleurs poids trouvés :")
         print(runner.best)
         print("Score :", runner.best_score)
+    finally:
+        runner.close()
+        if metrics is not None:
+            metrics.close()
 
 
 if __name__ == "__main__":
-    optimize()
+    import argparse
+
+    from endgame import ProofNumberSolver
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--population", type=int, default=None, help="candidates per step or generation"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--adjudicate", action="store_true", help="end decided or stalled games early"
+    )
+    parser.add_argument("--method", choices=["hill", "cmaes"], default="hill")
+    parser.add_argument("--checkpoint", help="state file to resume from and save to")
+    parser.add_argument("--checkpoint-every", type=int, default=10)
+    parser.add_argument("--log", help="JSON-lines file every evaluated candidate is appended to")
+    parser.add_argument(
+        "--metrics", help="CSV (or .jsonl) file the stats of every step are appended to"
+    )
+    parser.add_argument(
+        "--solve-pieces",
+        type=int,
+        default=0,
+        help="solve positions with at most this many pieces instead of searching",
+    )
+    args = parser.parse_args()
+    optimize(
+        workers=args.workers,
+        population=args.population,
+        seed=args.seed,
+        adjudication=Adjudication() if args.adjudicate else None,
+        method=args.method,
+        checkpoint=args.checkpoint,
+        log_path=args.log,
+        checkpoint_every=args.checkpoint_every,
+        metrics_path=args.metrics,
+        solver=ProofNumberSolver(args.solve_pieces) if args.solve_pieces else None,
+    )
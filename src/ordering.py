@@ -0,0 +1,59 @@
+"""Move ordering heuristics for the alpha-beta search.
+
+Moves are the packed codes produced by ``get_move_codes``.
+"""
+
+from moves import CAPTURE_FLAG, SQUARES_MASK
+
+TT_MOVE = 3
+CAPTURE = 2
+KILLER = 1
+QUIET = 0
+
+
+class MoveOrderer:
+    """Orders moves: table move, captures, killer moves, then history score.
+
+    Any object with the same ``order``/``record_cutoff``/``new_search``
+    methods can be given to ``CPUPlayer`` instead.
+    """
+
+    def __init__(self, killer_slots=2, max_ply=64):
+        self.killer_slots = killer_slots
+        self.killers = [[] for _ in range(max_ply)]
+        self.history = [0] * 4096
+
+    def new_search(self):
+        for slot in self.killers:
+            slot.clear()
+        # Older history still helps, but should not outweigh the new search.
+        self.history = [h >> 1 for h in self.history]
+
+    def order(self, board, moves, ply, player, tt_move=None):
+        ttKey = tt_move & SQUARES_MASK if tt_move is not None else -1
+        killers = self.killers[ply] if 0 <= ply < len(self.killers) else ()
+        history = self.history
+
+        def score(code):
+            key = code & SQUARES_MASK
+            if key == ttKey:
+                return (TT_MOVE, 0)
+            if code & CAPTURE_FLAG:
+                return (CAPTURE, 0)
+            if key in killers:
+                return (KILLER, 0)
+            return (QUIET, history[key])
+
+        # sorted() is stable, so ties keep the generation order.
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, board, move, ply, depth, player):
+        if move & CAPTURE_FLAG:
+            return
+        key = move & SQUARES_MASK
+        self.history[key] += depth * depth
+        if 0 <= ply < len(self.killers):
+            killers = self.killers[ply]
+            if key not in killers:
+                killers.insert(0, key)
+                del killers[self.killer_slots:]
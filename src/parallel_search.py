@@ -0,0 +1,154 @@
+"""Root-split parallel search for a single move decision."""
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+import time
+from typing import List, Optional
+
+from cpu import CPUPlayer
+from moves import Move
+
+
+@dataclass
+class ParallelSearchInfo:
+    """Timing summary of a root-split search.
+
+    ``cpu_ratio`` is the summed worker time over the wall-clock time, i.e.
+    how many workers were busy on average, not a speedup. ``serial_ms``
+    and ``measured_speedup`` are only filled in when a serial reference
+    search was run.
+    """
+
+    depth: int
+    workers: int
+    nodes: int
+    elapsed_ms: float
+    worker_ms: List[float] = field(default_factory=list)
+    serial_ms: Optional[float] = None
+
+    @property
+    def cpu_ms(self):
+        return sum(self.worker_ms)
+
+    @property
+    def cpu_ratio(self):
+        return self.cpu_ms / self.elapsed_ms if self.elapsed_ms else 0.0
+
+    @property
+    def measured_speedup(self):
+        if self.serial_ms is None or not self.elapsed_ms:
+            return None
+        return self.serial_ms / self.elapsed_ms
+
+    @property
+    def efficiency(self):
+        """Measured speedup per worker, or None without a serial reference."""
+        speedup = self.measured_speedup
+        if speedup is None or not self.workers:
+            return None
+        return speedup / self.workers
+
+
+def search_slice(player, weights, board, indices, depth, settings=None):
+    """Searches the root moves at ``indices`` and returns the best of them.
+
+    Runs in a worker process with a player built from ``settings`` (see
+    ``CPUPlayer.settings``); returns ``(index, score, nodes, elapsed_ms)``.
+    """
+    start = time.perf_counter()
+    cpu = CPUPlayer(player, weights, **(settings or {}))
+    if cpu.orderer is not None:
+        cpu.orderer.new_search()
+    moves = board.get_move_codes(player)
+    subset = [moves[i] for i in indices]
+    bestMove, bestScore = cpu.search_root(board, subset, depth)
+    bestIndex = indices[subset.index(bestMove)]
+    return bestIndex, bestScore, cpu.nodes, (time.perf_counter() - start) * 1000.0
+
+
+class RootSplitSearch:
+    """Spreads the root moves of a search over a pool of worker processes.
+
+    Every root move is scored exactly within its slice, and slices are
+    merged by score then by generation order, so the chosen move is the
+    one a serial ``CPUPlayer.play`` returns at the same depth. The book
+    and the solver of the player are tried first, in this process, and
+    the workers search with its other settings. ``cancel``
+    makes a ``play`` running on another thread return None without
+    waiting for its slices.
+    """
+
+    # Seconds between two checks for cancel() while the slices run.
+    CANCEL_POLL = 0.05
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def reset_cancel(self):
+        self._cancelled = False
+
+    def play(self, cpu: CPUPlayer, board, depth=2, compare_serial=False):
+        moves = board.get_move_codes(cpu.player)
+        if not moves:
+            return None
+        known, lost = cpu.knownMove(board, moves)
+        if known is not None:
+            return known
+        if lost:
+            depth = 1
+
+        cpu.nodes = 0
+        settings = cpu.settings()
+        start = time.perf_counter()
+        # Interleaved slices give each worker a mix of early and late moves.
+        slices = [
+            list(range(k, len(moves), self.workers))
+            for k in range(min(self.workers, len(moves)))
+        ]
+        futures = [
+            self.executor.submit(
+                search_slice, cpu.player, cpu.weights, board, s, depth, settings
+            )
+            for s in slices
+        ]
+        pending = futures
+        while pending:
+            if self._cancelled:
+                for f in pending:
+                    f.cancel()
+                return None
+            _, pending = wait(pending, self.CANCEL_POLL)
+        results = [f.result() for f in futures]
+        elapsed = (time.perf_counter() - start) * 1000.0
+
+        bestIndex, bestScore = min(
+            ((r[0], r[1]) for r in results), key=lambda r: (-r[1], r[0])
+        )
+        info = ParallelSearchInfo(
+            depth=depth,
+            workers=len(slices),
+            nodes=sum(r[2] for r in results),
+            elapsed_ms=elapsed,
+            worker_ms=[r[3] for r in results],
+        )
+
+        if compare_serial:
+            reference = CPUPlayer(cpu.player, cpu.weights, **settings)
+            serialStart = time.perf_counter()
+            reference.play(board, depth=depth)
+            info.serial_ms = (time.perf_counter() - serialStart) * 1000.0
+
+        bestMove = Move.from_code(moves[bestIndex])
+        cpu.nodes = info.nodes
+        cpu.last_best_move = bestMove
+        cpu.last_best_score = bestScore
+        cpu.last_search_info = info
+        return bestMove
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
@@ -0,0 +1,162 @@
+"""Perft: exhaustive move-generation counts for checking and timing a board engine.
+
+``perft(board, depth, player)`` counts the move sequences of length
+``depth`` starting with ``player``, with players alternating. It exercises
+move generation and make/undo only: game-over positions are not treated
+as terminal, so the counts depend on nothing but the rules for moving.
+
+Run ``python src/perft.py --help`` for the command-line tool.
+"""
+
+import argparse
+import time
+
+from bitboard import BitBoard
+from board import DEFAULT_START, Board
+from moves import decode_move
+
+ENGINES = {"list": Board, "bitboard": BitBoard}
+
+# name -> (grid, side to move)
+POSITIONS = {
+    "start": (DEFAULT_START, 2),
+    "opening": (
+        [
+            [0, 2, 0, 0, 2, 0, 2, 4],
+            [4, 0, 2, 0, 0, 4, 0, 0],
+            [4, 0, 0, 0, 2, 0, 0, 0],
+            [0, 0, 0, 0, 0, 4, 4, 0],
+            [4, 2, 2, 0, 0, 0, 4, 0],
+            [4, 0, 4, 2, 2, 0, 0, 0],
+            [4, 0, 0, 0, 0, 0, 0, 0],
+            [0, 2, 2, 0, 4, 0, 0, 0],
+        ],
+        2,
+    ),
+    "middlegame": (
+        [
+            [0, 0, 0, 0, 2, 2, 0, 0],
+            [0, 0, 2, 0, 2, 0, 2, 4],
+            [0, 4, 4, 0, 4, 2, 2, 4],
+            [0, 0, 0, 0, 0, 0, 4, 0],
+            [0, 4, 0, 2, 0, 0, 0, 0],
+            [0, 2, 0, 4, 4, 0, 0, 0],
+            [4, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 4, 2],
+        ],
+        2,
+    ),
+    "endgame": (
+        [
+            [4, 0, 0, 0, 0, 0, 0, 4],
+            [4, 0, 0, 2, 0, 0, 4, 4],
+            [0, 0, 0, 0, 4, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0, 2],
+            [0, 0, 0, 2, 0, 0, 0, 0],
+            [0, 2, 0, 0, 0, 0, 0, 2],
+            [4, 0, 0, 0, 4, 4, 2, 0],
+            [0, 0, 4, 0, 0, 0, 2, 0],
+        ],
+        2,
+    ),
+}
+
+# name -> leaf counts for depth 1, 2, 3, ...
+REFERENCE_COUNTS = {
+    "start": [36, 1244, 44952, 1563208],
+    "opening": [34, 1067, 35185, 1125999],
+    "middlegame": [22, 738, 17954, 590022],
+    "endgame": [28, 999, 27248, 965890],
+}
+
+
+def perft(board, depth, player):
+    if depth == 0:
+        return 1
+    codes = board.get_move_codes(player)
+    if depth == 1:
+        return len(codes)
+    opponent = 4 if player == 2 else 2
+    nodes = 0
+    for code in codes:
+        board.make_move(code)
+        nodes += perft(board, depth - 1, opponent)
+        board.undo_move()
+    return nodes
+
+
+def format_code(code):
+    fr, fc, tr, tc = decode_move(code)
+    return f"{chr(fc + ord('A'))}{fr + 1}{chr(tc + ord('A'))}{tr + 1}"
+
+
+def divide(board, depth, player):
+    """Returns the perft count below each root move, keyed by move name."""
+    opponent = 4 if player == 2 else 2
+    counts = {}
+    for code in board.get_move_codes(player):
+        board.make_move(code)
+        counts[format_code(code)] = perft(board, depth - 1, opponent)
+        board.undo_move()
+    return counts
+
+
+def timed_perft(board_cls, name, depth):
+    """Returns ``(nodes, seconds)`` for a stored position."""
+    grid, player = POSITIONS[name]
+    board = board_cls(grid)
+    start = time.perf_counter()
+    nodes = perft(board, depth, player)
+    return nodes, time.perf_counter() - start
+
+
+def check(board_cls, max_depth=None):
+    """Compares an engine against REFERENCE_COUNTS; returns the mismatches."""
+    failures = []
+    for name, expected in REFERENCE_COUNTS.items():
+        grid, player = POSITIONS[name]
+        board = board_cls(grid)
+        for depth, count in enumerate(expected, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            got = perft(board, depth, player)
+            if got != count:
+                failures.append((name, depth, count, got))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitboard")
+    parser.add_argument("--position", choices=sorted(POSITIONS), default="start")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="break counts down by root move")
+    parser.add_argument("--check", action="store_true", help="verify the reference counts")
+    args = parser.parse_args(argv)
+
+    board_cls = ENGINES[args.engine]
+
+    if args.check:
+        failures = check(board_cls, args.depth)
+        for name, depth, expected, got in failures:
+            print(f"{name} depth {depth}: expected {expected}, got {got}")
+        print("OK" if not failures else f"{len(failures)} mismatch(es)")
+        return 1 if failures else 0
+
+    if args.divide:
+        grid, player = POSITIONS[args.position]
+        counts = divide(board_cls(grid), args.depth, player)
+        for move, count in counts.items():
+            print(f"{move}: {count}")
+        print(f"Total: {sum(counts.values())}")
+        return 0
+
+    for depth in range(1, args.depth + 1):
+        nodes, seconds = timed_perft(board_cls, args.position, depth)
+        rate = nodes / seconds if seconds else float("inf")
+        print(f"depth {depth}: {nodes} nodes in {seconds:.3f}s ({rate:.0f} nodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
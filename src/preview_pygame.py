@@ -1,10 +1,29 @@
+from collections import deque
 import itertools
+import os
+import queue
+import threading
 
-import matplotlib.pyplot as plt
 import pygame
 from board import Board
 from cpu import CPUPlayer
+from opening_book import OpeningBook
 from optimization import perturb
+from parallel_search import RootSplitSearch
+from progress import PlotProcess, ProgressPlot
+from render import BoardView, FrameTimer, SidebarView, TextCache
+from search_stats import PHASES, SearchStats
+from search_worker import SearchWorker
+from tournament import (
+    DEFAULT_WEIGHTS,
+    PERTURBATION_SIGMA,
+    Tournament,
+    champion_color as duel_champion_color,
+    champion_keeps_title,
+    cpu_name,
+    load_duels,
+    score_game,
+)
 
 # Constants
 GRID_SIZE = 100
@@ -14,32 +33,52 @@ SCREEN_WIDTH = BOARD_PIXELS + SIDEBAR_WIDTH
 SCREEN_HEIGHT = BOARD_PIXELS
 FPS = 30
 MOVE_INTERVAL_MS = 250
+SEARCH_TIME_MS = 200  # Per-move search budget; runs off the render thread
+# Set above 1 to split the root moves over worker processes at a fixed depth.
+SEARCH_WORKERS = 1
+PARALLEL_SEARCH_DEPTH = 3
+# Seconds the live view waits for the duel in progress when it closes.
+STOP_TIMEOUT = 2.0
+# Opening book built with opening_book.py; used when the file exists.
+OPENING_BOOK_PATH = "opening_book.bin"
+# Time the search phases of each CPU and show them in the sidebar.
+SHOW_SEARCH_STATS = True
+# Show the drawing time against the frame time at the bottom of the sidebar.
+SHOW_FRAME_TIME = True
 RESTART_DELAY_MS = 800
-PERTURBATION_SIGMA = 0.35
+# Champion score plot: redrawn at most every PLOT_INTERVAL_S, with only the
+# last PLOT_ANNOTATIONS champion names; optionally drawn by another process.
+PLOT_INTERVAL_S = 1.0
+PLOT_ANNOTATIONS = 10
+PLOT_OUT_OF_PROCESS = False
 
 # Colors
 WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
 SIDEBAR_BG = (30, 30, 30)
 PLAYER2_COLOR = (0, 0, 255)  # Bleu (joueur 2)
 PLAYER4_COLOR = (255, 0, 0)  # Rouge (joueur 4)
 GOLD = (212, 175, 55)
 
 
-def draw_board(screen, board):
-    for y in range(8):
-        for x in range(8):
-            rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            if (x + y) % 2 == 0:
-                pygame.draw.rect(screen, WHITE, rect)
-            else:
-                pygame.draw.rect(screen, BLACK, rect)
+def new_views(font):
+    """Returns the cached board and sidebar views for a new window."""
+    board_view = BoardView(GRID_SIZE, piece_colors={2: PLAYER2_COLOR, 4: PLAYER4_COLOR})
+    sidebar_rect = pygame.Rect(BOARD_PIXELS, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT)
+    sidebar_view = SidebarView(sidebar_rect, TextCache(font), SIDEBAR_BG)
+    return board_view, sidebar_view
+
+
+def draw_frame(screen, views, board, lines):
+    """Redraws what changed and updates only those parts of the window."""
+    board_view, sidebar_view = views
+    rects = board_view.draw(screen, board.board) + sidebar_view.draw(screen, lines)
+    if rects:
+        pygame.display.update(rects)
+
 
-            piece = board.board[y][x]
-            if piece == 2:
-                pygame.draw.circle(screen, PLAYER2_COLOR, rect.center, GRID_SIZE // 3)
-            elif piece == 4:
-                pygame.draw.circle(screen, PLAYER4_COLOR, rect.center, GRID_SIZE // 3)
+def invalidate(views):
+    for view in views:
+        view.invalidate()
 
 
 def format_move(move):
@@ -48,37 +87,37 @@ def format_move(move):
     return f"{chr(move.fc + ord('A'))}{move.fr + 1} -> {chr(move.tc + ord('A'))}{move.tr + 1}"
 
 
-def draw_sidebar(
-    screen,
+def sidebar_lines(
+    line_height,
     board,
     player2,
     player4,
     current_player,
     champion_color,
     game_over,
-    font,
     match_index,
     champion_score,
     challenger_score,
     champion_name,
     challenger_name,
+    thinking_cpu=None,
+    frame_timer=None,
 ):
-    sidebar_rect = pygame.Rect(BOARD_PIXELS, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT)
-    pygame.draw.rect(screen, SIDEBAR_BG, sidebar_rect)
+    """Returns the sidebar as ``(text, color, y)`` lines for ``SidebarView``."""
+    lines = []
 
-    def blit_line(text, y_offset, color=WHITE):
-        surf = font.render(text, True, color)
-        screen.blit(surf, (BOARD_PIXELS + 12, y_offset))
-        return y_offset + surf.get_height() + 6
+    def add_line(text, y_offset, color=WHITE):
+        lines.append((text, color, y_offset))
+        return y_offset + line_height + 6
 
     y = 16
-    y = blit_line(f"Match: {match_index}", y)
+    y = add_line(f"Match: {match_index}", y)
     champion_label = "bleu" if champion_color == 2 else "rouge"
     challenger_label = "rouge" if champion_color == 2 else "bleu"
-    y = blit_line(
+    y = add_line(
         f"Champion ({champion_name}) {champion_label}: {champion_score:.1f}", y
     )
-    y = blit_line(
+    y = add_line(
         f"Challenger ({challenger_name}) {challenger_label}: {challenger_score:.1f}",
         y,
     )
@@ -92,33 +131,63 @@ def draw_sidebar(
             winner_text = "Gagnant: Joueur Rouge"
         else:
             winner_text = "Match nul"
-        y = blit_line(status, y)
-        y = blit_line(winner_text, y)
+        y = add_line(status, y)
+        y = add_line(winner_text, y)
     else:
         player_label = "Joueur Bleu" if current_player == 2 else "Joueur Rouge"
-        y = blit_line(f"Tour: {player_label}", y)
+        y = add_line(f"Tour: {player_label}", y)
+        if thinking_cpu is not None:
+            # Read while the worker thread is still searching.
+            y = add_line(f"Réflexion... {thinking_cpu.nodes} noeuds", y, GOLD)
 
     def render_cpu_info(cpu, y_offset, highlight=False):
         label = "Bleu" if cpu.player == 2 else "Rouge"
         color = GOLD if highlight else WHITE
 
-        y_cursor = blit_line(f"Heuristiques Joueur {label}:", y_offset + 10, color)
+        y_cursor = add_line(f"Heuristiques Joueur {label}:", y_offset + 10, color)
         for key in ["grouping", "connection", "enemy_sep", "mobility"]:
             val = cpu.weights.get(key, 0)
-            y_cursor = blit_line(f"- {key}: {val:.2f}", y_cursor, color)
+            y_cursor = add_line(f"- {key}: {val:.2f}", y_cursor, color)
 
         move_text = format_move(cpu.last_best_move)
         score_text = (
             f"{cpu.last_best_score:.2f}" if cpu.last_best_score is not None else "N/A"
         )
-        y_cursor = blit_line(f"Meilleur coup: {move_text}", y_cursor, color)
-        y_cursor = blit_line(f"Score: {score_text}", y_cursor, color)
+        y_cursor = add_line(f"Meilleur coup: {move_text}", y_cursor, color)
+        y_cursor = add_line(f"Score: {score_text}", y_cursor, color)
+        info = cpu.last_search_info
+        if getattr(info, "from_book", False):
+            y_cursor = add_line("Profondeur: livre d'ouvertures", y_cursor, color)
+        elif info is not None:
+            y_cursor = add_line(
+                f"Profondeur: {info.depth} ({info.nodes} noeuds)", y_cursor, color
+            )
+        stats = cpu.stats
+        if stats is not None and stats.searches:
+            y_cursor = add_line(
+                f"Branchement: {stats.branching_factor:.1f}", y_cursor, color
+            )
+            y_cursor = add_line(
+                "Gen/Eval/Fin: "
+                + "/".join(f"{stats.phase_share(p):.0%}" for p in PHASES),
+                y_cursor,
+                color,
+            )
         return y_cursor
 
     champion_highlight = player2.player == champion_color
     y = render_cpu_info(player2, y, highlight=champion_highlight)
     render_cpu_info(player4, y, highlight=not champion_highlight)
 
+    if frame_timer is not None:
+        render_ms, frame_ms = frame_timer.shown
+        add_line(
+            f"Rendu: {render_ms:.1f} ms / image {frame_ms} ms",
+            SCREEN_HEIGHT - line_height - 12,
+            GOLD,
+        )
+    return lines
+
 
 def main():
     pygame.init()
@@ -126,41 +195,47 @@ def main():
     pygame.display.set_caption("Board Game Preview")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("arial", 18)
+    views = new_views(font)
+    timer = FrameTimer()
+
+    plot_cls = PlotProcess if PLOT_OUT_OF_PROCESS else ProgressPlot
+    plot = plot_cls(
+        "Performance du meilleur CPU",
+        "Duel",
+        "Score du champion",
+        interval=PLOT_INTERVAL_S,
+        annotations=PLOT_ANNOTATIONS,
+        window_title="Evolution du meilleur CPU",
+    )
 
-    plt.ion()
-    fig, ax = plt.subplots()
-    ax.set_xlabel("Duel")
-    ax.set_ylabel("Score du champion")
-    ax.set_title("Performance du meilleur CPU")
-    fig.canvas.manager.set_window_title("Evolution du meilleur CPU")
-
-    best_weights = {
-        "grouping": 1.0,
-        "connection": 1.0,
-        "enemy_sep": 1.0,
-        "mobility": 1.0,
-    }
+    best_weights = dict(DEFAULT_WEIGHTS)
 
-    def next_cpu_name(counter):
-        return f"CPU{counter:03d}"
+    parallel_search = RootSplitSearch(SEARCH_WORKERS) if SEARCH_WORKERS > 1 else None
 
     cpu_counter = itertools.count(1)
-    champion_name = next_cpu_name(next(cpu_counter))
-    challenger_name = next_cpu_name(next(cpu_counter))
+    champion_name = cpu_name(next(cpu_counter))
+    challenger_name = cpu_name(next(cpu_counter))
+
+    book = OpeningBook(OPENING_BOOK_PATH) if os.path.exists(OPENING_BOOK_PATH) else None
+
+    def new_cpu(player, weights):
+        stats = SearchStats() if SHOW_SEARCH_STATS else None
+        # Only the weights the book was built for play from it.
+        ownBook = book if book is not None and book.matches(weights) else None
+        return CPUPlayer(player, weights, stats=stats, book=ownBook)
 
     def new_match(champion_weights, challenger_weights, champion_color):
         board = Board()  # Initialize the game board
         if champion_color == 2:
-            player2 = CPUPlayer(2, champion_weights)
-            player4 = CPUPlayer(4, challenger_weights)
+            player2 = new_cpu(2, champion_weights)
+            player4 = new_cpu(4, challenger_weights)
         else:
-            player2 = CPUPlayer(2, challenger_weights)
-            player4 = CPUPlayer(4, champion_weights)
+            player2 = new_cpu(2, challenger_weights)
+            player4 = new_cpu(4, champion_weights)
         return board, player2, player4
 
     challenger_weights = perturb(best_weights, PERTURBATION_SIGMA)
     champion_color = 2
-    challenger_color = 4
     board, player2, player4 = new_match(
         best_weights, challenger_weights, champion_color
     )
@@ -174,13 +249,17 @@ def main():
 
     current_player = 2
     last_move_time = 0
+    worker = SearchWorker()
+    search_job = None
     running = True
     game_over = False
     restart_at = None
 
     while running:
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                invalidate(views)
+            elif event.type == pygame.QUIT:
                 # Exit the loop immediately to avoid drawing on a closing window,
                 # which could cause the application to freeze or crash.
                 running = False
@@ -194,8 +273,7 @@ def main():
             if restart_at is None:
                 restart_at = now + RESTART_DELAY_MS
             elif now >= restart_at:
-                champion_color = 2 if duel_games_played % 2 == 0 else 4
-                challenger_color = 4 if champion_color == 2 else 2
+                champion_color = duel_champion_color(duel_games_played)
                 board, player2, player4 = new_match(
                     best_weights, challenger_weights, champion_color
                 )
@@ -205,88 +283,252 @@ def main():
                 restart_at = None
                 last_move_time = now
             # Skip move generation while waiting to restart
-        elif now - last_move_time >= MOVE_INTERVAL_MS:
+        elif search_job is None and now - last_move_time >= MOVE_INTERVAL_MS:
             current_cpu = player2 if current_player == 2 else player4
-            move = current_cpu.play(board, depth=2)
-
-            if move is None:
-                game_over = True
+            # The worker searches a copy, so the board can be drawn meanwhile.
+            search_board = Board(board.board)
+            if parallel_search is not None:
+                search_job = worker.submit(
+                    parallel_search.play,
+                    current_cpu,
+                    search_board,
+                    PARALLEL_SEARCH_DEPTH,
+                    cancel=parallel_search.cancel,
+                    reset=parallel_search.reset_cancel,
+                )
             else:
-                board.make_move(move)
-                current_player = 4 if current_player == 2 else 2
-                if board.is_game_over():
+                search_job = worker.submit(
+                    current_cpu.play,
+                    search_board,
+                    time_ms=SEARCH_TIME_MS,
+                    cancel=current_cpu.cancel,
+                    reset=current_cpu.reset_cancel,
+                )
+        elif search_job is not None:
+            finished = worker.poll()
+            if finished is not None:
+                search_job = None
+                if finished.error is not None:
+                    raise finished.error
+                move = finished.result
+
+                if move is None:
                     game_over = True
+                else:
+                    board.make_move(move)
+                    current_player = 4 if current_player == 2 else 2
+                    if board.is_game_over():
+                        game_over = True
+
+                if game_over:
+                    dChampion, dChallenger = score_game(board.get_winner(), champion_color)
+                    champion_duel_score += dChampion
+                    challenger_duel_score += dChallenger
+
+                    duel_games_played += 1
+
+                    if duel_games_played >= 2:
+                        champion_score = champion_duel_score
+                        challenger_score = challenger_duel_score
+
+                        if champion_keeps_title(champion_score, challenger_score):
+                            champion_history.append((match_index, champion_score, champion_name))
+                        else:
+                            best_weights = challenger_weights
+                            champion_name = challenger_name
+                            champion_history.append((match_index, challenger_score, champion_name))
+                            challenger_name = cpu_name(next(cpu_counter))
+                        plot.add(*champion_history[-1])
+
+                        challenger_weights = perturb(best_weights, PERTURBATION_SIGMA)
+                        champion_duel_score = 0.0
+                        challenger_duel_score = 0.0
+                        duel_games_played = 0
+                        champion_color = 2
+
+                    restart_at = now + RESTART_DELAY_MS
 
-            if game_over:
-                winner = board.get_winner()
-
-                if winner == champion_color:
-                    champion_duel_score += 1.5
-                    challenger_duel_score -= 1
-                elif winner == challenger_color:
-                    challenger_duel_score += 1
-                    champion_duel_score -= 1
-
-                duel_games_played += 1
-
-                if duel_games_played >= 2:
-                    champion_score = champion_duel_score
-                    challenger_score = challenger_duel_score
-                    champion_keeps_title = champion_score >= challenger_score
-
-                    if champion_keeps_title:
-                        champion_history.append((match_index, champion_score, champion_name))
-                    else:
-                        best_weights = challenger_weights
-                        champion_name = challenger_name
-                        champion_history.append((match_index, challenger_score, champion_name))
-                        challenger_name = next_cpu_name(next(cpu_counter))
-
-                    challenger_weights = perturb(best_weights, PERTURBATION_SIGMA)
-                    champion_duel_score = 0.0
-                    challenger_duel_score = 0.0
-                    duel_games_played = 0
-                    champion_color = 2
-                    challenger_color = 4
-
-                    ax.clear()
-                    ax.set_xlabel("Duel")
-                    ax.set_ylabel("Score du champion")
-                    ax.set_title(f"Performance du meilleur CPU ({champion_name})")
-                    if champion_history:
-                        xs = [d[0] for d in champion_history]
-                        ys = [d[1] for d in champion_history]
-                        ax.plot(xs, ys, marker="o")
-                        for x, y, name in champion_history:
-                            ax.annotate(name, (x, y))
-                    fig.canvas.draw()
-                    fig.canvas.flush_events()
-
-                restart_at = now + RESTART_DELAY_MS
-
-            last_move_time = now
+                last_move_time = now
 
-        screen.fill(BLACK)
-        draw_board(screen, board)
-        draw_sidebar(
-            screen,
+        timer.start_render()
+        lines = sidebar_lines(
+            font.get_height(),
             board,
             player2,
             player4,
             current_player,
             champion_color,
             game_over,
-            font,
             match_index,
             champion_duel_score,
             challenger_duel_score,
             champion_name,
             challenger_name,
+            thinking_cpu=current_cpu if search_job is not None else None,
+            frame_timer=timer if SHOW_FRAME_TIME else None,
+        )
+        draw_frame(screen, views, board, lines)
+        timer.end_render()
+        plot.refresh()
+        clock.tick(FPS)
+
+    # Stop a search still running when the window closes.
+    worker.close()
+    plot.close()
+    if parallel_search is not None:
+        parallel_search.close()
+    if book is not None:
+        book.close()
+    pygame.quit()
+
+
+def watch(duels, caption="Tournoi"):
+    """Replays the games of the DuelResults put on the ``duels`` queue.
+
+    The viewer only animates recorded move codes, so it can follow a
+    headless ``tournament.Tournament`` (see ``live``) or a results log.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(caption)
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("arial", 18)
+    views = new_views(font)
+    timer = FrameTimer()
+
+    pending = deque()
+    board = Board()
+    player2 = CPUPlayer(2, DEFAULT_WEIGHTS)
+    player4 = CPUPlayer(4, DEFAULT_WEIGHTS)
+    duel = game = None
+    ply = 0
+    champion_score = challenger_score = 0.0
+    game_over = True
+    restart_at = 0
+    last_move_time = 0
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                invalidate(views)
+            elif event.type == pygame.QUIT:
+                running = False
+                break
+        if not running:
+            break
+
+        while True:
+            try:
+                result = duels.get_nowait()
+            except queue.Empty:
+                break
+            pending.extend((result, i, g) for i, g in enumerate(result.games))
+
+        now = pygame.time.get_ticks()
+        if game_over:
+            if pending and now >= restart_at:
+                duel, index, game = pending.popleft()
+                if index == 0:
+                    champion_score = challenger_score = 0.0
+                champion, challenger = duel.champion_weights, duel.challenger_weights
+                if game.champion_color == 2:
+                    player2, player4 = CPUPlayer(2, champion), CPUPlayer(4, challenger)
+                else:
+                    player2, player4 = CPUPlayer(2, challenger), CPUPlayer(4, champion)
+                board = Board()
+                ply = 0
+                game_over = False
+                last_move_time = now
+        elif now - last_move_time >= MOVE_INTERVAL_MS:
+            if ply < len(game.moves):
+                board.make_move(game.moves[ply])
+                ply += 1
+                last_move_time = now
+            else:
+                dChampion, dChallenger = score_game(game.winner, game.champion_color)
+                champion_score += dChampion
+                challenger_score += dChallenger
+                game_over = True
+                restart_at = now + RESTART_DELAY_MS
+
+        timer.start_render()
+        lines = sidebar_lines(
+            font.get_height(),
+            board,
+            player2,
+            player4,
+            2 if ply % 2 == 0 else 4,
+            game.champion_color if game is not None else 2,
+            game_over,
+            duel.index if duel is not None else 0,
+            champion_score,
+            challenger_score,
+            duel.champion if duel is not None else "-",
+            duel.challenger if duel is not None else "-",
+            frame_timer=timer if SHOW_FRAME_TIME else None,
         )
-        pygame.display.flip()
+        draw_frame(screen, views, board, lines)
+        timer.end_render()
         clock.tick(FPS)
 
     pygame.quit()
 
+
+def replay(path, duel=None):
+    """Replays the duels of a ``tournament.py --log`` file, or only duel ``duel``."""
+    duels = queue.Queue()
+    for result in load_duels(path):
+        if duel is None or result.index == duel:
+            duels.put(result)
+    watch(duels, f"Rejeu: {os.path.basename(path)}")
+
+
+def live(workers=1, seed=None):
+    """Runs a headless tournament on a thread and replays each finished duel.
+
+    Duels are played much faster than they are shown, so the viewer falls
+    behind; the tournament stops with the window. A duel still being
+    played is abandoned after ``STOP_TIMEOUT`` seconds with its daemon
+    thread.
+    """
+    duels = queue.Queue()
+    stop = threading.Event()
+    tournament = Tournament(workers=workers, seed=seed)
+    tournament.subscribe(duels.put)
+
+    def run():
+        for _ in tournament.run():
+            if stop.is_set():
+                break
+
+    thread = threading.Thread(target=run, name="tournament", daemon=True)
+    thread.start()
+    try:
+        watch(duels, "Tournoi en direct")
+    finally:
+        stop.set()
+        thread.join(STOP_TIMEOUT)
+        if not thread.is_alive():
+            tournament.close()
+
+
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aperçu des duels champion/challenger")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--replay", help="results log written by tournament.py --log")
+    mode.add_argument(
+        "--live", action="store_true", help="watch a headless tournament as it runs"
+    )
+    parser.add_argument("--duel", type=int, default=None, help="only replay this duel")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.replay:
+        replay(args.replay, args.duel)
+    elif args.live:
+        live(args.workers, args.seed)
+    else:
+        main()
@@ -0,0 +1,170 @@
+"""Progress reporting: a throttled live plot and a metrics file writer.
+
+``ProgressPlot`` keeps one line and updates its data in place, redrawing
+at most once per ``interval`` seconds; ``PlotProcess`` runs it in a
+separate process so drawing never stalls the caller. ``MetricsWriter``
+streams the same kind of points to a CSV or JSON-lines file for headless
+runs.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+
+class ProgressPlot:
+    """Score against step, with labels on the points where they change.
+
+    Only the last ``annotations`` label changes stay annotated. matplotlib
+    is imported here so headless code can use this module without it.
+    """
+
+    def __init__(
+        self, title, xlabel, ylabel, interval=1.0, annotations=10, window_title=None
+    ):
+        import matplotlib.pyplot as plt
+
+        self.plt = plt
+        plt.ion()
+        self.fig, self.ax = plt.subplots()
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.title = title
+        self.ax.set_title(title)
+        if window_title is not None:
+            self.fig.canvas.manager.set_window_title(window_title)
+        (self.line,) = self.ax.plot([], [], marker="o")
+        self.interval = interval
+        self.annotations = annotations
+        self.labels = []
+        self.xs = []
+        self.ys = []
+        self.lastLabel = None
+        self.dirty = False
+        self.lastDraw = 0.0
+        self.draws = 0
+
+    def add(self, x, y, label=None):
+        self.xs.append(x)
+        self.ys.append(y)
+        if label is not None and label != self.lastLabel:
+            self.lastLabel = label
+            self.labels.append(self.ax.annotate(label, (x, y)))
+            if len(self.labels) > self.annotations:
+                self.labels.pop(0).remove()
+        self.dirty = True
+
+    def refresh(self, force=False):
+        """Redraws if points were added and ``interval`` has passed; cheap otherwise."""
+        now = time.perf_counter()
+        if not self.dirty or not force and now - self.lastDraw < self.interval:
+            return False
+        self.line.set_data(self.xs, self.ys)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        if self.lastLabel is not None:
+            self.ax.set_title(f"{self.title} ({self.lastLabel})")
+        self.fig.canvas.draw_idle()
+        self.fig.canvas.flush_events()
+        self.dirty = False
+        self.lastDraw = now
+        self.draws += 1
+        return True
+
+    def close(self):
+        self.plt.close(self.fig)
+
+
+def plot_loop(points, kwargs):
+    plot = ProgressPlot(**kwargs)
+    while True:
+        try:
+            item = points.get(timeout=0.1)
+        except queue.Empty:
+            item = ()
+        while item is not None:
+            if item:
+                plot.add(*item)
+            try:
+                item = points.get_nowait()
+            except queue.Empty:
+                break
+        if item is None:
+            break
+        plot.refresh()
+        plot.fig.canvas.flush_events()
+    plot.close()
+
+
+class PlotProcess:
+    """Same interface as ProgressPlot, drawn by a separate process.
+
+    Points are sent through a queue. The process is spawned rather than
+    forked, so it does not inherit the caller's pygame or GUI state.
+    """
+
+    def __init__(self, *args, **kwargs):
+        names = ("title", "xlabel", "ylabel", "interval", "annotations", "window_title")
+        kwargs.update(zip(names, args))
+        context = multiprocessing.get_context("spawn")
+        self.points = context.Queue()
+        self.process = context.Process(
+            target=plot_loop, args=(self.points, kwargs), name="progress-plot", daemon=True
+        )
+        self.process.start()
+
+    def add(self, x, y, label=None):
+        self.points.put((x, y, label))
+
+    def refresh(self, force=False):
+        return False
+
+    def close(self, timeout=2.0):
+        self.points.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class MetricsWriter:
+    """Appends flat dict records to a CSV file, or JSON lines for ``.jsonl``.
+
+    The CSV columns are those of the first record, or the header of a
+    file that already has content; a record with other keys raises
+    ValueError instead of shifting the columns.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jsonLines = os.path.splitext(path)[1].lower() == ".jsonl"
+        self.fieldnames = None
+        if not self.jsonLines and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline="") as f:
+                self.fieldnames = next(csv.reader(f), None)
+        self.file = open(path, "a", newline="")
+        self.writer = None
+
+    def write(self, record):
+        if self.jsonLines:
+            self.file.write(json.dumps(record) + "\n")
+        else:
+            if self.writer is None:
+                hasHeader = self.fieldnames is not None
+                if not hasHeader:
+                    self.fieldnames = list(record)
+                self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+                if not hasHeader:
+                    self.writer.writeheader()
+            if set(record) != set(self.fieldnames):
+                raise ValueError(
+                    f"Colonnes différentes de celles de {self.path}: "
+                    f"{sorted(set(record) ^ set(self.fieldnames))}"
+                )
+            self.writer.writerow(record)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
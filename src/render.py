@@ -0,0 +1,170 @@
+"""Cached drawing for the pygame preview.
+
+The board and the sidebar remember what they last drew and only redraw
+what changed; both return the rectangles to pass to
+``pygame.display.update`` instead of flipping the whole window.
+"""
+
+import time
+
+import pygame
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+PIECE_COLORS = {2: (0, 0, 255), 4: (255, 0, 0)}
+
+
+class TextCache:
+    """``font.render`` results keyed by text and color, cleared when full."""
+
+    def __init__(self, font, size=512):
+        self.font = font
+        self.size = size
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color):
+        key = (text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        if len(self.surfaces) >= self.size:
+            self.surfaces.clear()
+        surf = self.font.render(text, True, color)
+        self.surfaces[key] = surf
+        return surf
+
+
+class BoardView:
+    """Blits a pre-rendered checkerboard and piece sprites.
+
+    After the first frame only the squares whose piece changed since the
+    last ``draw`` are redrawn.
+    """
+
+    def __init__(self, grid_size, origin=(0, 0), piece_colors=PIECE_COLORS):
+        self.grid_size = grid_size
+        self.origin = origin
+        self.background = pygame.Surface((grid_size * 8, grid_size * 8))
+        for y in range(8):
+            for x in range(8):
+                color = WHITE if (x + y) % 2 == 0 else BLACK
+                self.background.fill(color, self.square(x, y, (0, 0)))
+        self.sprites = {}
+        for piece, color in piece_colors.items():
+            sprite = pygame.Surface((grid_size, grid_size), pygame.SRCALPHA)
+            center = (grid_size // 2, grid_size // 2)
+            pygame.draw.circle(sprite, color, center, grid_size // 3)
+            self.sprites[piece] = sprite
+        self.shown = None
+
+    def square(self, x, y, origin=None):
+        ox, oy = self.origin if origin is None else origin
+        g = self.grid_size
+        return pygame.Rect(ox + x * g, oy + y * g, g, g)
+
+    def invalidate(self):
+        self.shown = None
+
+    def draw(self, screen, grid):
+        """Draws ``grid`` (8 rows of 8 pieces) and returns the dirty rects."""
+        if self.shown is None:
+            screen.blit(self.background, self.origin)
+            changed = [(x, y) for y in range(8) for x in range(8) if grid[y][x]]
+            rects = [self.background.get_rect(topleft=self.origin)]
+        else:
+            changed = [
+                (x, y)
+                for y in range(8)
+                for x in range(8)
+                if grid[y][x] != self.shown[y][x]
+            ]
+            rects = [self.square(x, y) for x, y in changed]
+        for x, y in changed:
+            rect = self.square(x, y)
+            screen.blit(self.background, rect, self.square(x, y, (0, 0)))
+            sprite = self.sprites.get(grid[y][x])
+            if sprite is not None:
+                screen.blit(sprite, rect)
+        self.shown = [list(row) for row in grid]
+        return rects
+
+
+class SidebarView:
+    """Draws ``(text, color, y)`` lines, redrawing only those that changed."""
+
+    def __init__(self, rect, text_cache, background, margin=12):
+        self.rect = pygame.Rect(rect)
+        self.text = text_cache
+        self.background = background
+        self.margin = margin
+        self.line_height = text_cache.font.get_height()
+        self.shown = None
+
+    def invalidate(self):
+        self.shown = None
+
+    def lineRect(self, y):
+        return pygame.Rect(self.rect.x, self.rect.y + y, self.rect.width, self.line_height)
+
+    def draw(self, screen, lines):
+        """Draws ``lines`` and returns the dirty rects."""
+        if self.shown is None:
+            screen.fill(self.background, self.rect)
+            rects = [self.rect]
+            changed = list(lines)
+        else:
+            previous = set(self.shown)
+            current = set(lines)
+            changed = [line for line in lines if line not in previous]
+            rects = [self.lineRect(y) for _, _, y in previous - current]
+            for rect in rects:
+                screen.fill(self.background, rect)
+            rects += [self.lineRect(y) for _, _, y in changed]
+        for text, color, y in changed:
+            rect = self.lineRect(y)
+            screen.fill(self.background, rect)
+            screen.blit(self.text.render(text, color), (rect.x + self.margin, rect.y))
+        self.shown = list(lines)
+        return rects
+
+
+class FrameTimer:
+    """Moving averages of the drawing time and of the whole frame, in ms.
+
+    ``shown`` holds ``(render_ms, frame_ms)`` rounded for display and only
+    refreshed every ``display_interval`` seconds, so an overlay built from
+    it keeps hitting the ``TextCache`` between refreshes.
+    """
+
+    def __init__(self, smoothing=0.1, display_interval=0.5):
+        self.smoothing = smoothing
+        self.display_interval = display_interval
+        self.render_ms = 0.0
+        self.frame_ms = 0.0
+        self.shown = (0.0, 0)
+        self.renderStart = None
+        self.lastFrame = None
+        self.lastShown = None
+
+    def start_render(self):
+        self.renderStart = time.perf_counter()
+
+    def end_render(self):
+        now = time.perf_counter()
+        a = self.smoothing
+        if self.renderStart is not None:
+            self.render_ms += a * ((now - self.renderStart) * 1000.0 - self.render_ms)
+        if self.lastFrame is not None:
+            self.frame_ms += a * ((now - self.lastFrame) * 1000.0 - self.frame_ms)
+        self.lastFrame = now
+        if self.lastShown is None or now - self.lastShown >= self.display_interval:
+            self.shown = (round(self.render_ms, 1), round(self.frame_ms))
+            self.lastShown = now
+
+    @property
+    def render_share(self):
+        return self.render_ms / self.frame_ms if self.frame_ms else 0.0
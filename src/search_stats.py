@@ -0,0 +1,121 @@
+"""Opt-in search instrumentation for ``CPUPlayer``.
+
+Pass a :class:`SearchStats` as ``CPUPlayer(..., stats=SearchStats())``.
+Without one the search runs exactly as before; with one, every board the
+search sees is wrapped in a :class:`TimedBoard` that times the three
+phases that dominate a search: move generation, evaluation and game-over
+checks.
+"""
+
+from dataclasses import dataclass, field
+import json
+import time
+from typing import List
+
+PHASES = ("move_generation", "evaluation", "game_over")
+
+
+@dataclass
+class SearchStats:
+    """Counters accumulated over every ``play`` call until :meth:`reset`.
+
+    ``cutoffs[ply]`` counts beta cutoffs at each distance from the root.
+    Times are in seconds.
+    """
+
+    searches: int = 0
+    nodes: int = 0
+    leaves: int = 0
+    expanded: int = 0
+    moves_generated: int = 0
+    cutoffs: List[int] = field(default_factory=list)
+    search_time: float = 0.0
+    move_generation_time: float = 0.0
+    evaluation_time: float = 0.0
+    game_over_time: float = 0.0
+
+    def reset(self):
+        self.__init__()
+
+    def record_cutoff(self, ply):
+        cutoffs = self.cutoffs
+        if ply >= len(cutoffs):
+            cutoffs.extend([0] * (ply + 1 - len(cutoffs)))
+        cutoffs[ply] += 1
+
+    @property
+    def branching_factor(self):
+        """Average number of moves generated per expanded node."""
+        return self.moves_generated / self.expanded if self.expanded else 0.0
+
+    def phase_share(self, phase):
+        """Share of the search time spent in one of ``PHASES``."""
+        if not self.search_time:
+            return 0.0
+        return getattr(self, phase + "_time") / self.search_time
+
+    def instrument(self, board):
+        return TimedBoard(board, self)
+
+    def to_dict(self):
+        return {
+            "searches": self.searches,
+            "nodes": self.nodes,
+            "leaves": self.leaves,
+            "expanded": self.expanded,
+            "branching_factor": self.branching_factor,
+            "cutoffs_per_ply": list(self.cutoffs),
+            "search_ms": self.search_time * 1000.0,
+            "phase_ms": {p: getattr(self, p + "_time") * 1000.0 for p in PHASES},
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class TimedBoard:
+    """Board proxy that times the costly calls and forwards the rest.
+
+    Move application is bound directly to the wrapped board so it costs
+    no more than an attribute lookup.
+    """
+
+    def __init__(self, board, stats):
+        self.wrapped = board
+        self.stats = stats
+        self.make_move = board.make_move
+        self.undo_move = board.undo_move
+        self.get_zobrist_hash = board.get_zobrist_hash
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def get_move_codes(self, player):
+        start = time.perf_counter()
+        codes = self.wrapped.get_move_codes(player)
+        stats = self.stats
+        stats.move_generation_time += time.perf_counter() - start
+        stats.expanded += 1
+        stats.moves_generated += len(codes)
+        return codes
+
+    def get_all_possible_moves(self, player):
+        start = time.perf_counter()
+        moves = self.wrapped.get_all_possible_moves(player)
+        stats = self.stats
+        stats.move_generation_time += time.perf_counter() - start
+        stats.expanded += 1
+        stats.moves_generated += len(moves)
+        return moves
+
+    def evaluate_features(self, player):
+        start = time.perf_counter()
+        features = self.wrapped.evaluate_features(player)
+        self.stats.evaluation_time += time.perf_counter() - start
+        return features
+
+    def is_game_over(self):
+        start = time.perf_counter()
+        over = self.wrapped.is_game_over()
+        self.stats.game_over_time += time.perf_counter() - start
+        return over
@@ -0,0 +1,106 @@
+"""Runs searches on a background thread so a UI loop never blocks on them."""
+
+from dataclasses import dataclass
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Job:
+    """One submitted search and, once ``poll`` returns it, its outcome."""
+
+    search: Callable
+    args: tuple
+    kwargs: dict
+    cancel: Optional[Callable] = None
+    reset: Optional[Callable] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+    cancelled: bool = False
+
+
+class SearchWorker:
+    """Single background thread fed through a queue, one job at a time.
+
+    ``submit`` hands over a callable (typically ``cpu.play`` on a copy of
+    the board) and returns at once; ``poll`` returns the finished job, if
+    any. ``cancel`` asks the running job to stop through its ``cancel``
+    hook, e.g. ``CPUPlayer.cancel``, and marks queued jobs so they are
+    returned without running. The ``reset`` hook, e.g.
+    ``CPUPlayer.reset_cancel``, clears an earlier request when a job
+    starts; the lock keeps ``cancel`` from slipping in between.
+    """
+
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.current: Optional[Job] = None
+        self.queued = []
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.thread = threading.Thread(target=self.run, name="search-worker", daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def submit(self, search, *args, cancel=None, reset=None, **kwargs):
+        job = Job(search, args, kwargs, cancel, reset)
+        self.pending += 1
+        with self.lock:
+            self.queued.append(job)
+        self.requests.put(job)
+        return job
+
+    def poll(self):
+        """Returns the next finished job without waiting, or None."""
+        try:
+            job = self.results.get_nowait()
+        except queue.Empty:
+            return None
+        self.pending -= 1
+        return job
+
+    def cancel(self):
+        with self.lock:
+            for job in self.queued:
+                job.cancelled = True
+            job = self.current
+            if job is not None:
+                job.cancelled = True
+                if job.cancel is not None:
+                    job.cancel()
+
+    def close(self, timeout=2.0):
+        """Cancels the running job and stops the thread."""
+        self.cancel()
+        self.requests.put(None)
+        self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                return
+            with self.lock:
+                self.queued.remove(job)
+                if not job.cancelled:
+                    if job.reset is not None:
+                        job.reset()
+                    self.current = job
+            if job.cancelled:
+                self.results.put(job)
+                continue
+            start = time.perf_counter()
+            try:
+                job.result = job.search(*job.args, **job.kwargs)
+            except Exception as error:  # handed to the UI thread instead of lost
+                job.error = error
+            job.elapsed_ms = (time.perf_counter() - start) * 1000.0
+            with self.lock:
+                self.current = None
+            self.results.put(job)
@@ -0,0 +1,288 @@
+"""Headless champion/challenger tournament, with the duel rules of the preview.
+
+A duel is two games between the champion and a challenger drawn by
+perturbing the champion's weights, the champion playing blue (2) first
+and red (4) second. A champion win scores +1.5 for the champion and -1
+for the challenger; a challenger win +1 and -1; a draw nothing. The
+champion keeps the title unless the challenger ends the duel ahead.
+
+Games use the fixed-depth search of ``optimization.run_match`` instead of
+the preview's time budget, so they run as fast as the CPU allows, give
+the same result on every run and can be replayed from their move codes.
+"""
+
+from dataclasses import asdict, dataclass, field
+from functools import partial
+import itertools
+import json
+import random
+from typing import Dict, List, Optional
+
+from board import Board
+from optimization import Adjudication, make_executor, perturb, run_match
+
+PERTURBATION_SIGMA = 0.35
+GAMES_PER_DUEL = 2
+CHAMPION_WIN = 1.5
+CHALLENGER_WIN = 1.0
+LOSS_PENALTY = -1.0
+
+DEFAULT_WEIGHTS = {
+    "grouping": 1.0,
+    "connection": 1.0,
+    "enemy_sep": 1.0,
+    "mobility": 1.0,
+}
+
+
+def cpu_name(number):
+    return f"CPU{number:03d}"
+
+
+def champion_color(game_index):
+    """Color of the champion in game ``game_index`` (from 0) of a duel."""
+    return 2 if game_index % 2 == 0 else 4
+
+
+def score_game(winner, champion):
+    """Returns the (champion, challenger) score change for one game.
+
+    ``champion`` is the champion's color; ``winner`` is None for a draw.
+    """
+    if winner == champion:
+        return CHAMPION_WIN, LOSS_PENALTY
+    if winner is not None:
+        return LOSS_PENALTY, CHALLENGER_WIN
+    return 0.0, 0.0
+
+
+def champion_keeps_title(champion_score, challenger_score):
+    return champion_score >= challenger_score
+
+
+@dataclass
+class GameRecord:
+    """One game of a duel; ``moves`` are the codes played from the start."""
+
+    champion_color: int
+    winner: Optional[int]
+    plies: int
+    reason: str
+    moves: List[int] = field(default_factory=list)
+
+
+@dataclass
+class DuelResult:
+    """Outcome of a duel; ``champion`` is the title holder going into it."""
+
+    index: int
+    champion: str
+    challenger: str
+    champion_weights: Dict[str, float]
+    challenger_weights: Dict[str, float]
+    champion_score: float
+    challenger_score: float
+    title_kept: bool
+    games: List[GameRecord] = field(default_factory=list)
+
+    @property
+    def title_holder(self):
+        return self.champion if self.title_kept else self.challenger
+
+    @property
+    def title_score(self):
+        return self.champion_score if self.title_kept else self.challenger_score
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["games"] = [GameRecord(**g) for g in data["games"]]
+        return cls(**data)
+
+
+def play_duel_game(color, champion, challenger, board_cls=Board, adjudication=None):
+    """Plays one game with the champion as ``color``; module level so it pickles."""
+    if color == 2:
+        match = run_match(champion, challenger, board_cls, adjudication=adjudication)
+    else:
+        match = run_match(challenger, champion, board_cls, adjudication=adjudication)
+    winner = 2 if match.result > 0 else 4 if match.result < 0 else None
+    return GameRecord(color, winner, match.plies, match.reason, match.moves)
+
+
+class Tournament:
+    """Runs champion/challenger duels back to back without a window.
+
+    Each duel depends on the previous one, so duels run one after the
+    other; with ``workers`` > 1 the games of a duel run in parallel
+    processes. Callbacks passed to ``subscribe`` receive every
+    :class:`DuelResult`, which is also appended to ``log_path`` as JSON
+    lines when given (see :func:`load_duels`).
+    """
+
+    def __init__(
+        self,
+        champion_weights=None,
+        sigma: float = PERTURBATION_SIGMA,
+        board_cls=Board,
+        workers: int = 1,
+        seed=None,
+        adjudication: Optional[Adjudication] = None,
+        log_path=None,
+    ):
+        self.sigma = sigma
+        self.board_cls = board_cls
+        self.adjudication = adjudication
+        self.log_path = log_path
+        self.executor = make_executor(min(workers, GAMES_PER_DUEL))
+        self.rng = random.Random(seed)
+        self.counter = itertools.count(1)
+        self.champion_weights = dict(champion_weights or DEFAULT_WEIGHTS)
+        self.champion = cpu_name(next(self.counter))
+        self.newChallenger()
+        self.duels = 0
+        self.games = 0
+        self.history = []
+        self.subscribers = []
+
+    def newChallenger(self):
+        self.challenger_weights = perturb(self.champion_weights, self.sigma, self.rng)
+        self.challenger = cpu_name(next(self.counter))
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def play_duel(self) -> DuelResult:
+        """Plays the next duel, updates the title and notifies subscribers."""
+        colors = [champion_color(i) for i in range(GAMES_PER_DUEL)]
+        play = partial(
+            play_duel_game,
+            champion=self.champion_weights,
+            challenger=self.challenger_weights,
+            board_cls=self.board_cls,
+            adjudication=self.adjudication,
+        )
+        if self.executor is None:
+            games = list(map(play, colors))
+        else:
+            games = list(self.executor.map(play, colors))
+
+        championScore = challengerScore = 0.0
+        for game in games:
+            dChampion, dChallenger = score_game(game.winner, game.champion_color)
+            championScore += dChampion
+            challengerScore += dChallenger
+
+        self.duels += 1
+        self.games += len(games)
+        result = DuelResult(
+            index=self.duels,
+            champion=self.champion,
+            challenger=self.challenger,
+            champion_weights=self.champion_weights,
+            challenger_weights=self.challenger_weights,
+            champion_score=championScore,
+            challenger_score=challengerScore,
+            title_kept=champion_keeps_title(championScore, challengerScore),
+            games=games,
+        )
+        if not result.title_kept:
+            self.champion = self.challenger
+            self.champion_weights = self.challenger_weights
+        self.history.append((result.index, result.title_score, self.champion))
+        self.newChallenger()
+
+        if self.log_path is not None:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(result.to_dict()) + "\n")
+        for callback in self.subscribers:
+            callback(result)
+        return result
+
+    def run(self, duels=None):
+        """Yields the results of ``duels`` duels, or forever if None."""
+        for _ in range(duels) if duels is not None else itertools.count():
+            yield self.play_duel()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def load_duels(path):
+    """Reads the duels a tournament appended to ``path``."""
+    with open(path) as f:
+        return [DuelResult.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def duel_record(result):
+    """One row per duel for ``progress.MetricsWriter``: the plotted champion score."""
+    return {
+        "duel": result.index,
+        "champion": result.title_holder,
+        "score": result.title_score,
+        "title_kept": result.title_kept,
+        "plies": sum(g.plies for g in result.games),
+    }
+
+
+def print_duel(result):
+    outcome = "garde le titre" if result.title_kept else "perd le titre"
+    print(
+        f"Duel {result.index}: {result.champion} {result.champion_score:+.1f} / "
+        f"{result.challenger} {result.challenger_score:+.1f} -> {result.champion} {outcome}"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from bitboard import BitBoard
+    from progress import MetricsWriter
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duels", type=int, default=20, help="0 runs until Ctrl+C")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--sigma", type=float, default=PERTURBATION_SIGMA)
+    parser.add_argument(
+        "--adjudicate", action="store_true", help="end decided or stalled games early"
+    )
+    parser.add_argument("--log", help="JSON-lines file every duel is appended to")
+    parser.add_argument(
+        "--metrics", help="CSV (or .jsonl) file a score row per duel is appended to"
+    )
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        sigma=args.sigma,
+        board_cls=BitBoard,
+        workers=args.workers,
+        seed=args.seed,
+        adjudication=Adjudication() if args.adjudicate else None,
+        log_path=args.log,
+    )
+    tournament.subscribe(print_duel)
+    metrics = MetricsWriter(args.metrics) if args.metrics else None
+    if metrics is not None:
+        tournament.subscribe(lambda result: metrics.write(duel_record(result)))
+    start = time.perf_counter()
+    try:
+        for _ in tournament.run(args.duels or None):
+            pass
+    except KeyboardInterrupt:
+        print("\n=== ARRET ===")
+    finally:
+        tournament.close()
+        if metrics is not None:
+            metrics.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{tournament.duels} duels, {tournament.games} parties en {elapsed:.1f} s; "
+        f"champion {tournament.champion}: {tournament.champion_weights}"
+    )
@@ -0,0 +1,85 @@
+"""Bounded transposition table used by the alpha-beta search."""
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Entry layout: (key, depth, flag, score, move, age)
+KEY = 0
+DEPTH = 1
+FLAG = 2
+SCORE = 3
+MOVE = 4
+AGE = 5
+
+
+class TranspositionTable:
+    """Fixed-size, hash-indexed table of previously searched positions.
+
+    A slot is overwritten when it is empty, holds the same position, was
+    written during an older search, or holds a shallower result.
+    """
+
+    def __init__(self, size=1 << 16):
+        capacity = 1
+        while capacity < size:
+            capacity <<= 1
+        self.size = capacity
+        self.mask = capacity - 1
+        self.slots = [None] * capacity
+        self.age = 0
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejected = 0
+
+    def new_search(self):
+        """Marks existing entries as older so they can be replaced first."""
+        self.age += 1
+
+    def probe(self, key):
+        entry = self.slots[key & self.mask]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[KEY] != key:
+            self.misses += 1
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, flag, score, move):
+        idx = key & self.mask
+        old = self.slots[idx]
+        if old is None:
+            self.used += 1
+        elif old[KEY] != key and old[AGE] == self.age and old[DEPTH] > depth:
+            self.rejected += 1
+            return
+        elif old[KEY] != key:
+            self.replacements += 1
+        self.slots[idx] = (key, depth, flag, score, move, self.age)
+        self.stores += 1
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.used = 0
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size": self.size,
+            "used": self.used,
+            "fill": self.used / self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.batch_eval import evaluate_batch
+from src.cpu import CPUPlayer
+from src.game import BitBoard, Board
+
+WEIGHTS = {"grouping": 0.7, "connection": 1.3, "enemy_sep": 0.4, "mobility": 1.1}
+
+
+def random_game_boards(seed, plies=50):
+    rng = random.Random(seed)
+    board = BitBoard()
+    player = 2
+    boards = []
+    for _ in range(plies):
+        moves = board.get_all_possible_moves(player)
+        if not moves or board.is_game_over():
+            break
+        board.make_move(rng.choice(moves))
+        boards.append(BitBoard(board.board))
+        player = 4 if player == 2 else 2
+    return boards
+
+
+class TestBatchEvaluation(unittest.TestCase):
+
+    def test_batch_matches_single_evaluation(self):
+        boards = random_game_boards(8)
+        grids = np.array([b.board for b in boards], dtype=np.int8)
+        pairs = [(b.bits2, b.bits4) for b in boards]
+        for player in (2, 4):
+            cpu = CPUPlayer(player, WEIGHTS)
+            for positions in (grids, pairs):
+                features, scores = evaluate_batch(positions, player, WEIGHTS)
+                for i, board in enumerate(boards):
+                    expected = board.evaluate_features(player)
+                    self.assertEqual({k: int(v[i]) for k, v in features.items()}, expected)
+                    self.assertEqual(scores[i], cpu.evaluate(board))
+
+    def test_batch_leaf_search_matches_regular_search(self):
+        for board in (Board(), Board(random_game_boards(3, 12)[-1].board)):
+            for depth in (2, 3):
+                regular = CPUPlayer(2, WEIGHTS)
+                batched = CPUPlayer(2, WEIGHTS, batch_leaves=True)
+                mv1 = regular.play(board, depth=depth)
+                mv2 = batched.play(board, depth=depth)
+                self.assertEqual((mv1.fr, mv1.fc, mv1.tr, mv1.tc), (mv2.fr, mv2.fc, mv2.tr, mv2.tc))
+                self.assertAlmostEqual(regular.last_best_score, batched.last_best_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
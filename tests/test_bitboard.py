@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from src.game import BitBoard, Board, Move
+
+
+def move_tuples(moves):
+    return [(m.fr, m.fc, m.tr, m.tc) for m in moves]
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def assertSamePosition(self, board, bitboard):
+        self.assertEqual(bitboard.board, tuple(map(tuple, board.board)))
+        self.assertEqual(bitboard.countPlayer2, board.countPlayer2)
+        self.assertEqual(bitboard.countPlayer4, board.countPlayer4)
+        self.assertEqual(bitboard.get_zobrist_hash(), board.get_zobrist_hash())
+        self.assertEqual(bitboard.is_game_over(), board.is_game_over())
+        self.assertEqual(bitboard.get_winner(), board.get_winner())
+        for player in (2, 4):
+            self.assertEqual(
+                move_tuples(bitboard.get_all_possible_moves(player)),
+                move_tuples(board.get_all_possible_moves(player)),
+            )
+            self.assertEqual(
+                bitboard.evaluate_features(player), board.evaluate_features(player)
+            )
+
+    def test_initial_position_matches(self):
+        self.assertSamePosition(Board(), BitBoard())
+
+    def test_random_games_match_list_board(self):
+        rng = random.Random(2024)
+        for _ in range(20):
+            board = Board()
+            bitboard = BitBoard()
+            player = 2
+            plies = 0
+            while plies < 80 and not board.is_game_over():
+                moves = board.get_all_possible_moves(player)
+                if not moves:
+                    break
+                mv = rng.choice(moves)
+                board.make_move(mv)
+                bitboard.make_move(mv)
+                self.assertSamePosition(board, bitboard)
+                player = 4 if player == 2 else 2
+                plies += 1
+
+            for _ in range(plies):
+                board.undo_move()
+                bitboard.undo_move()
+            self.assertSamePosition(board, bitboard)
+            self.assertEqual(bitboard.board, BitBoard().board)
+
+    def test_custom_initial_board(self):
+        grid = [[0] * 8 for _ in range(8)]
+        grid[0][0] = 2
+        grid[1][1] = 2
+        grid[7][7] = 4
+        grid[3][4] = 4
+        self.assertSamePosition(Board(grid), BitBoard(grid))
+
+    def test_board_view_is_read_only(self):
+        bitboard = BitBoard()
+        with self.assertRaises(TypeError):
+            bitboard.board[0][1] = 0
+        self.assertEqual(bitboard.board, tuple(map(tuple, Board().board)))
+
+    def test_make_move_rejects_empty_square(self):
+        with self.assertRaises(ValueError):
+            BitBoard().make_move(Move(3, 3, 4, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from src.cpu import CPUPlayer
+from src.endgame import DRAW, LOSS, WIN, ProofNumberSolver
+from src.game import BitBoard, Board
+from src.moves import SQUARES_MASK
+from src.optimization import fitness
+
+WEIGHTS = {"grouping": 1, "connection": 1, "enemy_sep": 1, "mobility": 1}
+
+
+def grid(pieces2, pieces4):
+    g = [[0] * 8 for _ in range(8)]
+    for r, c in pieces2:
+        g[r][c] = 2
+    for r, c in pieces4:
+        g[r][c] = 4
+    return g
+
+
+class TestProofNumberSolver(unittest.TestCase):
+
+    def test_proves_immediate_win(self):
+        for cls in (Board, BitBoard):
+            board = cls(grid([(0, 0), (0, 3)], [(7, 7), (7, 4)]))
+            solution = ProofNumberSolver().solve(board, 2)
+            self.assertEqual(solution.result, WIN)
+            board.make_move(solution.move)
+            self.assertEqual(board.get_winner(), 2)
+
+    def test_proves_loss_and_caches(self):
+        board = grid([(0, 0), (0, 3)], [(7, 7), (4, 4)])
+        solver = ProofNumberSolver()
+        for cls in (Board, BitBoard):
+            b = cls(board)
+            solution = solver.solve(b, 4)
+            self.assertEqual(solution.result, LOSS)
+            self.assertIsNone(solution.move)
+            self.assertEqual([list(row) for row in b.board], board)
+        # Same placement on the second engine: served from the table.
+        self.assertEqual((solver.solved, solver.hits), (1, 1))
+
+    def test_only_applies_below_threshold(self):
+        solver = ProofNumberSolver(max_pieces=4)
+        self.assertTrue(solver.applies(Board(grid([(0, 0), (0, 3)], [(7, 7), (7, 4)]))))
+        self.assertFalse(solver.applies(Board()))
+
+    def test_player_plays_proven_win(self):
+        board = Board(grid([(0, 0), (0, 3)], [(7, 7), (7, 4)]))
+        cpu = CPUPlayer(2, WEIGHTS, solver=ProofNumberSolver())
+        mv = cpu.play(board, depth=1)
+        self.assertTrue(cpu.last_search_info.solved)
+        board.make_move(mv)
+        self.assertEqual(board.get_winner(), 2)
+
+
+    def test_player_plays_proven_draw(self):
+        board = Board(grid([(6, 3), (4, 6), (7, 5)], [(5, 5), (3, 3)]))
+        solver = ProofNumberSolver()
+        solution = solver.solve(board, 2)
+        self.assertEqual(solution.result, DRAW)
+        cpu = CPUPlayer(2, WEIGHTS, solver=solver)
+        mv = cpu.play(board, depth=3)
+        self.assertTrue(cpu.last_search_info.solved)
+        self.assertEqual(mv.code, solution.move & SQUARES_MASK)
+        self.assertEqual(cpu.last_best_score, 0.0)
+
+    def test_player_searches_one_ply_in_proven_loss(self):
+        board = Board(grid([(2, 1), (4, 4), (1, 4)], [(4, 0), (2, 2)]))
+        cpu = CPUPlayer(2, WEIGHTS, solver=ProofNumberSolver())
+        self.assertIsNotNone(cpu.play(board, depth=3))
+        self.assertFalse(cpu.last_search_info.solved)
+        self.assertEqual(cpu.last_search_info.depth, 1)
+
+    def test_optimizer_games_use_the_solver(self):
+        # Every position applies, and a tiny budget keeps the solves cheap.
+        solver = ProofNumberSolver(max_pieces=64, max_nodes=50)
+        fitness(WEIGHTS, BitBoard, solver=solver)
+        self.assertGreater(solver.solved + solver.unsolved, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.evolution import FEATURES, CMAESRunner
+from src.game import BitBoard
+from src.optimization import OptimizationStats
+
+
+class TestCMAESRunner(unittest.TestCase):
+
+    def test_generation_stats_and_reproducibility(self):
+        serial = CMAESRunner(board_cls=BitBoard, population=4, seed=2, pairs=1)
+        parallel = CMAESRunner(board_cls=BitBoard, population=4, seed=2, pairs=1, workers=2)
+        try:
+            self.assertEqual(serial.games, 2)
+            stats = serial.step()
+            self.assertEqual(type(stats).__name__, OptimizationStats.__name__)
+            self.assertEqual(stats.games, 8)
+            self.assertEqual(stats.iteration, 1)
+            self.assertEqual(set(stats.last_candidate), set(FEATURES))
+            self.assertTrue(all(v >= 0 for v in stats.last_candidate.values()))
+            self.assertGreaterEqual(stats.best_score, stats.last_score)
+            self.assertEqual(parallel.step(), stats)
+        finally:
+            serial.close()
+            parallel.close()
+
+    def test_resume_and_log(self):
+        settings = dict(board_cls=BitBoard, population=3, pairs=1)
+        reference = CMAESRunner(seed=6, **settings)
+        reference.step()
+        expected = reference.step()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cmaes.json")
+            log = os.path.join(tmp, "candidates.jsonl")
+            first = CMAESRunner(seed=6, checkpoint=path, log_path=log, **settings)
+            first.step()
+            first.save_checkpoint()
+            resumed = CMAESRunner(checkpoint=path, log_path=log, **settings)
+            self.assertEqual(resumed.games, first.games)
+            self.assertEqual(resumed.step(), expected)
+            with open(log) as f:
+                iterations = [json.loads(line)["iteration"] for line in f]
+        self.assertEqual(iterations, [0, 1, 1, 1, 2, 2, 2])
+
+    def test_rejects_population_below_two(self):
+        with self.assertRaises(ValueError):
+            CMAESRunner(board_cls=BitBoard, population=1)
+
+    def test_covariance_stays_positive_definite(self):
+        runner = CMAESRunner(board_cls=BitBoard, population=4, seed=4, pairs=1)
+        runner.step()
+        runner.step()
+        np.testing.assert_allclose(runner.C, runner.C.T)
+        self.assertTrue(np.all(np.linalg.eigvalsh(runner.C) > 0))
+        self.assertGreater(runner.sigma, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import random
+import unittest
+
+from src.features_np import board_array, evaluate_features
+from src.game import Board
+
+
+def random_grid(rng):
+    squares = rng.sample(range(64), rng.randint(0, 24))
+    grid = [[0] * 8 for _ in range(8)]
+    split = rng.randint(0, len(squares))
+    for i, sq in enumerate(squares):
+        grid[sq // 8][sq % 8] = 2 if i < split else 4
+    return grid
+
+
+class TestVectorizedFeatures(unittest.TestCase):
+
+    def assertFeaturesMatch(self, board):
+        grid = board_array(board)
+        for player in (2, 4):
+            self.assertEqual(evaluate_features(grid, player), board.evaluate_features(player))
+
+    def test_random_positions(self):
+        rng = random.Random(99)
+        for _ in range(300):
+            self.assertFeaturesMatch(Board(random_grid(rng)))
+
+    def test_positions_from_random_games(self):
+        rng = random.Random(5)
+        board = Board()
+        player = 2
+        for _ in range(60):
+            self.assertFeaturesMatch(board)
+            moves = board.get_all_possible_moves(player)
+            if not moves or board.is_game_over():
+                break
+            board.make_move(rng.choice(moves))
+            player = 4 if player == 2 else 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,18 @@
+import random
 import unittest
 
 from src.game import Board, Move
 
+
+def scan_line(board, x, y, dx, dy):
+    count = 0
+    for k in range(-7, 8):
+        nx, ny = x + dx * k, y + dy * k
+        if 0 <= nx < 8 and 0 <= ny < 8 and board.board[ny][nx] != 0:
+            count += 1
+    return count
+
+
 class TestBoard(unittest.TestCase):
 
     def setUp(self):
@@ -49,5 +60,109 @@ class TestBoard(unittest.TestCase):
         self.board.countPlayer4 = 0
         self.assertEqual(self.board.get_winner(), 2)
 
+    def assertLineCountsMatchScan(self, board):
+        for y in range(8):
+            for x in range(8):
+                for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                    self.assertEqual(
+                        board.countPiecesInLine(x, y, dx, dy),
+                        scan_line(board, x, y, dx, dy),
+                    )
+
+    def test_line_counts_follow_make_and_undo(self):
+        rng = random.Random(7)
+        player = 2
+        for _ in range(40):
+            moves = self.board.get_all_possible_moves(player)
+            if not moves or self.board.is_game_over():
+                break
+            self.board.make_move(rng.choice(moves))
+            self.assertLineCountsMatchScan(self.board)
+            player = 4 if player == 2 else 2
+        while self.board.historyIndex >= 0:
+            self.board.undo_move()
+            self.assertLineCountsMatchScan(self.board)
+
+    def test_line_counts_custom_initial_board(self):
+        grid = [[0] * 8 for _ in range(8)]
+        grid[2][3] = 2
+        grid[5][6] = 4
+        grid[2][6] = 4
+        board = Board(grid)
+        self.assertLineCountsMatchScan(board)
+        self.assertEqual(board.countPiecesInLine(3, 2, 1, 0), 2)
+
+    def test_incremental_zobrist_hash(self):
+        start = self.board.get_zobrist_hash()
+        self.assertEqual(start, self.board.computeZobristHash())
+        self.board.make_move(Move(0, 1, 2, 1))
+        self.assertEqual(
+            self.board.get_zobrist_hash(),
+            self.board.computeZobristHash() ^ Board.ZOBRIST_SIDE,
+        )
+        self.board.undo_move()
+        self.assertEqual(self.board.get_zobrist_hash(), start)
+
+    def test_count_moves_matches_move_generation(self):
+        rng = random.Random(21)
+        player = 2
+        for _ in range(40):
+            for p in (2, 4):
+                self.assertEqual(
+                    self.board.countMoves(p), len(self.board.get_all_possible_moves(p))
+                )
+            moves = self.board.get_all_possible_moves(player)
+            if not moves or self.board.is_game_over():
+                break
+            self.board.make_move(rng.choice(moves))
+            player = 4 if player == 2 else 2
+
+    def test_connectivity_cache_follows_make_and_undo(self):
+        grid = [[0] * 8 for _ in range(8)]
+        grid[0][0] = 2
+        grid[0][1] = 2
+        grid[0][3] = 2
+        grid[7][7] = 4
+        grid[5][5] = 4
+        board = Board(grid)
+        self.assertFalse(board.is_game_over())
+        board.make_move(Move(0, 3, 0, 2))
+        self.assertTrue(board.is_game_over())
+        self.assertEqual(board.get_winner(), 2)
+        board.undo_move()
+        self.assertFalse(board.is_game_over())
+        self.assertIsNone(board.get_winner())
+
+        rng = random.Random(4)
+        player = 2
+        for _ in range(40):
+            for p in (2, 4):
+                self.assertEqual(self.board.isWinningState(p), self.board.computeWinningState(p))
+            moves = self.board.get_all_possible_moves(player)
+            if not moves or self.board.is_game_over():
+                break
+            self.board.make_move(rng.choice(moves))
+            player = 4 if player == 2 else 2
+
+    def test_move_codes_match_move_objects(self):
+        codes = self.board.get_move_codes(2)
+        moves = self.board.get_all_possible_moves(2)
+        self.assertEqual([Move.from_code(c) for c in codes], moves)
+        self.assertEqual(moves[0], Move(moves[0].fr, moves[0].fc, moves[0].tr, moves[0].tc))
+        self.board.make_move(codes[0])
+        self.assertEqual(self.board.board[moves[0].tr][moves[0].tc], 2)
+
+    def test_history_grows_past_initial_capacity(self):
+        start = [row[:] for row in self.board.board]
+        forward = Move(0, 1, 2, 1)
+        back = Move(2, 1, 0, 1)
+        for _ in range(Board.HISTORY_CAPACITY):
+            self.board.make_move(forward)
+            self.board.make_move(back)
+        for _ in range(2 * Board.HISTORY_CAPACITY):
+            self.board.undo_move()
+        self.assertEqual(self.board.board, start)
+        self.assertEqual(self.board.historyIndex, -1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
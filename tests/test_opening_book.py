@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from src.cpu import CPUPlayer
+from src.game import Board
+from src.moves import SQUARES_MASK
+from src.opening_book import OpeningBook, book_key, extend_book, weights_key
+
+WEIGHTS = {"grouping": 1, "connection": 1, "enemy_sep": 1, "mobility": 1}
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "book.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_build_save_and_reload(self):
+        book = OpeningBook(self.path)
+        searched = extend_book(book, WEIGHTS, plies=2, depth=2, width=2)
+        self.assertEqual(searched, 3)
+        book.save()
+        book.close()
+
+        loaded = OpeningBook(self.path)
+        self.assertEqual(len(loaded), 3)
+        keys = [r[0] for r in loaded.records()]
+        self.assertEqual(keys, sorted(keys))
+
+        board = Board()
+        move, _ = loaded.lookup(board, 2)
+        self.assertIn(move, board.get_move_codes(2))
+        self.assertIsNone(loaded.lookup(board, 4))
+
+        # Extending again only searches the new, deeper positions.
+        self.assertEqual(extend_book(loaded, WEIGHTS, plies=2, depth=2, width=2), 0)
+        self.assertEqual(extend_book(loaded, WEIGHTS, plies=3, depth=2, width=2), 4)
+        loaded.save()
+        self.assertEqual(len(loaded), 7)
+        loaded.close()
+
+    def test_player_uses_book_move(self):
+        board = Board()
+        book = OpeningBook()
+        code = board.get_move_codes(2)[-1]
+        book.add(board, 2, code, 1.5)
+
+        cpu = CPUPlayer(2, WEIGHTS, book=book)
+        mv = cpu.play(board, depth=2)
+        self.assertEqual(mv.code, code & SQUARES_MASK)
+        self.assertTrue(cpu.last_search_info.from_book)
+        self.assertEqual(cpu.last_best_score, 1.5)
+        self.assertEqual(book.hits, 1)
+        self.assertNotEqual(book_key(board, 2), book_key(board, 4))
+        with self.assertRaises(ValueError):
+            book.save()
+
+    def test_book_is_bound_to_its_weights(self):
+        other = dict(WEIGHTS, mobility=2.0)
+        book = OpeningBook(self.path)
+        extend_book(book, WEIGHTS, plies=1, depth=1, width=1)
+        book.save()
+        book.close()
+
+        loaded = OpeningBook(self.path)
+        self.assertEqual(loaded.weights_key, weights_key(WEIGHTS))
+        self.assertTrue(loaded.matches({k: float(v) for k, v in WEIGHTS.items()}))
+        self.assertFalse(loaded.matches(other))
+        board = Board()
+        self.assertIsNone(loaded.lookup(board, 2, other))
+        self.assertIsNotNone(loaded.lookup(board, 2, WEIGHTS))
+
+        cpu = CPUPlayer(2, other, book=loaded)
+        self.assertIsNotNone(cpu.play(board, depth=1))
+        self.assertFalse(cpu.last_search_info.from_book)
+        with self.assertRaises(ValueError):
+            extend_book(loaded, other, plies=1, depth=1, width=1)
+        loaded.close()
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path, other)
+
+    def test_rejects_foreign_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a book")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.game import BitBoard
+from src.optimization import (
+    BASELINE_WEIGHTS,
+    MAX_PLIES,
+    Adjudication,
+    ACCEPT,
+    REJECT,
+    UNDECIDED,
+    OptimizationRunner,
+    SequentialTest,
+    fitness,
+    fitness_many,
+    make_executor,
+    opening_moves,
+    play_match,
+    run_match,
+    sequential_fitness_many,
+    sprt_decision,
+)
+
+CANDIDATE = {"grouping": 0.5, "connection": 1.5, "enemy_sep": 1.0, "mobility": 0.2}
+
+
+class TestParallelFitness(unittest.TestCase):
+
+    def test_parallel_fitness_matches_serial(self):
+        candidates = [
+            {"grouping": 0.5, "connection": 1.5, "enemy_sep": 1.0, "mobility": 0.2},
+            {"grouping": 1.8, "connection": 0.3, "enemy_sep": 0.6, "mobility": 1.1},
+        ]
+        serial = fitness_many(candidates, BitBoard)
+        executor = make_executor(2)
+        try:
+            parallel = fitness_many(candidates, BitBoard, executor)
+        finally:
+            executor.shutdown()
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial[0], fitness(candidates[0], BitBoard))
+
+    def test_seeded_runner_is_reproducible_across_worker_counts(self):
+        serial = OptimizationRunner(board_cls=BitBoard, population=2, seed=11)
+        parallel = OptimizationRunner(board_cls=BitBoard, population=2, seed=11, workers=2)
+        try:
+            self.assertEqual(serial.best, parallel.best)
+            self.assertEqual(serial.step(), parallel.step())
+        finally:
+            serial.close()
+            parallel.close()
+
+
+class TestAdjudication(unittest.TestCase):
+
+    def test_disabled_rules_play_to_the_end(self):
+        match = run_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard)
+        self.assertEqual(match.reason, "game_over")
+        self.assertEqual(match.plies_saved, 0)
+        self.assertEqual(match.result, play_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard))
+        off = Adjudication(repetitions=0, resign_plies=0, no_progress_plies=0)
+        self.assertEqual(run_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard, adjudication=off), match)
+
+    def test_resign_and_no_progress(self):
+        full = run_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard)
+        resign = Adjudication(resign_margin=1.0, resign_plies=2, no_progress_plies=0)
+        match = run_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard, adjudication=resign)
+        self.assertEqual(match.reason, "resign")
+        self.assertIn(match.result, (1, -1))
+        self.assertLess(match.plies, full.plies)
+        self.assertEqual(match.plies + match.plies_saved, MAX_PLIES)
+
+        quiet = Adjudication(resign_plies=0, no_progress_plies=1)
+        match = run_match(CANDIDATE, BASELINE_WEIGHTS, BitBoard, adjudication=quiet)
+        self.assertEqual((match.reason, match.result), ("no_progress", 0))
+        self.assertLess(match.plies, full.plies)
+
+    def test_fitness_accepts_rules(self):
+        rules = Adjudication()
+        self.assertEqual(
+            fitness_many([CANDIDATE], BitBoard, adjudication=rules)[0],
+            fitness(CANDIDATE, BitBoard, adjudication=rules),
+        )
+
+
+class TestSequentialFitness(unittest.TestCase):
+
+    def test_sprt_decision(self):
+        test = SequentialTest()
+        self.assertEqual(sprt_decision([], 0.0, test), UNDECIDED)
+        self.assertEqual(sprt_decision([-2], 0.0, test), REJECT)
+        self.assertEqual(sprt_decision([2, 2], 0.0, test), ACCEPT)
+        self.assertEqual(sprt_decision([0, 1], 0.0, test), UNDECIDED)
+        # Results that would pass a low bar fall short of a higher one.
+        self.assertEqual(sprt_decision([1, 1], 0.0, test), UNDECIDED)
+        self.assertEqual(sprt_decision([1, 1], 4.0, test), REJECT)
+
+    def test_one_reference_pair_cannot_decide(self):
+        test = SequentialTest(max_pairs=1)
+        # Either reference pair alone would decide as a plain result.
+        self.assertEqual(sprt_decision([4], 0.0, test), ACCEPT)
+        self.assertEqual(sprt_decision([-4], 0.0, test), REJECT)
+        for reference in ([-2], [2]):
+            (result,) = sequential_fitness_many(
+                [CANDIDATE], 0.0, test, BitBoard, reference=reference
+            )
+            self.assertEqual(result.decision, UNDECIDED)
+        self.assertEqual(sprt_decision([4], 0.0, test, min_pairs=2), UNDECIDED)
+        self.assertEqual(sprt_decision([4, 4], 0.0, test, min_pairs=2), ACCEPT)
+
+    def test_openings_differ_and_are_reproducible(self):
+        self.assertEqual(opening_moves(0), [])
+        self.assertEqual(opening_moves(3), opening_moves(3))
+        self.assertNotEqual(opening_moves(1), opening_moves(2))
+        self.assertEqual(len(opening_moves(1)), 4)
+
+    def test_stops_early_and_reports_games(self):
+        test = SequentialTest(max_pairs=3)
+        candidates = [CANDIDATE, {k: 0.0 for k in CANDIDATE}]
+        serial = sequential_fitness_many(candidates, 0.0, test, BitBoard)
+        executor = make_executor(2)
+        try:
+            parallel = sequential_fitness_many(candidates, 0.0, test, BitBoard, executor)
+        finally:
+            executor.shutdown()
+        self.assertEqual(serial, parallel)
+        for result in serial:
+            self.assertEqual(result.games, 2 * len(result.pairs))
+            self.assertLessEqual(result.games, 6)
+            self.assertAlmostEqual(result.score, 2 * sum(result.pairs) / len(result.pairs))
+            if result.decision == UNDECIDED:
+                self.assertEqual(result.games, 6)
+
+    def test_runner_counts_games(self):
+        test = SequentialTest(max_pairs=2)
+        runner = OptimizationRunner(board_cls=BitBoard, seed=5, sequential=test)
+        try:
+            self.assertEqual(runner.games, 4)
+            stats = runner.step()
+            self.assertGreaterEqual(stats.games, 2)
+            self.assertEqual(runner.games, 4 + stats.games)
+        finally:
+            runner.close()
+        fixed = OptimizationRunner(board_cls=BitBoard, seed=5, fixed=True)
+        self.assertIsNone(fixed.sequential)
+        self.assertEqual(fixed.step().games, 4)
+
+    def test_compares_with_the_best_on_the_same_openings(self):
+        test = SequentialTest(max_pairs=3)
+        weak, strong = [-2] * 3, [2] * 3
+        (easy,) = sequential_fitness_many([CANDIDATE], 0.0, test, BitBoard, reference=weak)
+        (hard,) = sequential_fitness_many([CANDIDATE], 0.0, test, BitBoard, reference=strong)
+        self.assertNotEqual(hard.decision, ACCEPT)
+        if min(easy.pairs) > -2:
+            self.assertEqual(easy.decision, ACCEPT)
+
+        runner = OptimizationRunner(board_cls=BitBoard, seed=5, sequential=test)
+        try:
+            self.assertEqual(len(runner.best_pairs), 3)
+            self.assertAlmostEqual(runner.best_score, 2 * sum(runner.best_pairs) / 3)
+            # A lucky score no longer acts as the bar: only the pairs count.
+            runner.best_score, runner.best_pairs = 4.0, weak
+            for _ in range(3):
+                if runner.step().improved:
+                    break
+            self.assertNotEqual(runner.best_pairs, weak)
+            self.assertEqual(len(runner.best_pairs), 3)
+        finally:
+            runner.close()
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def test_resume_continues_exactly(self):
+        test = SequentialTest(max_pairs=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state.json")
+            log = os.path.join(tmp, "candidates.jsonl")
+
+            settings = dict(board_cls=BitBoard, population=2, sequential=test)
+            reference = OptimizationRunner(seed=8, **settings)
+            reference.step()
+            expected = reference.step()
+
+            first = OptimizationRunner(seed=8, checkpoint=path, log_path=log, **settings)
+            first.step()
+            first.save_checkpoint()
+            games = first.games
+
+            # No seed: everything comes from the checkpoint, nothing is replayed.
+            resumed = OptimizationRunner(checkpoint=path, log_path=log, **settings)
+            self.assertEqual(resumed.games, games)
+            self.assertEqual(resumed.step(), expected)
+
+            with open(log) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 1 + 2 + 2)
+            self.assertEqual([r["iteration"] for r in records], [0, 1, 1, 2, 2])
+            self.assertFalse(os.path.exists(path + ".tmp"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from src.game import BitBoard, Board
+from src.perft import POSITIONS, REFERENCE_COUNTS, check, divide, perft
+
+
+class TestPerft(unittest.TestCase):
+
+    def test_engines_match_reference_counts(self):
+        for board_cls in (Board, BitBoard):
+            self.assertEqual(check(board_cls, max_depth=3), [])
+
+    def test_divide_sums_to_perft(self):
+        grid, player = POSITIONS["middlegame"]
+        counts = divide(BitBoard(grid), 3, player)
+        self.assertEqual(len(counts), REFERENCE_COUNTS["middlegame"][0])
+        self.assertEqual(sum(counts.values()), REFERENCE_COUNTS["middlegame"][2])
+
+    def test_perft_restores_board(self):
+        board = Board()
+        perft(board, 3, 2)
+        self.assertEqual(board.board, Board().board)
+        self.assertEqual(board.get_zobrist_hash(), Board().get_zobrist_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+"""Perft timings; collected only when pytest-benchmark is installed.
+
+Run with ``pytest tests/test_perft_benchmark.py --benchmark-only``.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.game import BitBoard, Board  # noqa: E402
+from src.perft import POSITIONS, REFERENCE_COUNTS, perft  # noqa: E402
+
+
+@pytest.mark.parametrize("board_cls", [Board, BitBoard], ids=["list", "bitboard"])
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+def test_perft_depth_3(benchmark, board_cls, name):
+    grid, player = POSITIONS[name]
+    board = board_cls(grid)
+    nodes = benchmark(perft, board, 3, player)
+    assert nodes == REFERENCE_COUNTS[name][2]
@@ -0,0 +1,92 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from src.optimization import OptimizationStats, stats_record
+from src.progress import MetricsWriter, ProgressPlot
+
+try:
+    import matplotlib
+except ImportError:  # pragma: no cover - only the live plot needs matplotlib
+    matplotlib = None
+else:
+    matplotlib.use("Agg")
+
+
+class TestMetricsWriter(unittest.TestCase):
+
+    def test_csv_keeps_one_header_across_runs(self):
+        stats = OptimizationStats(
+            best_weights={"grouping": 1.0, "mobility": 0.5},
+            best_score=2.0,
+            iteration=3,
+            sigma=0.2,
+            last_candidate={"grouping": 1.0, "mobility": 0.5},
+            last_score=2.0,
+            improved=True,
+            games=8,
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.csv")
+            for _ in range(2):
+                writer = MetricsWriter(path)
+                writer.write(stats_record(stats))
+                writer.close()
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["iteration"], "3")
+        self.assertEqual(rows[1]["best_mobility"], "0.5")
+
+    def test_csv_follows_the_existing_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.csv")
+            with open(path, "w") as f:
+                f.write("score,duel\n1.5,1\n")
+            writer = MetricsWriter(path)
+            writer.write({"duel": 2, "score": -1.0})
+            with self.assertRaises(ValueError):
+                writer.write({"duel": 3, "score": 0.0, "plies": 40})
+            writer.close()
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(rows[1], {"score": "-1.0", "duel": "2"})
+        self.assertEqual(len(rows), 2)
+
+    def test_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.jsonl")
+            writer = MetricsWriter(path)
+            writer.write({"duel": 1, "score": 0.5})
+            writer.write({"duel": 2, "score": -2.0})
+            writer.close()
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[1], {"duel": 2, "score": -2.0})
+
+
+@unittest.skipIf(matplotlib is None, "matplotlib is not installed")
+class TestProgressPlot(unittest.TestCase):
+
+    def test_updates_in_place_and_throttles(self):
+        plot = ProgressPlot("Score", "Duel", "Score", interval=60.0, annotations=2)
+        try:
+            for i in range(50):
+                plot.add(i, i % 3, f"CPU{i // 10:03d}")
+                plot.refresh()
+            self.assertEqual(plot.draws, 1)
+            self.assertEqual(len(plot.ax.lines), 1)
+            # Five label changes, only the last two stay annotated.
+            self.assertEqual([a.get_text() for a in plot.labels], ["CPU003", "CPU004"])
+            self.assertEqual(len(plot.ax.texts), 2)
+            self.assertTrue(plot.refresh(force=True))
+            self.assertEqual(list(plot.line.get_xdata()), list(range(50)))
+            self.assertFalse(plot.refresh(force=True))
+        finally:
+            plot.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+try:
+    import pygame
+except ImportError:  # pragma: no cover - pygame is only needed for the preview
+    pygame = None
+
+if pygame is not None:
+    from src.render import BoardView, FrameTimer, SidebarView, TextCache
+
+EMPTY = [[0] * 8 for _ in range(8)]
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 18)
+        self.screen = pygame.Surface((480, 320))
+
+    def test_board_redraws_only_changed_squares(self):
+        view = BoardView(40)
+        grid = [row[:] for row in EMPTY]
+        grid[0][1] = 2
+        self.assertEqual(view.draw(self.screen, grid), [pygame.Rect(0, 0, 320, 320)])
+        self.assertEqual(view.draw(self.screen, grid), [])
+
+        grid[0][1], grid[2][3] = 0, 2
+        rects = view.draw(self.screen, grid)
+        self.assertEqual(sorted(map(tuple, rects)), [(40, 0, 40, 40), (120, 80, 40, 40)])
+        self.assertEqual(self.screen.get_at((140, 100))[:3], (0, 0, 255))
+        self.assertEqual(self.screen.get_at((60, 20))[:3], (0, 0, 0))
+
+        view.invalidate()
+        self.assertEqual(len(view.draw(self.screen, grid)), 1)
+
+    def test_sidebar_redraws_only_changed_lines(self):
+        cache = TextCache(self.font)
+        view = SidebarView((320, 0, 160, 320), cache, (30, 30, 30))
+        white = (255, 255, 255)
+        lines = [("Match: 1", white, 16), ("Tour: Joueur Bleu", white, 40)]
+        self.assertEqual(view.draw(self.screen, lines), [pygame.Rect(320, 0, 160, 320)])
+        self.assertEqual(view.draw(self.screen, lines), [])
+
+        lines = [("Match: 1", white, 16), ("Tour: Joueur Rouge", white, 40)]
+        rects = view.draw(self.screen, lines)
+        self.assertEqual({r.y for r in rects}, {40})
+        self.assertEqual(view.draw(self.screen, lines[:1]), [view.lineRect(40)])
+
+        self.assertEqual(cache.misses, 3)
+        cache.render("Match: 1", white)
+        self.assertEqual(cache.hits, 1)
+
+    def test_frame_timer_averages(self):
+        timer = FrameTimer(smoothing=1.0)
+        timer.start_render()
+        timer.end_render()
+        timer.start_render()
+        timer.end_render()
+        self.assertGreater(timer.frame_ms, 0)
+        self.assertLessEqual(timer.render_ms, timer.frame_ms)
+        self.assertLessEqual(timer.render_share, 1.0)
+
+
+    def test_frame_timer_display_is_throttled(self):
+        timer = FrameTimer(smoothing=1.0, display_interval=60.0)
+        cache = TextCache(self.font)
+        for _ in range(5):
+            timer.start_render()
+            timer.end_render()
+            render_ms, frame_ms = timer.shown
+            cache.render(f"Rendu: {render_ms:.1f} ms / image {frame_ms} ms", (255, 215, 0))
+        self.assertEqual(timer.shown[1], 0)
+        self.assertGreater(timer.frame_ms, 0)
+        self.assertEqual((cache.misses, cache.hits), (1, 4))
+
+if __name__ == '__main__':
+    unittest.main()
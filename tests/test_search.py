@@ -0,0 +1,322 @@
+import json
+import random
+import time
+import unittest
+
+from src.cpu import CPUPlayer
+from src.eval_cache import EvaluationCache
+from src.game import BitBoard, Board
+from src.moves import SQUARES_MASK
+from src.opening_book import OpeningBook
+from src.ordering import MoveOrderer
+from src.parallel_search import RootSplitSearch
+from src.search_stats import SearchStats
+from src.search_worker import SearchWorker
+from src.transposition import EXACT, LOWER, TranspositionTable
+
+WEIGHTS = {"grouping": 1, "connection": 1, "enemy_sep": 1, "mobility": 1}
+
+
+def midgame_board(seed=3, plies=12):
+    rng = random.Random(seed)
+    board = Board()
+    player = 2
+    for _ in range(plies):
+        board.make_move(rng.choice(board.get_all_possible_moves(player)))
+        player = 4 if player == 2 else 2
+    return board
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_probe_and_counters(self):
+        tt = TranspositionTable(4)
+        self.assertIsNone(tt.probe(5))
+        tt.store(5, 2, EXACT, 1.5, None)
+        self.assertEqual(tt.probe(5)[3], 1.5)
+        self.assertIsNone(tt.probe(9))  # same slot, different key
+        self.assertEqual((tt.hits, tt.misses, tt.collisions), (1, 2, 1))
+
+    def test_replace_by_depth_or_age(self):
+        tt = TranspositionTable(4)
+        tt.store(1, 3, EXACT, 1.0, None)
+        tt.store(5, 1, LOWER, 2.0, None)
+        self.assertEqual(tt.probe(1)[3], 1.0)
+        tt.new_search()
+        tt.store(5, 1, LOWER, 2.0, None)
+        self.assertEqual(tt.probe(5)[3], 2.0)
+        self.assertEqual(tt.stats()["replacements"], 1)
+
+
+class TestCPUSearch(unittest.TestCase):
+
+    def test_table_does_not_change_fixed_depth_result(self):
+        for board in (Board(), midgame_board()):
+            plain = CPUPlayer(2, WEIGHTS, tt_size=0)
+            cached = CPUPlayer(2, WEIGHTS)
+            mv1 = plain.play(board, depth=3)
+            mv2 = cached.play(board, depth=3)
+            self.assertEqual((mv1.fr, mv1.fc, mv1.tr, mv1.tc), (mv2.fr, mv2.fc, mv2.tr, mv2.tc))
+            self.assertAlmostEqual(plain.last_best_score, cached.last_best_score)
+
+    def test_table_is_reused_across_searches(self):
+        board = midgame_board()
+        player = CPUPlayer(2, WEIGHTS)
+        player.play(board, depth=3)
+        first_score = player.last_best_score
+        self.assertEqual(player.tt.stats()["hits"], 0)
+        player.play(board, depth=3)
+        self.assertAlmostEqual(player.last_best_score, first_score)
+        self.assertGreater(player.tt.stats()["hits"], 0)
+
+    def test_time_budget_returns_completed_iteration(self):
+        board = midgame_board()
+        player = CPUPlayer(2, WEIGHTS)
+        history = board.historyIndex
+        mv = player.play(board, time_ms=50)
+        info = player.last_search_info
+        self.assertIsNotNone(mv)
+        self.assertGreaterEqual(info.depth, 1)
+        self.assertGreater(info.nodes, 0)
+        self.assertEqual(board.historyIndex, history)
+        self.assertEqual(board.board, midgame_board().board)
+
+    def test_time_budget_respects_max_depth(self):
+        board = Board()
+        fixed = CPUPlayer(2, WEIGHTS)
+        timed = CPUPlayer(2, WEIGHTS)
+        fixed.play(board, depth=2)
+        timed.play(board, time_ms=60000, max_depth=2)
+        self.assertEqual(timed.last_search_info.depth, 2)
+        self.assertFalse(timed.last_search_info.timed_out)
+        self.assertAlmostEqual(timed.last_best_score, fixed.last_best_score)
+
+    def test_move_ordering_reduces_nodes(self):
+        ordered_nodes = plain_nodes = 0
+        for seed in range(3):
+            board = midgame_board(seed=seed, plies=10)
+            ordered = CPUPlayer(2, WEIGHTS)
+            plain = CPUPlayer(2, WEIGHTS, orderer=None)
+            ordered.play(board, depth=3)
+            plain.play(board, depth=3)
+            self.assertAlmostEqual(ordered.last_best_score, plain.last_best_score)
+            ordered_nodes += ordered.last_search_info.nodes
+            plain_nodes += plain.last_search_info.nodes
+            self.assertGreater(ordered.last_search_info.first_move_cutoff_rate, 0)
+        self.assertLess(ordered_nodes, plain_nodes)
+
+    def test_orderer_ignores_plies_outside_killer_table(self):
+        board = Board()
+        orderer = MoveOrderer(max_ply=4)
+        code = board.get_move_codes(2)[-1]
+        for ply in (-1, 4):
+            orderer.record_cutoff(board, code, ply, 2, 2)
+        self.assertEqual(orderer.killers, [[] for _ in range(4)])
+        orderer.record_cutoff(board, code, 3, 2, 2)
+        self.assertEqual(orderer.killers[3], [code])
+        # Ply -1 must not read the killers of the last ply.
+        moves = board.get_move_codes(2)
+        self.assertEqual(orderer.order(board, moves, -1, 2), orderer.order(board, moves, 4, 2))
+
+
+class TestRootSplitSearch(unittest.TestCase):
+
+    def test_matches_serial_best_move(self):
+        search = RootSplitSearch(workers=3)
+        try:
+            for board in (BitBoard(), BitBoard(midgame_board().board)):
+                for depth in (2, 3, 4):
+                    serial = CPUPlayer(2, WEIGHTS)
+                    parallel = CPUPlayer(2, WEIGHTS)
+                    expected = serial.play(board, depth=depth)
+                    mv = search.play(parallel, board, depth, compare_serial=True)
+                    self.assertEqual(
+                        (mv.fr, mv.fc, mv.tr, mv.tc),
+                        (expected.fr, expected.fc, expected.tr, expected.tc),
+                    )
+                    self.assertAlmostEqual(parallel.last_best_score, serial.last_best_score)
+                    info = parallel.last_search_info
+                    self.assertEqual(info.workers, 3)
+                    self.assertEqual(parallel.nodes, info.nodes)
+                    self.assertGreater(info.cpu_ratio, 0)
+                    self.assertIsNotNone(info.measured_speedup)
+        finally:
+            search.close()
+
+    def test_uses_player_settings_book_and_solver(self):
+        board = BitBoard(midgame_board().board)
+        search = RootSplitSearch(workers=2)
+        try:
+            plain = CPUPlayer(2, WEIGHTS, tt_size=0, orderer=None, eval_cache=None)
+            self.assertEqual(
+                plain.settings(),
+                {"tt_size": 0, "orderer": None, "batch_leaves": False, "eval_cache": None},
+            )
+            expected = CPUPlayer(2, WEIGHTS, tt_size=0, orderer=None).play(board, depth=2)
+            self.assertEqual(search.play(plain, board, 2), expected)
+            self.assertEqual(plain.nodes, plain.last_search_info.nodes)
+
+            book = OpeningBook()
+            code = board.get_move_codes(2)[-1]
+            book.add(board, 2, code, 0.5)
+            booked = CPUPlayer(2, WEIGHTS, book=book)
+            self.assertEqual(search.play(booked, board, 2).code, code & SQUARES_MASK)
+            self.assertTrue(booked.last_search_info.from_book)
+        finally:
+            search.close()
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def test_stats_do_not_change_search(self):
+        board = midgame_board()
+        plain = CPUPlayer(2, WEIGHTS)
+        timed = CPUPlayer(2, WEIGHTS, stats=SearchStats())
+        self.assertEqual(plain.play(board, depth=3), timed.play(board, depth=3))
+        self.assertEqual(plain.last_best_score, timed.last_best_score)
+        self.assertEqual(board.board, midgame_board().board)
+
+    def test_counters_and_json(self):
+        stats = SearchStats()
+        cpu = CPUPlayer(2, WEIGHTS, stats=stats, eval_cache=EvaluationCache)
+        cpu.play(midgame_board(), depth=3)
+        self.assertEqual(stats.searches, 1)
+        self.assertEqual(stats.nodes, cpu.nodes)
+        self.assertGreater(stats.leaves, 0)
+        self.assertEqual(sum(stats.cutoffs), cpu.cutoffs)
+        self.assertGreater(stats.branching_factor, 1)
+        self.assertGreater(stats.evaluation_time, 0)
+        data = json.loads(stats.to_json())
+        self.assertEqual(data["cutoffs_per_ply"], stats.cutoffs)
+        self.assertEqual(set(data["phase_ms"]), {"move_generation", "evaluation", "game_over"})
+        stats.reset()
+        self.assertEqual((stats.searches, stats.cutoffs), (0, []))
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_cache_does_not_change_search(self):
+        board = midgame_board()
+        plain = CPUPlayer(2, WEIGHTS, eval_cache=None)
+        cached = CPUPlayer(2, WEIGHTS, eval_cache=EvaluationCache())
+        self.assertEqual(plain.play(board, depth=3), cached.play(board, depth=3))
+        self.assertEqual(plain.last_best_score, cached.last_best_score)
+
+    def test_shared_across_weights(self):
+        cache = EvaluationCache()
+        board = midgame_board()
+        CPUPlayer(2, WEIGHTS, tt_size=0, eval_cache=cache).play(board, depth=2)
+        misses = cache.misses
+        other = dict(WEIGHTS, mobility=3)
+        CPUPlayer(2, other, tt_size=0, eval_cache=cache).play(board, depth=2)
+        self.assertEqual(cache.misses, misses)
+        self.assertGreaterEqual(cache.hits, misses)
+
+    def test_bounded(self):
+        cache = EvaluationCache(size=8)
+        board = midgame_board()
+        for code in board.get_move_codes(2)[:20]:
+            board.make_move(code)
+            self.assertEqual(cache.features(board, 2), board.evaluate_features(2))
+            board.undo_move()
+        self.assertEqual(len(cache.entries), 8)
+        self.assertEqual(cache.evictions, 12)
+
+
+def wait_for(worker, timeout=30.0):
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        job = worker.poll()
+        if job is not None:
+            return job
+        time.sleep(0.005)
+    raise AssertionError("search did not finish")
+
+
+class TestSearchWorker(unittest.TestCase):
+
+    def test_background_result_matches_direct_search(self):
+        board = midgame_board()
+        expected = CPUPlayer(2, WEIGHTS).play(board, depth=2)
+        worker = SearchWorker()
+        try:
+            cpu = CPUPlayer(2, WEIGHTS)
+            worker.submit(cpu.play, Board(board.board), depth=2, cancel=cpu.cancel)
+            self.assertTrue(worker.busy)
+            job = wait_for(worker)
+            self.assertFalse(worker.busy)
+            self.assertIsNone(job.error)
+            self.assertEqual(job.result, expected)
+        finally:
+            worker.close()
+
+    def test_cancel_stops_search(self):
+        board = midgame_board()
+        grid = [row[:] for row in board.board]
+        cpu = CPUPlayer(2, WEIGHTS)
+        worker = SearchWorker()
+        try:
+            worker.submit(cpu.play, board, depth=6, cancel=cpu.cancel)
+            while cpu.nodes < 200:
+                time.sleep(0.005)
+            start = time.perf_counter()
+            worker.cancel()
+            job = wait_for(worker)
+            self.assertLess(time.perf_counter() - start, 2.0)
+            self.assertTrue(job.cancelled)
+            self.assertIsNone(job.result)
+            self.assertEqual(board.board, grid)
+        finally:
+            worker.close()
+
+    def test_cancel_is_kept_until_the_next_job(self):
+        board = midgame_board()
+        cpu = CPUPlayer(2, WEIGHTS)
+
+        def cancelledEarly(*args, **kwargs):
+            # A cancel landing after the job left the queue, before the search.
+            cpu.cancel()
+            return cpu.play(*args, **kwargs)
+
+        worker = SearchWorker()
+        try:
+            worker.submit(
+                cancelledEarly, board, depth=6, cancel=cpu.cancel, reset=cpu.reset_cancel
+            )
+            self.assertIsNone(wait_for(worker).result)
+            worker.submit(
+                cpu.play, Board(board.board), depth=2, cancel=cpu.cancel, reset=cpu.reset_cancel
+            )
+            self.assertIsNotNone(wait_for(worker).result)
+        finally:
+            worker.close()
+
+    def test_cancel_right_after_submit(self):
+        board = midgame_board()
+        cpu = CPUPlayer(2, WEIGHTS)
+        worker = SearchWorker()
+        try:
+            for _ in range(20):
+                worker.submit(
+                    cpu.play, board, depth=6, cancel=cpu.cancel, reset=cpu.reset_cancel
+                )
+                worker.cancel()
+                start = time.perf_counter()
+                job = wait_for(worker)
+                self.assertLess(time.perf_counter() - start, 2.0)
+                self.assertTrue(job.cancelled)
+                self.assertIsNone(job.result)
+        finally:
+            worker.close()
+
+    def test_errors_are_returned(self):
+        worker = SearchWorker()
+        try:
+            worker.submit(CPUPlayer(2, WEIGHTS).play, None)
+            self.assertIsInstance(wait_for(worker).error, AttributeError)
+        finally:
+            worker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from src.game import BitBoard, Board
+from src.tournament import (
+    CHALLENGER_WIN,
+    CHAMPION_WIN,
+    LOSS_PENALTY,
+    Tournament,
+    champion_color,
+    champion_keeps_title,
+    load_duels,
+    score_game,
+)
+
+
+class TestDuelRules(unittest.TestCase):
+
+    def test_scoring_matches_preview(self):
+        self.assertEqual([champion_color(i) for i in range(2)], [2, 4])
+        self.assertEqual(score_game(2, 2), (CHAMPION_WIN, LOSS_PENALTY))
+        self.assertEqual(score_game(2, 4), (LOSS_PENALTY, CHALLENGER_WIN))
+        self.assertEqual(score_game(None, 2), (0.0, 0.0))
+        # A win each: 1.5 - 1 against -1 + 1, the champion stays.
+        self.assertTrue(champion_keeps_title(0.5, 0.0))
+        self.assertTrue(champion_keeps_title(0.0, 0.0))
+        self.assertFalse(champion_keeps_title(-2.0, 2.0))
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_duels_update_title_and_notify(self):
+        tournament = Tournament(board_cls=BitBoard, seed=1)
+        received = []
+        tournament.subscribe(received.append)
+        results = list(tournament.run(3))
+        self.assertEqual(received, results)
+        self.assertEqual([r.index for r in results], [1, 2, 3])
+        self.assertEqual(tournament.games, 6)
+        for result in results:
+            self.assertEqual([g.champion_color for g in result.games], [2, 4])
+            expected = [0.0, 0.0]
+            for game in result.games:
+                for i, delta in enumerate(score_game(game.winner, game.champion_color)):
+                    expected[i] += delta
+            self.assertEqual([result.champion_score, result.challenger_score], expected)
+        last = results[-1]
+        self.assertEqual(tournament.champion, last.title_holder)
+        self.assertEqual(tournament.history[-1], (3, last.title_score, last.title_holder))
+        self.assertNotEqual(tournament.challenger, last.challenger)
+
+    def test_parallel_games_and_replay_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "duels.jsonl")
+            serial = Tournament(board_cls=BitBoard, seed=5, log_path=path)
+            parallel = Tournament(board_cls=BitBoard, seed=5, workers=2)
+            try:
+                expected = list(serial.run(2))
+                self.assertEqual(list(parallel.run(2)), expected)
+            finally:
+                serial.close()
+                parallel.close()
+            self.assertEqual(load_duels(path), expected)
+
+        for game in expected[0].games:
+            board = Board()
+            for code in game.moves:
+                board.make_move(code)
+            if game.reason == "game_over":
+                self.assertTrue(board.is_game_over())
+                self.assertEqual(board.get_winner(), game.winner)
+            self.assertEqual(len(game.moves), game.plies)
+
+
+if __name__ == '__main__':
+    unittest.main()